@@ -1,18 +1,88 @@
 import logging
-from logging.handlers import RotatingFileHandler
+import multiprocessing
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from multiprocessing.util import Finalize
+from typing import Iterator
+
+from config.settings import ETL_LOG_MODE, ETL_LOG_RATE_INTERVAL
+
+"""
+Pipeline logger writing to logs/pipeline.log and the console.
+
+The handlers (and the logs/ directory) are created on first access to `logger`, so importing
+this module has no side effects.
+
+The scripts log through the root logger, set up by script_logging() around each entry point.
+With ETL_LOG_MODE=queue, log calls then only put the record on a queue and a QueueListener thread
+does the formatting and I/O, so hot loops never block on a handler: script_logging() enters
+queue_logging(processes=True), which moves the root logger's handlers behind a listener and
+hands out a multiprocessing queue that pool workers forward their records to (see worker_logging
+and pool_logging_options), so one listener writes every process's logs without interleaving.
+
+Records logged with extra={"rate_key": key} (e.g. per-chunk rejection warnings) are rate limited
+by RateLimitFilter: one record per key every ETL_LOG_RATE_INTERVAL seconds, the next one
+reporting how many were suppressed in between.
+"""
 
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE = os.path.join(LOG_DIR, "pipeline.log")
 
-# Configure the logger
-logger = logging.getLogger("insurance_etl_logger")
-logger.setLevel(logging.DEBUG)
+LOGGER_NAME = "insurance_etl_logger"
+
+# Console format of the scripts' root logger
+SCRIPT_LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most one record per rate_key (an `extra` attribute) every interval seconds.
+    Records without a rate_key always pass.
+    """
+
+    def __init__(self, interval: float = ETL_LOG_RATE_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self.next_allowed: dict[str, float] = {}
+        self.suppressed: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "rate_key", None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            if now < self.next_allowed.get(key, 0.0):
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return False
+            self.next_allowed[key] = now + self.interval
+            suppressed = self.suppressed.pop(key, 0)
+        if suppressed:
+            record.msg = f"{record.msg} (+{suppressed} similar messages suppressed)"
+        return True
+
+    def report_suppressed(self, logger: logging.Logger) -> None:
+        """
+        Logs how many records were suppressed per key since the last one let through.
+        """
+        with self.lock:
+            suppressed, self.suppressed = self.suppressed, {}
+        for key, count in suppressed.items():
+            logger.warning(f"{count} similar messages suppressed ({key})")
+
+
+def build_handlers() -> list[logging.Handler]:
+    """
+    Creates the rotating file handler (DEBUG) and console handler (INFO) of the pipeline logger.
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
 
-# Prevent duplicate log handlers if this module is imported multiple times
-if not logger.handlers:
     # Rotating File Handler: keeps logs from getting too large
     file_handler = RotatingFileHandler(LOG_FILE, maxBytes=1_000_000, backupCount=3)
     file_handler.setLevel(logging.DEBUG)
@@ -25,7 +95,125 @@ if not logger.handlers:
     formatter = logging.Formatter('%(asctime)s | %(levelname)s | %(message)s')
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
+    return [file_handler, console_handler]
+
+
+def get_logger() -> logging.Logger:
+    """
+    Returns the pipeline logger, attaching its file and console handlers on first use.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.DEBUG)
+
+    # Prevent duplicate log handlers if this is called multiple times
+    if not logger.handlers:
+        handlers = build_handlers()
+        logger.addFilter(RateLimitFilter())
+
+        # Attach handlers
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    return logger
+
+
+def __getattr__(name: str):
+    # `from config.logger import logger` keeps working, configuring the logger on first access
+    if name == "logger":
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def forwarding_queue() -> queue.Queue | None:
+    """
+    Returns the multiprocessing queue the root logger forwards its records to, if any.
+    """
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, QueueHandler) and not isinstance(handler.queue, queue.SimpleQueue):
+            return handler.queue
+    return None
+
+
+def forward_to(log_queue, level: int = logging.NOTSET) -> RateLimitFilter:
+    """
+    Replaces the root logger's handlers with a rate limited QueueHandler putting records on log_queue.
+    Returns:
+        RateLimitFilter: The handler's rate limit filter
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = QueueHandler(log_queue)
+    rate_limit = RateLimitFilter()
+    handler.addFilter(rate_limit)
+    root.addHandler(handler)
+    if level:
+        root.setLevel(level)
+    return rate_limit
+
+
+def worker_logging(log_queue, level: int = logging.INFO) -> None:
+    """
+    Process pool initializer forwarding a worker's log records to the parent's listener.
+    Args:
+        log_queue (multiprocessing.Queue): Queue handed out by queue_logging(processes=True)
+        level (int): Root log level in the worker
+    """
+    rate_limit = forward_to(log_queue, level)
+    # Pool workers exit without running atexit hooks, but multiprocessing finalizers still run
+    # (before the queue's own finalizers, which have priority 10)
+    Finalize(rate_limit, rate_limit.report_suppressed, args=(logging.getLogger(),), exitpriority=20)
+
+
+def pool_logging_options() -> dict:
+    """
+    Returns the ProcessPoolExecutor initializer options forwarding worker logs to this process's
+    listener, or no options when the root logger is not forwarding to a multiprocessing queue.
+    """
+    log_queue = forwarding_queue()
+    if log_queue is None:
+        return {}
+    return {"initializer": worker_logging, "initargs": (log_queue, logging.getLogger().level)}
+
+
+@contextmanager
+def queue_logging(processes: bool = False) -> Iterator[queue.Queue]:
+    """
+    Moves the root logger's handlers behind a QueueListener thread for the duration of the block.
+    Args:
+        processes (bool): Use a multiprocessing queue, so that process pool workers can forward
+            their records to it (see pool_logging_options)
+    Yields:
+        queue.Queue: The queue records are put on
+    """
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue = multiprocessing.Queue() if processes else queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    rate_limit = forward_to(log_queue)
+    try:
+        yield log_queue
+    finally:
+        rate_limit.report_suppressed(root)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        listener.stop()
+        for handler in handlers:
+            root.addHandler(handler)
+
 
-    # Attach handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
\ No newline at end of file
+@contextmanager
+def script_logging(level: int = logging.INFO) -> Iterator[None]:
+    """
+    Sets up the root logger for a script's run: console output in SCRIPT_LOG_FORMAT and, with
+    ETL_LOG_MODE=queue, a listener that the script's pool workers forward their records to.
+    Args:
+        level (int): Root log level
+    """
+    logging.basicConfig(level=level, format=SCRIPT_LOG_FORMAT)
+    if ETL_LOG_MODE != "queue" or forwarding_queue() is not None:
+        yield
+        return
+    with queue_logging(processes=True):
+        yield
@@ -1,5 +1,3 @@
-from zlib import DEF_BUF_SIZE
-
 from dotenv import load_dotenv
 import os
 
@@ -12,5 +10,33 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
+# Rows per chunk for streaming transforms; 0 loads each table fully into memory
+ETL_CHUNK_SIZE = int(os.getenv("ETL_CHUNK_SIZE", "0"))
+
+# Worker processes for the partitioned claims transform; 1 runs it in a single process
+ETL_WORKERS = int(os.getenv("ETL_WORKERS", "1"))
+
+# CSV ingest engine: pandas (inferred dtypes) or arrow (schema-typed, projected pyarrow reader)
+ETL_INGEST_ENGINE = os.getenv("ETL_INGEST_ENGINE", "pandas")
+
+# Output format for transformed and rejected tables: csv, parquet or feather
+ETL_OUTPUT_FORMAT = os.getenv("ETL_OUTPUT_FORMAT", "csv")
+ETL_PARQUET_COMPRESSION = os.getenv("ETL_PARQUET_COMPRESSION", "zstd")
+ETL_PARQUET_ROW_GROUP_SIZE = int(os.getenv("ETL_PARQUET_ROW_GROUP_SIZE", "1000000"))
+
+# Which row survives among rows sharing a primary key: first, last, most_complete, or none to keep them all
+ETL_SURVIVORSHIP = os.getenv("ETL_SURVIVORSHIP", "first")
+
+# Compression of rejected CSV outputs: empty for none, or gzip (written as <table>.csv.gz)
+ETL_REJECTED_COMPRESSION = os.getenv("ETL_REJECTED_COMPRESSION", "")
+
+# Directory for per-stage metrics (metrics.jsonl and Prometheus etl_<table>.prom files); empty disables them
+ETL_METRICS_DIR = os.getenv("ETL_METRICS_DIR", "")
+
+# Logging mode: sync (handlers write in the calling thread) or queue (a listener thread writes, and
+# worker processes forward their records to it); rate limited messages pass once per interval (seconds)
+ETL_LOG_MODE = os.getenv("ETL_LOG_MODE", "sync")
+ETL_LOG_RATE_INTERVAL = float(os.getenv("ETL_LOG_RATE_INTERVAL", "10"))
+
 def get_connection_url():
     return f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Scale-factor benchmarks of the transform pipeline, stage by stage.
+
+Each run generates every raw table in memory at a multiple of the default row counts (see
+etl.sources.DEFAULT_ROWS), writes it as clean/messy CSVs to a scratch directory, and then pushes
+each table through the same functions as the transform scripts, timing every stage on its own:
+- generate: block generators -> raw CSVs
+- load: raw CSVs -> DataFrame (configured ingest engine)
+- clean: table-specific cleaning
+- validate.types / validate.rules / validate.foreign_keys: type checks, domain rules and
+  foreign key lookups (claims only), then validate.split into valid and rejected rows
+- save: transformed and rejected outputs
+
+Every stage records its wall time, rows/sec and the peak RSS of the process while it ran.
+Results can be compared with a stored baseline: a stage regresses when its throughput drops by
+more than a threshold.
+
+measure_startup times the import of the CLI entry points in fresh interpreters, so that heavy
+imports creeping back into module level show up as a startup regression.
+"""
+
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from etl.metrics import PeakRss
+from etl.schema_definition import constraints, foreign_keys, schemas
+from etl.sources import GeneratorSource
+from etl.utils.output_formats import open_writer, write_output
+
+# Multiples of the default row counts run when none are given
+SCALE_FACTORS = (1, 10, 100)
+
+# Raw table -> (schema name in etl.schema_definition.schemas, output table), dimensions first
+TABLES = {
+    "customers": ("customers_dim", "customers"),
+    "policies": ("policies_dim", "policies"),
+    "dates": ("dates_dim", "dates"),
+    "adjusters": ("adjusters_dim", "adjusters"),
+    "claims": ("claims_fact", "claims_fact"),
+}
+
+STAGES = ("generate", "load", "clean", "validate.types", "validate.rules", "validate.foreign_keys",
+          "validate.split", "save")
+
+# Stages faster than this (in the baseline) are too noisy to flag as regressions
+MIN_BASELINE_SECONDS = 0.05
+
+# Entry points timed by measure_startup, and the import time each of them may take
+STARTUP_MODULES = ("scripts.transform_all", "scripts.transform_claims", "scripts.generate_customers")
+STARTUP_BUDGET_SECONDS = 1.0
+
+
+class StageRecorder:
+    """
+    Collects one result record per (table, stage) for a scale factor.
+    """
+
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.results: list[dict] = []
+
+    @contextmanager
+    def stage(self, table: str, stage: str, rows: int) -> Iterator[dict]:
+        """
+        Times a stage and records it. The yielded record can be updated in the block,
+        e.g. to set 'rows' once the number of rows is known.
+        """
+        record = {"scale": self.scale, "table": table, "stage": stage, "rows": rows}
+        with PeakRss() as rss:
+            start = time.perf_counter()
+            yield record
+            seconds = time.perf_counter() - start
+        record["seconds"] = round(seconds, 6)
+        record["rows_per_sec"] = round(record["rows"] / seconds, 1) if seconds > 0 else None
+        record["peak_rss_mb"] = round(rss.peak / 2**20, 1)
+        self.results.append(record)
+        logging.info(f"[x{self.scale}] {table} {stage}: {record['rows']} rows in {seconds:.3f}s "
+                     f"({record['rows_per_sec'] or 0:,.0f} rows/sec, peak RSS {record['peak_rss_mb']} MB)")
+
+
+def table_cleaners() -> dict[str, Callable[[pd.DataFrame], pd.DataFrame]]:
+    """
+    Returns the cleaning function of every raw table, as used by the transform scripts.
+    """
+    from etl.transform_base import clean_adjusters, clean_customers, clean_dataframe, clean_dates, clean_policies
+
+    return {
+        "customers": clean_customers,
+        "policies": clean_policies,
+        "dates": clean_dates,
+        "adjusters": clean_adjusters,
+        "claims": lambda df: clean_dataframe(df, schemas["claims_fact"]),
+    }
+
+
+def write_raw_table(source: GeneratorSource, table: str, directory: Path, block_size: int) -> int:
+    """
+    Writes the clean and messy CSVs of a generated table.
+    Returns:
+        int: Rows written
+    """
+    rows = 0
+    for messy, variant in ((False, "clean"), (True, "messy")):
+        with open_writer(directory, f"{table}_{variant}", fmt="csv") as writer:
+            for block in source.iter_rows(table, messy, block_size):
+                writer.write_arrow(block)
+        rows += writer.rows
+    return rows
+
+
+def benchmark_table(recorder: StageRecorder, source: GeneratorSource, table: str, workdir: Path,
+                    dimension_keys: dict[str, np.ndarray], engine: str | None = None, fmt: str | None = None,
+                    block_size: int = 1_000_000) -> pd.DataFrame:
+    """
+    Runs and times every stage of one table.
+    Args:
+        recorder (StageRecorder): Collects the stage records
+        source (GeneratorSource): Generator of the raw table
+        table (str): Raw table name, e.g. 'claims'
+        workdir (Path): Scratch directory (raw/, transformed/ and rejected/ are created in it)
+        dimension_keys (dict[str, np.ndarray]): Output table -> sorted valid keys of the dimensions done so far
+        engine (str, optional): Ingest engine, defaults to ETL_INGEST_ENGINE
+        fmt (str, optional): Output format, defaults to ETL_OUTPUT_FORMAT
+        block_size (int): Rows per generated block
+    Returns:
+        pd.DataFrame: Valid rows of the table
+    """
+    from etl.transform_base import load_raw_data, restore_raw_values
+    from etl.validation.constraints import check_constraints
+    from etl.validation.referential import check_foreign_keys
+    from etl.validation.rejections import CODE_COLUMN, RejectionSink, RuleCodes
+    from etl.validation.type_checks import add_parse_failures, check_schema
+
+    schema_name, output_table = TABLES[table]
+    schema = schemas[schema_name]
+    rules = constraints.get(schema_name)
+    raw_dir = workdir / "raw"
+
+    with recorder.stage(table, "generate", 0) as record:
+        record["rows"] = write_raw_table(source, table, raw_dir, block_size)
+
+    with recorder.stage(table, "load", 0) as record:
+        df, parse_errors = load_raw_data(table, schema, engine, raw_dir)
+        record["rows"] = len(df)
+
+    with recorder.stage(table, "clean", len(df)):
+        df = table_cleaners()[table](df)
+
+    with recorder.stage(table, "validate.types", len(df)):
+        failures = add_parse_failures(check_schema(df, schema), parse_errors, schema, df.index)
+    if rules:
+        with recorder.stage(table, "validate.rules", len(df)):
+            failures.update(check_constraints(df, rules, schema))
+    key_indexes = {}
+    if schema_name in foreign_keys:
+        key_indexes = {column: (dimension, dimension_keys[dimension])
+                       for column, (dimension, _) in foreign_keys[schema_name].items()}
+        with recorder.stage(table, "validate.foreign_keys", len(df)):
+            failures.update(check_foreign_keys(df, key_indexes))
+    codes = RuleCodes.for_table(schema, rules, key_indexes)
+    with recorder.stage(table, "validate.split", len(df)):
+        is_valid, rejection_codes = codes.encode(failures, df.index)
+        valid_df = df[is_valid]
+        invalid_df = restore_raw_values(df[~is_valid], parse_errors)
+        invalid_df[CODE_COLUMN] = rejection_codes
+
+    with recorder.stage(table, "save", len(df)):
+        write_output(valid_df, workdir / "transformed", output_table, schema, fmt)
+        with RejectionSink(output_table, codes, fmt, directory=workdir / "rejected") as sink:
+            sink.write(invalid_df)
+    return valid_df
+
+
+def run_benchmark(scale: float, workdir: Path, engine: str | None = None, fmt: str | None = None,
+                  seed: int = 42) -> list[dict]:
+    """
+    Benchmarks every table at one scale factor, dimensions before claims.
+    Args:
+        scale (float): Multiple of the default row counts
+        workdir (Path): Scratch directory for the generated and transformed files
+        engine (str, optional): Ingest engine, defaults to ETL_INGEST_ENGINE
+        fmt (str, optional): Output format, defaults to ETL_OUTPUT_FORMAT
+        seed (int): Generator seed
+    Returns:
+        list[dict]: One record per table and stage (scale, table, stage, rows, seconds, rows_per_sec, peak_rss_mb)
+    """
+    from etl.validation.referential import unique_keys
+
+    source = GeneratorSource(scale=scale, seed=seed)
+    recorder = StageRecorder(scale)
+    dimension_keys = {}
+    for table, (schema_name, output_table) in TABLES.items():
+        valid_df = benchmark_table(recorder, source, table, workdir, dimension_keys, engine, fmt)
+        key = next(iter(schemas[schema_name]))
+        dimension_keys[output_table] = unique_keys(valid_df[key])
+    return recorder.results
+
+
+def measure_startup(module: str, repeat: int = 3, top: int = 5) -> dict:
+    """
+    Times the import of a module in fresh interpreters (python -X importtime).
+    Args:
+        module (str): Module to import, e.g. 'scripts.transform_all'
+        repeat (int): Number of interpreters started; the fastest import is kept
+        top (int): Number of slowest imported modules to report
+    Returns:
+        dict: module, seconds, and slowest_imports (module -> cumulative seconds)
+    """
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   capture_output=True, text=True, check=True)
+        # Lines look like 'import time: self [us] | cumulative | imported package'
+        imports = {}
+        for line in completed.stderr.splitlines():
+            parts = line.removeprefix("import time:").split("|")
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                imports[parts[2].strip()] = int(parts[1]) / 1e6
+        if module in imports and (best is None or imports[module] < best[module]):
+            best = imports
+    if best is None:
+        raise RuntimeError(f"Could not time the import of {module}")
+    slowest = sorted((name for name in best if name != module), key=best.get, reverse=True)[:top]
+    return {"module": module, "seconds": round(best[module], 6),
+            "slowest_imports": {name: round(best[name], 6) for name in slowest}}
+
+
+def result_key(record: dict) -> tuple:
+    return float(record["scale"]), record["table"], record["stage"]
+
+
+def find_regressions(results: list[dict], baseline: list[dict], threshold: float,
+                     min_seconds: float = MIN_BASELINE_SECONDS) -> list[str]:
+    """
+    Compares stage throughput with a baseline run.
+    Args:
+        results (list[dict]): Current stage records
+        baseline (list[dict]): Baseline stage records
+        threshold (float): Allowed relative drop in rows/sec, e.g. 0.25 for 25%
+        min_seconds (float): Baseline stages shorter than this are not compared
+    Returns:
+        list[str]: One message per regressed stage
+    """
+    baseline_by_key = {result_key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        before = baseline_by_key.get(result_key(record))
+        if not before or not before.get("rows_per_sec") or not record.get("rows_per_sec"):
+            continue
+        if before["seconds"] < min_seconds:
+            continue
+        drop = 1 - record["rows_per_sec"] / before["rows_per_sec"]
+        if drop > threshold:
+            regressions.append(
+                f"x{record['scale']} {record['table']} {record['stage']}: {record['rows_per_sec']:,.0f} rows/sec, "
+                f"{drop:.0%} below baseline {before['rows_per_sec']:,.0f} rows/sec"
+            )
+    return regressions
+
+
+def write_results(path: Path, results: list[dict], **metadata) -> None:
+    """
+    Writes benchmark records to a JSON file, with the run's metadata.
+    """
+    import pyarrow
+
+    document = {
+        "metadata": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "pyarrow": pyarrow.__version__,
+            "machine": platform.machine(),
+            **metadata,
+        },
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2))
+
+
+def read_results(path: Path) -> list[dict]:
+    """
+    Reads the records of a JSON file written by write_results.
+    """
+    return json.loads(path.read_text())["results"]
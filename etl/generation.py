@@ -0,0 +1,183 @@
+"""
+Building blocks for high-volume synthetic data generation.
+
+Calling Faker once per cell is the bottleneck of the row-by-row generators in scripts/. The
+pooled mode instead samples a pool of Faker values once per seed (faker_pool) and composes
+rows by drawing indices into the pools with NumPy, one vectorized draw per column.
+
+Rows are generated in fixed-size shards: shard i always covers the same rows and uses its own
+generator seeded with (seed, i). Shards can therefore run in any number of worker processes
+and are written back in order, so a given seed and row count produce the same file no matter
+how many workers run.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+
+from config.logger import pool_logging_options
+from etl.schema_definition import SchemaType
+from etl.utils.output_formats import open_writer
+
+# Number of distinct values sampled from Faker per pool
+POOL_SIZE = 10_000
+
+# Rows per shard; part of the output's identity together with the seed
+SHARD_SIZE = 250_000
+
+# Block function: (generator, first id, row count) -> pa.Table
+BlockFunction = Callable[[np.random.Generator, int, int], object]
+
+FAKER_PROVIDERS = ("first_name", "last_name", "name", "email", "phone_number")
+
+
+class LazyFaker:
+    """
+    Faker instance for the row-by-row generators, created and seeded (Faker.seed) on first use
+    so that importing a generator script does not import Faker.
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self._fake = None
+
+    def __getattr__(self, name: str):
+        if self._fake is None:
+            from faker import Faker
+
+            Faker.seed(self.seed)
+            self._fake = Faker()
+        return getattr(self._fake, name)
+
+
+@lru_cache(maxsize=None)
+def faker_pool(seed: int, provider: str, size: int = POOL_SIZE):
+    """
+    Samples a pool of Faker values once per process, seed and provider.
+    Args:
+        seed (int): Faker seed
+        provider (str): Faker provider method, one of FAKER_PROVIDERS
+        size (int): Values in the pool
+    Returns:
+        pa.Array: Pool of strings
+    """
+    import pyarrow as pa
+    from faker import Faker
+
+    if provider not in FAKER_PROVIDERS:
+        raise ValueError(f"Unsupported Faker provider {provider!r}; expected one of {list(FAKER_PROVIDERS)}")
+    fake = Faker()
+    fake.seed_instance(f"{seed}-{provider}")
+    generate = getattr(fake, provider)
+    return pa.array([generate() for _ in range(size)])
+
+
+def sample(rng: np.random.Generator, pool, num_rows: int):
+    """
+    Draws num_rows values from a pool (with replacement) in one vectorized take.
+    """
+    import pyarrow.compute as pc
+
+    return pc.take(pool, rng.integers(0, len(pool), num_rows))
+
+
+def choice(rng: np.random.Generator, values: list, num_rows: int):
+    """
+    Draws num_rows values uniformly from a small list, as an Arrow array.
+    """
+    import pyarrow as pa
+
+    return sample(rng, pa.array(values), num_rows)
+
+
+def random_dates(rng: np.random.Generator, start: np.datetime64, end: np.datetime64, num_rows: int) -> np.ndarray:
+    """
+    Draws dates uniformly from [start, end] as datetime64[D].
+    """
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    return start + rng.integers(0, (end - start).astype(int) + 1, num_rows).astype("timedelta64[D]")
+
+
+def iso_dates(values: np.ndarray):
+    """
+    Formats datetime64[D] values as 'YYYY-MM-DD' strings.
+    """
+    import pyarrow as pa
+
+    return pa.array(values).cast(pa.string())
+
+
+def corruption_masks(rng: np.random.Generator, corruptions: list[str], num_rows: int) -> dict[str, np.ndarray]:
+    """
+    Assigns one corruption per row, uniformly, like random.choice(corruptions) per row.
+    Returns:
+        dict[str, np.ndarray]: Corruption -> boolean mask of the rows it applies to
+    """
+    assigned = rng.integers(0, len(corruptions), num_rows)
+    return {corruption: assigned == i for i, corruption in enumerate(corruptions)}
+
+
+def replace_where(values, mask: np.ndarray, replacement):
+    """
+    Replaces the values of an Arrow array where mask is True (a None replacement makes them null).
+    Non-string arrays are cast to strings when the replacement is a string.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(replacement, str) and not pa.types.is_string(values.type):
+        values = values.cast(pa.string())
+    return pc.if_else(pa.array(mask), pa.scalar(replacement, values.type), values)
+
+
+def shards(num_rows: int, shard_size: int = SHARD_SIZE) -> Iterator[tuple[int, int, int]]:
+    """
+    Splits num_rows rows into fixed-size shards.
+    Yields:
+        tuple[int, int, int]: (shard number, first row id starting at 1, row count)
+    """
+    for number, start in enumerate(range(0, num_rows, shard_size)):
+        yield number, start + 1, min(shard_size, num_rows - start)
+
+
+def generate_shard(task: tuple[int, int, int], block: BlockFunction, seed: int):
+    """
+    Generates one shard with its own generator. Executed inside a worker process.
+    """
+    number, first_id, num_rows = task
+    return block(np.random.default_rng([seed, number]), first_id, num_rows)
+
+
+def write_sharded(directory: Path, table: str, block: BlockFunction, num_rows: int, seed: int,
+                  workers: int = 1, shard_size: int = SHARD_SIZE, schema: SchemaType | None = None,
+                  fmt: str | None = None) -> Path:
+    """
+    Generates a table shard by shard, in a process pool when workers > 1, and writes the shards in order.
+    Args:
+        directory (Path): Output directory
+        table (str): Output file name without suffix, e.g. 'customers_clean'
+        block (BlockFunction): Picklable block function, e.g. a functools.partial of a module-level function
+        num_rows (int): Number of rows to generate
+        seed (int): Base seed; shard i uses numpy.random.default_rng([seed, i])
+        workers (int): Worker processes
+        shard_size (int): Rows per shard
+        schema (SchemaType, optional): Table schema for typed output formats
+        fmt (str, optional): Output format, defaults to ETL_OUTPUT_FORMAT
+    Returns:
+        Path: Written file
+    """
+    tasks = list(shards(num_rows, shard_size))
+    with open_writer(directory, table, schema, fmt) as writer:
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers, **pool_logging_options()) as pool:
+                for shard in pool.map(generate_shard, tasks, [block] * len(tasks), [seed] * len(tasks)):
+                    writer.write_arrow(shard)
+        else:
+            for task in tasks:
+                writer.write_arrow(generate_shard(task, block, seed))
+    logging.info(f"Generated {writer.rows} rows in {len(tasks)} shards to {writer.path}")
+    return writer.path
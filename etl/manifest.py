@@ -0,0 +1,150 @@
+"""
+Run manifest for incremental transforms.
+
+After a table is transformed, a fingerprint of its inputs is recorded in data/transformed/_manifest.json:
+a SHA-256 of every raw input file, a hash of the table schema and domain rules, the settings that
+shape its outputs (output format, rejected-rows compression, primary key and survivorship rule),
+and the fingerprints of the tables it depends on. An incremental run skips a table whose
+fingerprint is unchanged and whose current output paths are the ones recorded and still on disk,
+and reuses those outputs.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from config.settings import ETL_REJECTED_COMPRESSION, ETL_SURVIVORSHIP
+from etl.schema_definition import SchemaType
+from etl.utils.output_formats import resolve_format
+from etl.utils.load import raw_table_paths
+from etl.utils.paths import TRANSFORMED_DATA_DIR, ensure_dir
+from etl.validation.constraints import Constraint
+
+MANIFEST_PATH = TRANSFORMED_DATA_DIR / "_manifest.json"
+
+
+def file_digest(path: Path, block_size: int = 1 << 20) -> str:
+    """
+    Computes the SHA-256 of a file, reading it in blocks.
+    Args:
+        path (Path): File to hash
+        block_size (int): Bytes read per block
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def schema_digest(schema: SchemaType, rules: list[Constraint] | None = None) -> str:
+    """
+    Hashes a schema's column names, order and types, and the table's domain rules.
+    """
+    described = [[column, expected_type.__name__] for column, expected_type in schema.items()]
+    if rules:
+        described.append([repr(rule) for rule in rules])
+    return hashlib.sha256(json.dumps(described).encode()).hexdigest()
+
+
+def transform_settings(primary_key: str | None = None) -> dict:
+    """
+    Collects the configured settings that change a table's outputs.
+    Args:
+        primary_key (str, optional): Primary key the table is deduplicated on
+    Returns:
+        dict: Output format, rejected-rows compression, primary key and survivorship rule
+    """
+    return {
+        "output_format": resolve_format(),
+        "rejected_compression": ETL_REJECTED_COMPRESSION,
+        "primary_key": primary_key,
+        "survivorship": ETL_SURVIVORSHIP,
+    }
+
+
+def table_fingerprint(table: str, schema: SchemaType, upstream: dict[str, dict] | None = None,
+                      rules: list[Constraint] | None = None, primary_key: str | None = None) -> dict:
+    """
+    Fingerprints everything a table's transform reads.
+    Args:
+        table (str): Raw table name, e.g. 'claims'
+        schema (SchemaType): Table schema
+        upstream (dict, optional): Fingerprints of the tables this one depends on
+        rules (list[Constraint], optional): Domain rules of the table
+        primary_key (str, optional): Primary key of the table (see etl.schema_definition.primary_keys)
+    Returns:
+        dict: Fingerprint with input file digests, schema digest, settings and upstream fingerprints
+    """
+    return {
+        "inputs": {path.name: file_digest(path) for path in raw_table_paths(table)},
+        "schema": schema_digest(schema, rules),
+        "settings": transform_settings(primary_key),
+        "upstream": upstream or {},
+    }
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict:
+    """
+    Reads the run manifest, or returns an empty one.
+    """
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict, path: Path = MANIFEST_PATH) -> None:
+    """
+    Writes the run manifest atomically.
+    """
+    ensure_dir(path.parent)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def is_up_to_date(manifest: dict, table: str, fingerprint: dict, outputs: list[Path] | None = None) -> bool:
+    """
+    Checks whether a table's last recorded run used the same inputs and its outputs still exist.
+    Args:
+        manifest (dict): Run manifest
+        table (str): Raw table name
+        fingerprint (dict): Current fingerprint of the table
+        outputs (list[Path], optional): Output files the transform would produce now; the recorded
+            run must have targeted the same paths
+    Returns:
+        bool: True if the transform can be skipped
+    """
+    entry = manifest.get(table)
+    if not entry or entry.get("fingerprint") != fingerprint:
+        return False
+    if outputs is not None and [str(output) for output in outputs] != entry.get("outputs"):
+        logging.info(f"Outputs of {table} moved since the last run; rerunning")
+        return False
+    missing = [output for output in entry.get("written", []) if not Path(output).exists()]
+    if missing:
+        logging.info(f"Outputs of {table} missing ({missing}); rerunning")
+        return False
+    return True
+
+
+def record_run(manifest: dict, table: str, fingerprint: dict, outputs: list[Path]) -> None:
+    """
+    Records a successful transform in the manifest (in place).
+    Args:
+        manifest (dict): Run manifest
+        table (str): Raw table name
+        fingerprint (dict): Fingerprint of the inputs the run used
+        outputs (list[Path]): Output files the run targeted; the ones it wrote (e.g. no rejected
+            file without rejected rows) must still exist for the run to be reused
+    """
+    manifest[table] = {
+        "fingerprint": fingerprint,
+        "outputs": [str(output) for output in outputs],
+        "written": [str(output) for output in outputs if Path(output).exists()],
+    }
@@ -0,0 +1,354 @@
+"""
+Claims aggregate marts, maintained incrementally.
+
+Each mart pre-aggregates the claims amount by one grouping, joining claims to the dimension
+outputs for the attributes the fact table does not carry:
+- claims_by_date: date_id
+- claims_by_quarter: year, quarter (from dates)
+- claims_by_region: region (from customers)
+- claims_by_policy_type: policy_type (from policies)
+- claims_by_adjuster: adjuster_id
+- claims_by_status: status
+
+Every mart row holds additive statistics (claims, amount_count, amount_sum, amount_min,
+amount_max, approved) and the ones derived from them (amount_mean, approval_rate), and is stored
+as Parquet in data/marts/, so dashboards read a few kilobytes instead of the fact table.
+
+update_marts only aggregates the claims it has not seen before. The marts keep, per claim already
+folded in, its id and a hash of its fact columns (_claims.npz, sorted by id), and the signature
+(size, mtime) of every fact file they read (_sources.json):
+- when none of the fact files changed since the last update, nothing is read at all
+- otherwise the fact files are scanned once; claims with a new id are aggregated per chunk and
+  merged into the stored statistics
+- when a claim already folded in changed (amount, status, a foreign key) or, for the full
+  claims_fact output, disappeared, the additive statistics cannot be corrected in place and the
+  marts are rebuilt from the current facts
+
+The marts and the claims they cover form one generation, a directory (data/marts/gen-*/) written
+in full before the CURRENT pointer file is switched to it with a single rename, so a crashed
+update leaves the previous generation in place and never counts a claim twice. Dimension
+attributes are the ones current when a claim was aggregated; rebuild=True recomputes every mart
+from scratch. Dimension attributes are looked up through the dimensions' key indexes (see
+etl.validation.key_index), one searchsorted per foreign key.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etl import metrics
+from etl.scd import content_hashes
+from etl.schema_definition import SchemaType, claims_fact_schema, foreign_keys
+from etl.utils.output_formats import find_output, iter_output, output_path, read_output, write_output
+from etl.utils.paths import MARTS_DATA_DIR, TRANSFORMED_DATA_DIR
+from etl.validation.dedup import KeySet
+from etl.validation.key_index import load_key_index, output_signature
+from etl.validation.referential import integer_values
+
+MART_FORMAT = "parquet"
+
+FACT_TABLE = "claims_fact"
+FACT_KEY = "claim_id"
+FACT_COLUMNS = ["claim_id", "customer_id", "policy_id", "date_id", "adjuster_id", "amount", "status"]
+FACT_SCHEMA: SchemaType = {column: claims_fact_schema[column] for column in FACT_COLUMNS}
+
+# Mart -> grouping columns
+MARTS = {
+    "claims_by_date": ["date_id"],
+    "claims_by_quarter": ["year", "quarter"],
+    "claims_by_region": ["region"],
+    "claims_by_policy_type": ["policy_type"],
+    "claims_by_adjuster": ["adjuster_id"],
+    "claims_by_status": ["status"],
+}
+
+# Dimension attribute -> (fact foreign key column, attribute type)
+DIMENSION_ATTRIBUTES: dict[str, tuple[str, type]] = {
+    "year": ("date_id", int),
+    "quarter": ("date_id", str),
+    "region": ("customer_id", str),
+    "policy_type": ("policy_id", str),
+}
+
+# Additive statistic -> how two partial aggregates of it combine
+ADDITIVE = {"claims": "sum", "amount_count": "sum", "amount_sum": "sum", "amount_min": "min",
+            "amount_max": "max", "approved": "sum"}
+
+MART_SCHEMA: SchemaType = {
+    "date_id": int, "year": int, "quarter": str, "region": str, "policy_type": str, "adjuster_id": int,
+    "status": str, "claims": int, "amount_count": int, "amount_sum": float, "amount_min": float,
+    "amount_max": float, "amount_mean": float, "approved": int, "approval_rate": float,
+}
+
+APPROVED_STATUS = "Approved"
+
+CLAIMS_FILE = "_claims.npz"
+SOURCES_FILE = "_sources.json"
+CURRENT_FILE = "CURRENT"
+GENERATION_PREFIX = "gen-"
+
+
+class DimensionLookup:
+    """
+    Attributes of a dimension, looked up by key through the dimension's key index.
+    """
+
+    def __init__(self, table: str, key: str, attributes: list[str], directory: Path):
+        output = find_output(directory, table)
+        self.keys, rows = load_key_index(output, key)
+        self.values = read_output(output, attributes).iloc[np.asarray(rows)].reset_index(drop=True)
+
+    def lookup(self, values: pd.Series, attribute: str) -> pd.Series:
+        """
+        Returns the attribute of every foreign key value (missing where the key is unknown).
+        """
+        if not len(self.keys):
+            return pd.Series(pd.NA, index=values.index, dtype="object")
+        usable, ints = integer_values(values)
+        keys = np.asarray(self.keys)
+        positions = np.minimum(np.searchsorted(keys, ints), len(keys) - 1)
+        found = usable & (keys[positions] == ints)
+        column = self.values[attribute].iloc[positions].reset_index(drop=True)
+        return column.where(found).set_axis(values.index)
+
+
+def dimension_lookups(directory: Path) -> dict[str, DimensionLookup]:
+    """
+    Loads the dimension attributes the marts group by, per fact foreign key column.
+    """
+    lookups = {}
+    for column in {column for column, _ in DIMENSION_ATTRIBUTES.values()}:
+        table, key = foreign_keys[FACT_TABLE][column]
+        attributes = [name for name, (fk, _) in DIMENSION_ATTRIBUTES.items() if fk == column]
+        lookups[column] = DimensionLookup(table, key, attributes, directory)
+    return lookups
+
+
+def enrich(df: pd.DataFrame, lookups: dict[str, DimensionLookup]) -> pd.DataFrame:
+    """
+    Adds the dimension attributes and typed amount/approval columns to a chunk of claims.
+    """
+    enriched = pd.DataFrame(index=df.index)
+    for column in ("date_id", "adjuster_id"):
+        enriched[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    enriched["status"] = df["status"].astype("string")
+    for attribute, (column, attribute_type) in DIMENSION_ATTRIBUTES.items():
+        values = lookups[column].lookup(df[column], attribute)
+        enriched[attribute] = pd.to_numeric(values, errors="coerce").astype("Int64") if attribute_type is int \
+            else values.astype("string")
+    amount = pd.to_numeric(df["amount"], errors="coerce")
+    enriched["amount_sum"] = amount
+    enriched["amount_min"] = amount
+    enriched["amount_max"] = amount
+    enriched["amount_count"] = amount.notna().astype("int64")
+    enriched["approved"] = (df["status"] == APPROVED_STATUS).astype("int64")
+    enriched["claims"] = 1
+    return enriched
+
+
+def aggregate(df: pd.DataFrame, group: list[str]) -> pd.DataFrame:
+    """
+    Combines rows (claims or partial aggregates) into the additive statistics of each group.
+    """
+    combined = df.groupby(group, dropna=False, sort=True)[list(ADDITIVE)].agg(ADDITIVE)
+    return combined.reset_index()
+
+
+def finish(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the derived statistics of a mart.
+    """
+    df["amount_mean"] = (df["amount_sum"] / df["amount_count"].where(df["amount_count"] > 0)).astype("float64")
+    df["approval_rate"] = (df["approved"] / df["claims"]).astype("float64")
+    return df
+
+
+def current_generation(directory: Path | None = None) -> Path | None:
+    """
+    Resolves the CURRENT pointer of a marts directory to its generation directory.
+    Returns:
+        Path | None: Directory of the current marts and ids, None before the first update
+    """
+    pointer = (directory or MARTS_DATA_DIR) / CURRENT_FILE
+    if not pointer.exists():
+        return None
+    return pointer.parent / pointer.read_text().strip()
+
+
+def switch_generation(directory: Path, generation: Path) -> None:
+    """
+    Points CURRENT at a fully written generation, then drops the older (or abandoned) ones.
+    """
+    hidden = directory / f".{CURRENT_FILE}"
+    hidden.write_text(generation.name)
+    os.replace(hidden, directory / CURRENT_FILE)
+    for other in directory.glob(f"{GENERATION_PREFIX}*"):
+        if other != generation:
+            shutil.rmtree(other, ignore_errors=True)
+
+
+def mart_path(mart: str, directory: Path | None = None) -> Path:
+    """
+    Builds the path of a mart in the current generation of a marts directory.
+    """
+    directory = directory or MARTS_DATA_DIR
+    return output_path(current_generation(directory) or directory, mart, MART_FORMAT)
+
+
+def read_mart(mart: str, directory: Path | None = None) -> pd.DataFrame:
+    """
+    Reads a mart's stored statistics.
+    """
+    return read_output(mart_path(mart, directory))
+
+
+class FoldedClaims:
+    """
+    The claims folded into a generation of the marts: sorted ids, the content hash of each claim,
+    and the signatures of the fact files they were read from.
+    """
+
+    def __init__(self, ids: np.ndarray | None = None, hashes: np.ndarray | None = None,
+                 sources: dict[str, dict] | None = None):
+        self.ids = ids if ids is not None else np.empty(0, dtype="int64")
+        self.hashes = hashes if hashes is not None else np.empty(0, dtype="int64")
+        self.sources = sources or {}
+
+    @classmethod
+    def read(cls, generation: Path | None) -> "FoldedClaims | None":
+        """
+        Reads the claims of a generation, or None when there is none (or it predates this format).
+        """
+        if generation is None or not (generation / CLAIMS_FILE).exists():
+            return None
+        with np.load(generation / CLAIMS_FILE) as arrays:
+            ids, hashes = arrays["ids"], arrays["hashes"]
+        return cls(ids, hashes, json.loads((generation / SOURCES_FILE).read_text()))
+
+    def write(self, generation: Path) -> None:
+        np.savez(generation / CLAIMS_FILE, ids=self.ids, hashes=self.hashes)
+        (generation / SOURCES_FILE).write_text(json.dumps(self.sources, indent=2, sort_keys=True))
+
+    def find(self, ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Looks up claim ids.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Mask of the ids already folded in, and their stored hashes
+        """
+        if not len(self.ids):
+            return np.zeros(len(ids), dtype=bool), np.zeros(len(ids), dtype="int64")
+        positions = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return self.ids[positions] == ids, self.hashes[positions]
+
+    def merge(self, ids: list[np.ndarray], hashes: list[np.ndarray], sources: dict[str, dict]) -> "FoldedClaims":
+        all_ids = np.concatenate([self.ids] + ids)
+        order = np.argsort(all_ids, kind="stable")
+        return FoldedClaims(all_ids[order], np.concatenate([self.hashes] + hashes)[order],
+                            {**self.sources, **sources})
+
+
+def fold_claims(paths: list[Path], folded: FoldedClaims, lookups: dict[str, DimensionLookup], chunk_size: int,
+                counts) -> tuple[dict[str, list[pd.DataFrame]], list[np.ndarray], list[np.ndarray], int] | None:
+    """
+    Aggregates the claims of the fact files that are not folded in yet.
+    Returns:
+        tuple | None: Partial aggregates per mart, ids and hashes of the new claims, and how many
+        folded claims were found again; None as soon as a folded claim turns out to have changed
+    """
+    partials = {mart: [] for mart in MARTS}
+    new_ids, new_hashes = [], []
+    seen = KeySet()
+    found = 0
+    for path in paths:
+        for chunk in iter_output(path, FACT_COLUMNS, chunk_size):
+            counts.rows_in += len(chunk)
+            usable, ids = integer_values(chunk[FACT_KEY])
+            # A claim id counts once, at its first row
+            first = usable & ~seen.contains(ids) & ~pd.Series(ids).duplicated().to_numpy()
+            seen.add(ids[first])
+            hashes = content_hashes(chunk, FACT_SCHEMA, FACT_KEY)
+            known, known_hashes = folded.find(ids)
+            known &= first
+            if (known_hashes[known] != hashes[known]).any():
+                return None
+            found += int(known.sum())
+            new = first & ~known
+            if not new.any():
+                continue
+            new_ids.append(ids[new])
+            new_hashes.append(hashes[new])
+            enriched = enrich(chunk[new], lookups)
+            for mart, group in MARTS.items():
+                partials[mart].append(aggregate(enriched, group))
+    return partials, new_ids, new_hashes, found
+
+
+def update_marts(paths: list[Path] | None = None, rebuild: bool = False, directory: Path | None = None,
+                 source_dir: Path | None = None, chunk_size: int = 100_000) -> int:
+    """
+    Folds the claims not aggregated yet into every mart, rebuilding the marts when claims already
+    aggregated changed.
+    Args:
+        paths (list[Path], optional): Claims fact files holding new claims, defaults to the full
+            claims_fact output (whose missing claims are then treated as removed)
+        rebuild (bool): Discard the stored marts and aggregate every claim again
+        directory (Path, optional): Marts directory, defaults to data/marts/
+        source_dir (Path, optional): Transformed data directory, defaults to data/transformed/
+        chunk_size (int): Claims read at a time
+    Returns:
+        int: Number of newly aggregated claims (every claim when the marts were rebuilt)
+    """
+    directory = directory or MARTS_DATA_DIR
+    source_dir = source_dir or TRANSFORMED_DATA_DIR
+    snapshot = paths is None
+    paths = paths or [find_output(source_dir, FACT_TABLE)]
+    sources = {str(path): output_signature(path, FACT_KEY) for path in paths}
+    current = None if rebuild else current_generation(directory)
+    folded = FoldedClaims.read(current)
+    if current is not None and folded is None:
+        logging.info(f"Marts in {current} do not record their claims; rebuilding")
+        current = None
+    if folded is not None and all(folded.sources.get(path) == signature for path, signature in sources.items()):
+        logging.info(f"Claims unchanged since the last update of the marts in {directory}")
+        return 0
+
+    lookups = dimension_lookups(source_dir)
+    with metrics.stage("marts") as counts:
+        folded = folded or FoldedClaims()
+        result = fold_claims(paths, folded, lookups, chunk_size, counts)
+        if result is not None and snapshot and result[3] < len(folded.ids):
+            logging.info(f"{len(folded.ids) - result[3]} aggregated claims were removed; rebuilding the marts")
+            result = None
+        elif result is None:
+            logging.info("Aggregated claims changed; rebuilding the marts")
+        if result is None:
+            current, folded = None, FoldedClaims()
+            result = fold_claims(paths, folded, lookups, chunk_size, counts)
+        partials, new_ids, new_hashes, _ = result
+        new_claims = sum(len(ids) for ids in new_ids)
+
+        directory.mkdir(parents=True, exist_ok=True)
+        generation = Path(tempfile.mkdtemp(dir=directory, prefix=GENERATION_PREFIX))
+        for mart, group in MARTS.items():
+            parts = partials[mart]
+            if current is not None:
+                parts = [read_output(output_path(current, mart, MART_FORMAT))[group + list(ADDITIVE)]] + parts
+            if parts:
+                mart_df = finish(aggregate(pd.concat(parts, ignore_index=True), group))
+            else:
+                mart_df = finish(pd.DataFrame(columns=group + list(ADDITIVE)))
+            path = write_output(mart_df, generation, mart, MART_SCHEMA, MART_FORMAT)
+            counts.bytes_written += path.stat().st_size
+        folded.merge(new_ids, new_hashes, sources).write(generation)
+        # Marts and the claims they cover become visible together
+        switch_generation(directory, generation)
+        counts.rows_out = new_claims
+
+    logging.info(f"Aggregated {new_claims} new claims into {len(MARTS)} marts in {directory}")
+    return new_claims
@@ -0,0 +1,301 @@
+"""
+Structured per-stage metrics of the transform pipeline.
+
+A transform run is wrapped with track_run (a decorator on each script's main), and the pipeline
+functions in etl/transform_base.py wrap their work in stage(...) blocks:
+- load: raw rows read, bytes of the raw files
+- clean: rows in and out of the cleaning function
+- validate: rows checked, valid and rejected
+- save: rows and bytes written
+- dedup: survivorship pre-pass over the primary keys (see etl.validation.dedup)
+- scd: merge of a dimension snapshot into its history (see etl.scd)
+- marts: claims folded into the aggregate marts (see etl.marts)
+- total: the whole run
+
+Each stage records wall and CPU time, row counts, bytes read/written and the peak RSS of the
+process while it ran; in streaming mode the chunks of a stage add up into one record. When the
+run ends, every stage is appended as one JSON line to metrics.jsonl and the table's gauges are
+written to etl_<table>.prom (Prometheus text format, for the node exporter textfile collector)
+in ETL_METRICS_DIR.
+
+Metrics are off when ETL_METRICS_DIR is empty: track_run then calls the function directly and,
+unless the run is profiled, stage blocks only hand out a throwaway counter.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, fields
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from config.settings import ETL_METRICS_DIR
+from etl.profiling import current_profiler
+
+METRICS_DIR = Path(ETL_METRICS_DIR) if ETL_METRICS_DIR else None
+
+# Seconds between two RSS samples while a stage runs
+RSS_SAMPLE_INTERVAL = 0.005
+
+# Gauge name suffix -> help text, one gauge per StageMetrics field
+GAUGES = {
+    "calls": "Number of times the stage ran (chunks in streaming mode)",
+    "wall_seconds": "Wall time spent in the stage",
+    "cpu_seconds": "Process CPU time spent in the stage",
+    "rows_in": "Rows entering the stage",
+    "rows_out": "Rows leaving the stage",
+    "rows_rejected": "Rows rejected by the stage",
+    "bytes_read": "Bytes read by the stage",
+    "bytes_written": "Bytes written by the stage",
+    "peak_rss_bytes": "Peak resident set size of the process during the stage",
+}
+
+
+class PeakRss:
+    """
+    Samples the resident set size of the current process in a background thread.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        import psutil
+
+        self.process = psutil.Process()
+        self.interval = interval
+        self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self) -> "PeakRss":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+@dataclass
+class StageCounts:
+    """
+    Counters filled in by the code inside a stage block.
+    """
+    rows_in: int = 0
+    rows_out: int = 0
+    rows_rejected: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+
+@dataclass
+class StageMetrics:
+    """
+    Accumulated metrics of one stage of a run.
+    """
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    rows_rejected: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    peak_rss_bytes: int = 0
+
+    def add(self, counts: StageCounts) -> None:
+        for field in fields(counts):
+            setattr(self, field.name, getattr(self, field.name) + getattr(counts, field.name))
+
+
+class RunMetrics:
+    """
+    Metrics of one table's transform run, stage by stage.
+    """
+
+    def __init__(self, table: str, directory: Path):
+        self.table = table
+        self.directory = directory
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.stages: dict[str, StageMetrics] = {}
+        self.active: set[str] = set()
+
+    def metrics(self, name: str) -> StageMetrics:
+        if name not in self.stages:
+            self.stages[name] = StageMetrics()
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0) -> Iterator[StageCounts]:
+        counts = StageCounts(rows_in=rows_in)
+        self.active.add(name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            with PeakRss() as rss:
+                yield counts
+        finally:
+            self.active.discard(name)
+            metrics = self.metrics(name)
+            metrics.calls += 1
+            metrics.wall_seconds += time.perf_counter() - wall
+            metrics.cpu_seconds += time.process_time() - cpu
+            metrics.peak_rss_bytes = max(metrics.peak_rss_bytes, rss.peak)
+            metrics.add(counts)
+
+    def records(self, status: str) -> list[dict]:
+        """
+        Returns one JSON-ready record per stage.
+        """
+        return [
+            {"run_id": self.run_id, "started": round(self.started, 3), "table": self.table, "stage": name,
+             "status": status, **{key: round(value, 6) if isinstance(value, float) else value
+                                  for key, value in asdict(metrics).items()}}
+            for name, metrics in self.stages.items()
+        ]
+
+    def prometheus(self, status: str) -> str:
+        """
+        Renders the run's gauges in the Prometheus text exposition format.
+        """
+        lines = []
+        for key, help_text in GAUGES.items():
+            name = f"etl_stage_{key}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for stage, metrics in self.stages.items():
+                lines.append(f'{name}{{table="{self.table}",stage="{stage}"}} {getattr(metrics, key)}')
+        lines += [
+            "# HELP etl_run_timestamp_seconds Start time of the last run",
+            "# TYPE etl_run_timestamp_seconds gauge",
+            f'etl_run_timestamp_seconds{{table="{self.table}"}} {self.started:.3f}',
+            "# HELP etl_run_success Whether the last run finished without an error",
+            "# TYPE etl_run_success gauge",
+            f'etl_run_success{{table="{self.table}"}} {int(status == "ok")}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, status: str) -> None:
+        """
+        Appends the stage records to metrics.jsonl and replaces the table's .prom file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(record) + "\n" for record in self.records(status))
+        with open(self.directory / "metrics.jsonl", "a") as f:
+            f.write(lines)
+
+        # Written to a temporary file first so the textfile collector never reads a partial file
+        path = self.directory / f"etl_{self.table}.prom"
+        tmp = path.with_name(f".{path.name}.{os.getpid()}")
+        tmp.write_text(self.prometheus(status))
+        os.replace(tmp, path)
+        logging.info(f"Wrote metrics of {len(self.stages)} stages for {self.table} to {self.directory}")
+
+
+_current_run: ContextVar[RunMetrics | None] = ContextVar("current_run", default=None)
+
+
+def current_run() -> RunMetrics | None:
+    return _current_run.get()
+
+
+def track_run(table: str) -> Callable:
+    """
+    Decorator collecting the stage metrics of a table's transform run (e.g. a script's main)
+    and writing them when it returns or fails. A no-op when metrics are off.
+    Args:
+        table (str): Table label of the run's metrics
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if METRICS_DIR is None or current_run() is not None:
+                return func(*args, **kwargs)
+            run = RunMetrics(table, METRICS_DIR)
+            token = _current_run.set(run)
+            status = "error"
+            try:
+                with run.stage("total"):
+                    result = func(*args, **kwargs)
+                status = "ok"
+                return result
+            finally:
+                _current_run.reset(token)
+                run.write(status)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage(name: str, rows_in: int = 0) -> Iterator[StageCounts]:
+    """
+    Measures a pipeline stage of the current run, and profiles it when the run is profiled
+    (see etl.profiling). Nested blocks of the same stage (e.g. clean_dataframe inside
+    clean_customers) are counted once, by the outermost block.
+    Args:
+        name (str): Stage name, e.g. 'load'
+        rows_in (int): Rows entering the stage
+    Yields:
+        StageCounts: Counters to fill in (rows_out, rows_rejected, bytes_read, bytes_written)
+    """
+    run = current_run()
+    profiler = current_profiler()
+    if profiler is None and (run is None or name in run.active):
+        yield StageCounts(rows_in=rows_in)
+        return
+    with ExitStack() as stack:
+        if profiler is not None:
+            stack.enter_context(profiler.stage(name))
+        if run is not None and name not in run.active:
+            counts = stack.enter_context(run.stage(name, rows_in))
+        else:
+            counts = StageCounts(rows_in=rows_in)
+        yield counts
+
+
+def count(name: str, **counts: int) -> None:
+    """
+    Adds counters to a stage of the current run without timing anything.
+    """
+    run = current_run()
+    if run is not None:
+        run.metrics(name).add(StageCounts(**counts))
+
+
+def stage_function(name: str) -> Callable:
+    """
+    Decorator measuring a DataFrame -> DataFrame function as a stage, counting rows in and out.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(df, *args, **kwargs):
+            with stage(name, len(df)) as counts:
+                result = func(df, *args, **kwargs)
+                counts.rows_out = len(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def iter_stage(name: str, batches: Iterable) -> Iterator:
+    """
+    Measures the time spent producing each batch of an iterator (e.g. reading chunks) as a stage.
+    Batches are (DataFrame, ...) tuples; their DataFrame rows are counted as rows_out.
+    """
+    iterator = iter(batches)
+    while True:
+        with stage(name) as counts:
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                return
+            counts.rows_out = len(batch[0])
+        yield batch
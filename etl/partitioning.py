@@ -0,0 +1,263 @@
+"""
+Byte-range partitioned execution of a table transform across worker processes.
+
+Each raw CSV is split into line-aligned byte ranges, every range is parsed, cleaned and
+validated in a worker process, and the per-partition output files are concatenated in partition
+order. Output therefore matches a single-process run row for row. Partitioning assumes one
+record per line (no quoted newlines), which holds for the generated raw files.
+
+Primary key deduplication spans partitions: a first pass over the partitions only collects the key
+hashes of their otherwise valid rows (see Deduplicator.scan), the parent picks the losing rows of
+the whole table, and each partition then gets its own losers for the second, transforming pass.
+
+A profiled run (see etl.profiling) does not reach into the worker processes by itself, so the
+workers profile each partition on their own, into the same run directory, as
+<table>-partNNNNN (and <table>-partNNNNN-dedup for the key scans).
+"""
+
+import io
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from config.logger import pool_logging_options
+from etl import metrics
+from etl.profiling import current_profiler, profiled
+from etl.schema_definition import SchemaType
+from etl.transform_base import split_valid_invalid
+from etl.utils.load import raw_table_columns, raw_table_paths
+from etl.utils.output_formats import concat_outputs, output_path, resolve_format, write_output
+from etl.utils.paths import REJECTED_DATA_DIR, TRANSFORMED_DATA_DIR, ensure_dir
+from etl.validation.constraints import Constraint
+from etl.validation.dedup import Deduplicator
+from etl.validation.referential import KeyIndexes
+from etl.validation.rejections import CODE_COLUMN, RejectionSink, RuleCodes
+from etl.validation.validate_data import scan_keys
+
+
+def byte_range_partitions(path: Path, num_partitions: int) -> list[tuple[int, int]]:
+    """
+    Splits a CSV file into line-aligned byte ranges, skipping the header line.
+    Args:
+        path (Path): CSV file
+        num_partitions (int): Target number of partitions
+    Returns:
+        list[tuple[int, int]]: Non-empty (start, end) byte offsets, in file order
+    """
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+        step = max((size - data_start) // max(num_partitions, 1), 1)
+
+        bounds = [data_start]
+        for target in range(data_start + step, size, step):
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # move to the start of the next line
+            if bounds[-1] < f.tell() < size:
+                bounds.append(f.tell())
+        bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def read_partition(path: Path, start: int, end: int, columns: list[str]) -> pd.DataFrame:
+    """
+    Parses one byte range of a CSV file, using the file's own header.
+    Args:
+        path (Path): CSV file
+        start (int): First byte of the range (start of a line)
+        end (int): End of the range (exclusive, start of a line or end of file)
+        columns (list[str]): Columns to align the partition to
+    Returns:
+        pd.DataFrame: Rows of the partition
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(start)
+        body = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(header + body))
+    return df.reindex(columns=columns)
+
+
+def scan_partition(
+    task: tuple[int, Path, int, int],
+    columns: list[str],
+    schema: SchemaType,
+    table: str,
+    clean: Callable[[pd.DataFrame], pd.DataFrame],
+    deduplicator: Deduplicator,
+    key_indexes: KeyIndexes | None = None,
+    rules: list[Constraint] | None = None,
+    profile_dir: Path | None = None,
+) -> tuple[int, tuple[np.ndarray, np.ndarray, np.ndarray | None]]:
+    """
+    Collects the primary key hashes of the rows of one cleaned partition passing every other
+    check. Executed inside a worker process.
+    Returns:
+        tuple: Number of raw rows in the partition, and its scan (positions local to the partition)
+    """
+    number, path, start, end = task
+    with profiled(f"{table}-part{number:05d}-dedup", profile_dir):
+        df = read_partition(path, start, end, columns)
+        return len(df), scan_keys(clean(df), schema, deduplicator, key_indexes, rules=rules)
+
+
+def plan_partition_losers(scans: list[tuple[int, tuple]], deduplicator: Deduplicator) -> list[np.ndarray]:
+    """
+    Picks the losing rows of the whole table from the partition scans.
+    Returns:
+        list[np.ndarray]: Sorted local positions of the losing rows, per partition
+    """
+    offsets = np.cumsum([0] + [rows for rows, _ in scans])
+    deduplicator.plan((hashes, positions + offset, scores)
+                      for (_, (hashes, positions, scores)), offset in zip(scans, offsets))
+    bounds = np.searchsorted(deduplicator.losers, offsets)
+    return [deduplicator.losers[lo:hi] - offset for lo, hi, offset in zip(bounds, bounds[1:], offsets)]
+
+
+def transform_partition(
+    task: tuple[int, Path, int, int],
+    losers: np.ndarray | None,
+    columns: list[str],
+    schema: SchemaType,
+    table: str,
+    clean: Callable[[pd.DataFrame], pd.DataFrame],
+    parts_dir: Path,
+    key_indexes: KeyIndexes | None = None,
+    fmt: str | None = None,
+    rules: list[Constraint] | None = None,
+    codes: RuleCodes | None = None,
+    deduplicator: Deduplicator | None = None,
+    profile_dir: Path | None = None,
+) -> tuple[int, int, np.ndarray]:
+    """
+    Cleans and validates one partition and writes its valid and rejected rows as part files.
+    Executed inside a worker process.
+    Args:
+        task (tuple): (partition number, path, start, end)
+        losers (np.ndarray | None): Sorted local positions of the partition's rows losing to another
+            row with the same primary key (see plan_partition_losers)
+        columns (list[str]): Columns shared by all partitions
+        schema (SchemaType): Table schema
+        table (str): Raw table name
+        clean (Callable): Cleaning function (must be picklable)
+        parts_dir (Path): Directory for part files
+        key_indexes (KeyIndexes, optional): Dimension keys for foreign key checks
+        fmt (str, optional): Output format of the part files
+        rules (list[Constraint], optional): Domain rules of the table
+        codes (RuleCodes, optional): Rejection codes of the table
+        deduplicator (Deduplicator, optional): Primary key deduplicator of the table, without a plan
+        profile_dir (Path, optional): Run directory of the profiled parent run; None disables profiling
+    Returns:
+        tuple[int, int, np.ndarray]: Number of valid and rejected rows in the partition, and rejected rows per rule
+    """
+    number, path, start, end = task
+    with profiled(f"{table}-part{number:05d}", profile_dir):
+        df = read_partition(path, start, end, columns)
+        codes = codes or RuleCodes.for_table(schema, rules, key_indexes)
+        if deduplicator is not None:
+            deduplicator = Deduplicator(deduplicator.key, deduplicator.survivorship, deduplicator.integer,
+                                        losers=losers)
+        valid_df, invalid_df = split_valid_invalid(clean(df), schema, table, key_indexes, rules=rules, codes=codes,
+                                                   deduplicator=deduplicator)
+
+        write_output(valid_df, parts_dir, f"valid-{number:05d}", schema, fmt)
+        write_output(invalid_df, parts_dir, f"rejected-{number:05d}", {CODE_COLUMN: int}, fmt)
+        return len(valid_df), len(invalid_df), codes.count(invalid_df[CODE_COLUMN].to_numpy())
+
+
+def transform_partitioned(
+    table: str,
+    schema: SchemaType,
+    clean: Callable[[pd.DataFrame], pd.DataFrame],
+    workers: int,
+    output_table: str | None = None,
+    partitions_per_worker: int = 4,
+    key_indexes: KeyIndexes | None = None,
+    fmt: str | None = None,
+    rules: list[Constraint] | None = None,
+    primary_key: str | None = None,
+) -> tuple[int, int]:
+    """
+    Transforms a raw table by splitting its CSVs into byte ranges processed in a process pool.
+    Identical rows are only dropped within a partition, but rows sharing the primary key are
+    deduplicated across partitions.
+    Args:
+        table (str): Raw table name, e.g. 'claims'
+        schema (SchemaType): Table schema
+        clean (Callable): Cleaning function applied to each partition (must be picklable)
+        workers (int): Number of worker processes
+        output_table (str, optional): Name of the output files, defaults to table
+        partitions_per_worker (int): Partitions per worker, for load balancing
+        key_indexes (KeyIndexes, optional): Dimension keys for foreign key checks
+        fmt (str, optional): Output format, defaults to ETL_OUTPUT_FORMAT
+        rules (list[Constraint], optional): Domain rules of the table
+        primary_key (str, optional): Primary key of the table, deduplicated with ETL_SURVIVORSHIP
+    Returns:
+        tuple[int, int]: Number of valid and rejected rows written
+    """
+    output_table = output_table or table
+    fmt = resolve_format(fmt)
+    profiler = current_profiler()
+    profile_dir = profiler.directory if profiler is not None else None
+    codes = RuleCodes.for_table(schema, rules, key_indexes, primary_key)
+    deduplicator = Deduplicator.for_table(primary_key, schema)
+    columns = raw_table_columns(table)
+    tasks = []
+    for path in raw_table_paths(table):
+        for start, end in byte_range_partitions(path, workers * partitions_per_worker):
+            tasks.append((len(tasks), path, start, end))
+    logging.info(f"Split {table} into {len(tasks)} partitions for {workers} workers")
+
+    ensure_dir(TRANSFORMED_DATA_DIR)
+    with tempfile.TemporaryDirectory(dir=TRANSFORMED_DATA_DIR, prefix=f".{output_table}-parts-") as tmp:
+        parts_dir = Path(tmp)
+        # Workers load, clean, validate and write their partitions; only the pool as a whole is measured
+        # here, and a profiled run's workers profile their own partitions
+        with metrics.stage("partitions") as stage_counts:
+            with ProcessPoolExecutor(max_workers=workers, **pool_logging_options()) as pool:
+                losers = [None] * len(tasks)
+                if deduplicator is not None:
+                    with metrics.stage("dedup"):
+                        scanner = partial(scan_partition, columns=columns, schema=schema, table=table, clean=clean,
+                                          deduplicator=deduplicator, key_indexes=key_indexes, rules=rules,
+                                          profile_dir=profile_dir)
+                        losers = plan_partition_losers(list(pool.map(scanner, tasks)), deduplicator)
+                    deduplicator.losers = None  # workers only receive their own partition's losers
+                worker = partial(transform_partition, columns=columns, schema=schema, table=table,
+                                 clean=clean, parts_dir=parts_dir, key_indexes=key_indexes, fmt=fmt, rules=rules,
+                                 codes=codes, deduplicator=deduplicator, profile_dir=profile_dir)
+                counts = list(pool.map(worker, tasks, losers))
+
+            valid_rows = sum(valid for valid, _, _ in counts)
+            rejected_rows = sum(rejected for _, rejected, _ in counts)
+            stage_counts.bytes_read = sum(end - start for _, _, start, end in tasks)
+            stage_counts.rows_out = valid_rows
+            stage_counts.rows_rejected = rejected_rows
+
+        with metrics.stage("save", valid_rows + rejected_rows) as stage_counts:
+            valid_path = output_path(TRANSFORMED_DATA_DIR, output_table, fmt)
+            concat_outputs(sorted(parts_dir.glob(f"valid-*{valid_path.suffix}")), valid_path)
+            logging.info(f"Saved {valid_rows} rows to {valid_path}")
+            stage_counts.bytes_written = valid_path.stat().st_size
+
+            # Rows per rule were counted by the workers, so the rejected parts are only copied
+            with RejectionSink(output_table, codes, fmt, directory=REJECTED_DATA_DIR) as sink:
+                for _, rejected, rule_counts in counts:
+                    sink.add_counts(rejected, rule_counts)
+                if rejected_rows:
+                    sink.concat(sorted(parts_dir.glob(f"rejected-*{valid_path.suffix}")))
+            if rejected_rows:
+                stage_counts.bytes_written += sink.path.stat().st_size
+            stage_counts.rows_out = valid_rows + rejected_rows
+
+    return valid_rows, rejected_rows
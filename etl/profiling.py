@@ -0,0 +1,212 @@
+"""
+Opt-in profiling of transform runs, stage by stage.
+
+Wrapping a run in profiled(table, directory) attaches a RunProfiler to the pipeline stages of
+etl/metrics.py (load, clean, validate, save, ...). Each stage gets its own cProfile profiler and
+tracemalloc snapshots, accumulated over streaming chunks, and when the run ends the directory
+receives, per table:
+- <table>.<stage>.prof: cProfile dump of the stage (open with pstats or snakeviz)
+- <table>.prof: all stages merged
+- <table>.allocations.txt: peak traced memory and top allocation sites (of memory still held
+  when the stage ended) per stage
+- <table>.summary.txt: hottest functions of the table, overall and per stage
+
+Profiling is off unless a directory is given: profiled(table, None) does nothing, and the
+stage hooks only check one context variable.
+
+The context variable does not cross process boundaries, so stages run in process pool workers
+are not part of the parent's profile: code submitting work to a pool passes the run directory
+along and profiles each task in the worker (see run_transform in scripts/transform_all.py, and
+etl.partitioning for the ETL_WORKERS > 1 partitions, profiled as <table>-partNNNNN).
+"""
+
+import argparse
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator
+
+DEFAULT_PROFILE_DIR = Path("logs/profiles")
+
+# Frames kept per traced allocation (reports group allocations by line), and allocation sites /
+# functions listed per stage
+TRACEMALLOC_FRAMES = 1
+TOP_ALLOCATIONS = 15
+TOP_FUNCTIONS = 25
+
+# Allocation sites left out of the reports
+IGNORED_SITES = (tracemalloc.__file__, "<frozen importlib._bootstrap", "<unknown>")
+
+
+class StageProfile:
+    """
+    cProfile and tracemalloc results of one stage, accumulated over its calls.
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.calls = 0
+        self.peak_traced = 0
+        self.allocations: dict[str, list[int]] = {}  # site -> [size, blocks]
+
+    def add_allocations(self, snapshot: tracemalloc.Snapshot) -> None:
+        for statistic in snapshot.statistics("lineno"):
+            frame = statistic.traceback[0]
+            if not frame.filename.startswith(IGNORED_SITES):
+                totals = self.allocations.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                totals[0] += statistic.size
+                totals[1] += statistic.count
+
+
+class RunProfiler:
+    """
+    Profiles the stages of one table's transform run.
+    """
+
+    def __init__(self, table: str, directory: Path):
+        self.table = table
+        self.directory = directory
+        self.stages: dict[str, StageProfile] = {}
+        self.active: str | None = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        # cProfile cannot nest profilers, so nested stages are attributed to the outermost one
+        if self.active is not None:
+            yield
+            return
+        profile = self.stages.setdefault(name, StageProfile())
+        self.active = name
+        # Only allocations made by the stage are traced, so the snapshot at the end holds what it kept alive
+        tracemalloc.clear_traces()
+        profile.profiler.enable()
+        try:
+            yield
+        finally:
+            profile.profiler.disable()
+            profile.peak_traced = max(profile.peak_traced, tracemalloc.get_traced_memory()[1])
+            profile.add_allocations(tracemalloc.take_snapshot())
+            profile.calls += 1
+            self.active = None
+
+    def merged_stats(self) -> pstats.Stats | None:
+        profilers = [profile.profiler for profile in self.stages.values()]
+        if not profilers:
+            return None
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+    def write(self) -> None:
+        """
+        Writes the .prof dumps, the allocation report and the text summary of the run.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, profile in self.stages.items():
+            profile.profiler.dump_stats(self.directory / f"{self.table}.{name}.prof")
+        merged = self.merged_stats()
+        if merged is not None:
+            merged.dump_stats(self.directory / f"{self.table}.prof")
+
+        allocations = []
+        for name, profile in self.stages.items():
+            allocations.append(f"== {self.table} {name}: {profile.calls} calls, peak traced memory "
+                               f"{profile.peak_traced / 2**20:.1f} MB, still allocated when the stage ended:")
+            top = sorted(profile.allocations.items(), key=lambda item: item[1][0], reverse=True)
+            for site, (size, count) in top[:TOP_ALLOCATIONS]:
+                allocations.append(f"{size / 2**10:>12,.1f} KiB {count:>10} blocks  {site}")
+            allocations.append("")
+        (self.directory / f"{self.table}.allocations.txt").write_text("\n".join(allocations))
+
+        summary = [f"# {self.table}: all stages, by cumulative time", format_stats(merged, "cumulative")]
+        for name, profile in self.stages.items():
+            summary += [f"# {self.table} {name}: by internal time",
+                        format_stats(pstats.Stats(profile.profiler), "tottime")]
+        (self.directory / f"{self.table}.summary.txt").write_text("\n".join(summary))
+        logging.info(f"Wrote profiles of {len(self.stages)} stages for {self.table} to {self.directory}")
+
+
+def format_stats(stats: pstats.Stats | None, sort: str, limit: int = TOP_FUNCTIONS) -> str:
+    """
+    Renders the top functions of profiling stats as text.
+    """
+    if stats is None:
+        return "(no profiled stages)\n"
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+_current_profiler: ContextVar[RunProfiler | None] = ContextVar("current_profiler", default=None)
+
+
+def current_profiler() -> RunProfiler | None:
+    return _current_profiler.get()
+
+
+@contextmanager
+def profiled(table: str, directory: Path | None) -> Iterator[RunProfiler | None]:
+    """
+    Profiles the pipeline stages run inside the block and writes the results when it exits.
+    Args:
+        table (str): Table label used in the file names
+        directory (Path, optional): Run directory for the results; None disables profiling
+    Yields:
+        RunProfiler | None: The profiler, or None when profiling is off
+    """
+    if directory is None:
+        yield None
+        return
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = RunProfiler(table, directory)
+    token = _current_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current_profiler.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+        profiler.write()
+
+
+def run_directory(base: Path | None) -> Path | None:
+    """
+    Returns a new timestamped run directory under base (not created yet), or None when base is None.
+    """
+    if base is None:
+        return None
+    return base / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+def summarize_runs(directory: Path, limit: int = TOP_FUNCTIONS) -> Path:
+    """
+    Merges the per-table profiles of a run directory into summary.txt.
+    """
+    tables = sorted(path for path in directory.glob("*.prof") if path.name.count(".") == 1)
+    stats = pstats.Stats(*map(str, tables)) if tables else None
+    path = directory / "summary.txt"
+    path.write_text(f"# All tables ({', '.join(p.stem for p in tables)}): by cumulative time\n"
+                    + format_stats(stats, "cumulative", limit)
+                    + "# All tables: by internal time\n"
+                    + format_stats(stats, "tottime", limit))
+    return path
+
+
+def add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the --profile [DIR] option to a script's argument parser.
+    """
+    parser.add_argument("--profile", type=Path, nargs="?", const=DEFAULT_PROFILE_DIR,
+                        help=f"Profile each stage into a new run directory under DIR (default {DEFAULT_PROFILE_DIR})")
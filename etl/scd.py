@@ -0,0 +1,169 @@
+"""
+Slowly changing dimension (Type 2) history of the dimension tables.
+
+The transformed output of a dimension (e.g. customers.csv) stays a snapshot of its current rows,
+which is what the fact transforms check foreign keys against. merge_history keeps the history
+next to it, in <table>_history/, as append-only part files: every run adds one part holding only
+the delta, the rows whose key is new or whose content changed since its current version, with:
+- row_hash: int64 hash of the row's content (every schema column but the key)
+- valid_from: when the run recorded the version
+- scd_change: insert (new key) or update (new version of a known key)
+
+A version expires when the next version of its key becomes valid, so closing a changed version
+needs no rewrite of older parts; read_history derives valid_to and is_current. Keys missing from
+a snapshot (e.g. because their row was rejected) keep their current version.
+
+Nothing is compared row by row: the current versions are reduced to sorted key and hash arrays
+(from the row_hash and key columns of the parts only), content hashes are computed per column by
+pandas, and each chunk of the snapshot is matched with one searchsorted.
+"""
+
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etl import metrics
+from etl.schema_definition import SchemaType
+from etl.utils.output_formats import find_output, iter_output, open_writer, read_output
+from etl.utils.paths import TRANSFORMED_DATA_DIR
+from etl.validation.referential import integer_values
+
+HASH_COLUMN = "row_hash"
+VALID_FROM_COLUMN = "valid_from"
+CHANGE_COLUMN = "scd_change"
+
+# Columns added to the dimension's own in its history parts
+HISTORY_SCHEMA: SchemaType = {HASH_COLUMN: int, VALID_FROM_COLUMN: str, CHANGE_COLUMN: str}
+
+
+def history_dir(table: str, directory: Path | None = None) -> Path:
+    return (directory or TRANSFORMED_DATA_DIR) / f"{table}_history"
+
+
+def history_parts(table: str, directory: Path | None = None) -> list[Path]:
+    """
+    Lists the history parts of a dimension, oldest first.
+    """
+    return sorted(history_dir(table, directory).glob("part-*"))
+
+
+def content_hashes(df: pd.DataFrame, schema: SchemaType, key: str) -> np.ndarray:
+    """
+    Hashes the content of every row, i.e. its schema columns except the key.
+    Values are normalized by type first, so a row hashes the same whatever format it was read from.
+    Returns:
+        np.ndarray: int64 hash per row
+    """
+    columns = {}
+    for column, expected_type in schema.items():
+        if column == key:
+            continue
+        series = df[column] if column in df.columns else pd.Series(pd.NA, index=df.index)
+        if expected_type is int:
+            columns[column] = pd.to_numeric(series, errors="coerce").astype("Int64")
+        elif expected_type is float:
+            columns[column] = pd.to_numeric(series, errors="coerce").astype("float64")
+        else:
+            # Dates read back from Parquet are date objects, whose strings match the 'YYYY-MM-DD' of CSV
+            columns[column] = series.astype("string")
+    frame = pd.DataFrame(columns, index=df.index)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().view("int64")
+
+
+def current_versions(table: str, key: str, directory: Path | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a dimension's history to the content hash of the current version of every key.
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Sorted int64 keys, and the row hash of their current version
+    """
+    keys, hashes = [], []
+    for part in history_parts(table, directory):
+        df = read_output(part, [key, HASH_COLUMN])
+        keys.append(df[key].to_numpy(dtype="int64"))
+        hashes.append(df[HASH_COLUMN].to_numpy(dtype="int64"))
+    if not keys:
+        return np.empty(0, dtype="int64"), np.empty(0, dtype="int64")
+    # The current version of a key is its last one, i.e. the first one in reverse order
+    unique_keys, last = np.unique(np.concatenate(keys)[::-1], return_index=True)
+    return unique_keys, np.concatenate(hashes)[::-1][last]
+
+
+def merge_history(table: str, schema: SchemaType, key: str, fmt: str | None = None,
+                  directory: Path | None = None, chunk_size: int = 100_000) -> tuple[int, int, int]:
+    """
+    Merges a dimension's transformed snapshot into its SCD Type 2 history, writing only the delta.
+    Args:
+        table (str): Transformed dimension table, e.g. 'customers'
+        schema (SchemaType): Table schema
+        key (str): Business key column, e.g. 'customer_id'
+        fmt (str, optional): Format of the snapshot and history parts, defaults to ETL_OUTPUT_FORMAT
+        directory (Path, optional): Transformed data directory, defaults to data/transformed/
+        chunk_size (int): Snapshot rows compared at a time
+    Returns:
+        tuple[int, int, int]: Number of inserted, updated and unchanged keys
+    """
+    snapshot = find_output(directory or TRANSFORMED_DATA_DIR, table, fmt)
+    current_keys, current_hashes = current_versions(table, key, directory)
+    number = len(history_parts(table, directory)) + 1
+    valid_from = datetime.now().isoformat(timespec="microseconds")
+    inserted = updated = unchanged = 0
+
+    with metrics.stage("scd") as counts:
+        # Written under a hidden name first, so an interrupted run leaves no partial part behind
+        with open_writer(history_dir(table, directory), f".part-{number:05d}", {**schema, **HISTORY_SCHEMA},
+                         fmt) as writer:
+            for chunk in iter_output(snapshot, chunk_size=chunk_size):
+                usable, keys = integer_values(chunk[key])
+                hashes = content_hashes(chunk, schema, key)
+                found = np.zeros(len(chunk), dtype=bool)
+                changed = np.zeros(len(chunk), dtype=bool)
+                if len(current_keys):
+                    positions = np.minimum(np.searchsorted(current_keys, keys), len(current_keys) - 1)
+                    found = usable & (current_keys[positions] == keys)
+                    changed = found & (current_hashes[positions] != hashes)
+                new = usable & ~found
+                delta = new | changed
+                inserted += int(new.sum())
+                updated += int(changed.sum())
+                unchanged += int((found & ~changed).sum())
+                counts.rows_in += len(chunk)
+                if delta.any():
+                    rows = chunk[delta].copy()
+                    rows[HASH_COLUMN] = hashes[delta]
+                    rows[VALID_FROM_COLUMN] = valid_from
+                    rows[CHANGE_COLUMN] = np.where(new[delta], "insert", "update")
+                    writer.write(rows)
+        counts.rows_out = writer.rows
+        if writer.rows:
+            part = writer.path.with_name(writer.path.name[1:])
+            os.replace(writer.path, part)
+            counts.bytes_written = part.stat().st_size
+
+    logging.info(f"Merged {table} into its history: {inserted} inserted, {updated} updated, "
+                 f"{unchanged} unchanged")
+    return inserted, updated, unchanged
+
+
+def read_history(table: str, key: str, directory: Path | None = None) -> pd.DataFrame:
+    """
+    Reads a dimension's full SCD Type 2 history, with the expiry (valid_to, empty for current
+    versions) and is_current flag of every version.
+    Returns:
+        pd.DataFrame: Versions sorted by key, oldest first
+    """
+    parts = [read_output(part) for part in history_parts(table, directory)]
+    if not parts:
+        return pd.DataFrame(columns=[key, HASH_COLUMN, VALID_FROM_COLUMN, CHANGE_COLUMN, "valid_to", "is_current"])
+    history = pd.concat(parts, ignore_index=True)
+    # Parts are in version order, so a stable sort keeps each key's versions in order
+    history = history.iloc[np.argsort(history[key].to_numpy(dtype="int64"), kind="stable")].reset_index(drop=True)
+    keys = history[key].to_numpy(dtype="int64")
+    superseded = np.append(keys[1:] == keys[:-1], False)
+    next_valid_from = history[VALID_FROM_COLUMN].shift(-1)
+    history["valid_to"] = next_valid_from.where(superseded)
+    history["is_current"] = ~superseded
+    return history
@@ -6,8 +6,18 @@ These schemas can be reused for:
 - Validating raw and transformed data
 - Guiding data generation logic
 - Maintaining consistent structure across ETL steps
+
+Date columns use datetime.date and are expected to hold 'YYYY-MM-DD' strings after cleaning.
+
+Domain rules that go beyond types (allowed values, ranges, formats, cross-column checks) are
+declared per table in `constraints` (see etl/validation/constraints.py).
 """
 
+import calendar
+from datetime import date
+
+from etl.validation.constraints import Compare, NotNull, OneOf, Pattern, Range
+
 SchemaType = dict[str, type]
 
 claims_fact_schema = {
@@ -24,7 +34,7 @@ customers_schema = {
     "customer_id": int,
     "first_name": str,
     "last_name": str,
-    "birth_date": str,
+    "birth_date": date,
     "gender": str,
     "email": str,
     "phone_number": str,
@@ -35,8 +45,8 @@ customers_schema = {
 policies_schema = {
     "policy_id": int,
     "policy_type": str,
-    "start_date": str,
-    "end_date": str,
+    "start_date": date,
+    "end_date": date,
     "premium": float,
 }
 
@@ -63,3 +73,62 @@ schemas = {
     "dates_dim": dates_schema,
     "adjusters_dim": adjusters_schema,
 }
+
+# Primary key of each table; rows sharing a key are deduplicated (see etl/validation/dedup.py)
+primary_keys = {
+    "claims_fact": "claim_id",
+    "customers_dim": "customer_id",
+    "policies_dim": "policy_id",
+    "dates_dim": "date_id",
+    "adjusters_dim": "adjuster_id",
+}
+
+# Foreign keys of each fact table: column -> (transformed dimension table, key column)
+foreign_keys = {
+    "claims_fact": {
+        "customer_id": ("customers", "customer_id"),
+        "policy_id": ("policies", "policy_id"),
+        "date_id": ("dates", "date_id"),
+        "adjuster_id": ("adjusters", "adjuster_id"),
+    },
+}
+
+REGIONS = ("Northeast", "Southeast", "Midwest", "Southwest", "West")
+
+# Domain rules of each table, checked after the type checks
+constraints = {
+    "claims_fact": [
+        NotNull("amount"),
+        Range("amount", min=0),
+        OneOf("status", ("Approved", "Denied", "Pending")),
+    ],
+    "customers_dim": [
+        NotNull("first_name"),
+        NotNull("last_name"),
+        OneOf("gender", ("M", "F", "Other")),
+        NotNull("email"),
+        Pattern("email", r"[^@\s]+@[^@\s]+\.[A-Za-z]{2,}", "an email address"),
+        Pattern("phone_number", r"\d{10}", "10 digits"),
+        OneOf("region", REGIONS),
+        NotNull("risk_score"),
+        Range("risk_score", min=1.0, max=5.0),
+    ],
+    "policies_dim": [
+        NotNull("policy_type"),
+        OneOf("policy_type", ("life", "auto", "house", "travel", "health", "pet")),
+        Range("premium", min=0),
+        Compare("end_date", ">=", "start_date"),
+    ],
+    "dates_dim": [
+        Range("day", min=1, max=31),
+        OneOf("month", tuple(calendar.month_name[1:])),
+        Range("year", min=1900, max=2100),
+        OneOf("quarter", ("Q1", "Q2", "Q3", "Q4")),
+        OneOf("weekday", tuple(calendar.day_name)),
+    ],
+    "adjusters_dim": [
+        NotNull("name"),
+        OneOf("region", REGIONS),
+        Range("team_lead_id", min=1),
+    ],
+}
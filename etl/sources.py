@@ -0,0 +1,169 @@
+"""
+Raw data sources for the transform pipelines.
+
+A source yields a raw table as batches, either as Arrow record batches (iter_arrow) or as the
+(DataFrame, parse_errors) pairs consumed by transform_base.transform_in_chunks (iter_batches):
+- CsvSource reads data/raw/ with the configured ingest engine, like the scripts always have
+- GeneratorSource runs the vectorized block generators of scripts/generate_*.py in memory, so
+  load tests exercise clean/validate/save without writing and re-reading CSVs
+
+Generated batches go through the same string-to-schema cast as the arrow ingest engine
+(etl.utils.arrow_ingest.cast_to_schema), so downstream code sees exactly what it would see
+after reading the equivalent CSVs.
+"""
+
+import importlib
+import logging
+from abc import ABC, abstractmethod
+from datetime import date
+from functools import partial
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from etl.generation import SHARD_SIZE, shards
+from etl.schema_definition import SchemaType
+
+# Rows per batch when a source is used without an explicit chunk size
+SOURCE_BATCH_SIZE = 100_000
+
+# Raw table -> (generator module, block function)
+BLOCK_GENERATORS = {
+    "customers": ("scripts.generate_customers", "generate_customers_block"),
+    "policies": ("scripts.generate_policies", "generate_policies_block"),
+    "dates": ("scripts.generate_dates", "generate_dates_block"),
+    "adjusters": ("scripts.generate_adjusters", "generate_adjusters_block"),
+    "claims": ("scripts.generate_claims", "generate_claims_block"),
+}
+
+# Raw table -> (clean rows, messy rows) written by the generate_* scripts by default
+DEFAULT_ROWS = {
+    "customers": (800, 200),
+    "policies": (400, 150),
+    "dates": (365, 100),
+    "adjusters": (100, 30),
+    "claims": (50000, 250),
+}
+
+
+class RawSource(ABC):
+    """
+    Base class for raw table sources.
+    """
+
+    @abstractmethod
+    def iter_batches(self, table: str, schema: SchemaType,
+                     chunk_size: int) -> Iterator[tuple[pd.DataFrame, pd.DataFrame | None]]:
+        """
+        Yields a raw table as (DataFrame, parse_errors) batches of at most chunk_size rows,
+        with an index that keeps counting across batches.
+        """
+
+
+class CsvSource(RawSource):
+    """
+    Reads the clean and messy CSVs in data/raw/.
+    """
+
+    def __init__(self, engine: str | None = None):
+        self.engine = engine
+
+    def iter_batches(self, table: str, schema: SchemaType,
+                     chunk_size: int) -> Iterator[tuple[pd.DataFrame, pd.DataFrame | None]]:
+        from etl.transform_base import iter_raw_data
+
+        return iter_raw_data(table, schema, chunk_size, self.engine)
+
+
+def rechunk(tables: Iterable, chunk_size: int) -> Iterator:
+    """
+    Re-slices a stream of Arrow tables sharing one schema into tables of chunk_size rows (the
+    last one may be shorter), without copying the data.
+    """
+    import pyarrow as pa
+
+    buffered = None
+    for table in tables:
+        buffered = table if buffered is None else pa.concat_tables([buffered, table])
+        while buffered.num_rows >= chunk_size:
+            yield buffered.slice(0, chunk_size)
+            buffered = buffered.slice(chunk_size)
+    if buffered is not None and buffered.num_rows:
+        yield buffered
+
+
+class GeneratorSource(RawSource):
+    """
+    Generates raw tables in memory with the vectorized block generators.
+    Clean rows come first, then messy rows, each generated in shards of shard_size rows seeded
+    with (seed, shard) and (seed + 1, shard), like the pooled generate_* scripts, and re-sliced
+    into batches; the rows therefore do not depend on the batch size.
+    """
+
+    def __init__(self, rows: dict[str, tuple[int, int]] | None = None, scale: float = 1.0, seed: int = 42,
+                 reference_date: date = date(2025, 1, 1), shard_size: int = SHARD_SIZE):
+        """
+        Args:
+            rows (dict, optional): Raw table -> (clean rows, messy rows), defaults to DEFAULT_ROWS
+            scale (float): Multiplier applied to every row count
+            seed (int): Base seed
+            reference_date (date): 'Today' for generated birth and policy dates
+            shard_size (int): Rows generated per seeded shard (see etl.generation.write_sharded)
+        """
+        self.rows = {table: (int(clean * scale), int(messy * scale))
+                     for table, (clean, messy) in (rows or DEFAULT_ROWS).items()}
+        self.seed = seed
+        self.reference_date = reference_date
+        self.shard_size = shard_size
+
+    def block_function(self, table: str, messy: bool):
+        """
+        Returns the block function generating clean or messy rows of a table.
+        """
+        if table not in BLOCK_GENERATORS:
+            raise ValueError(f"No generator for table {table!r}; expected one of {sorted(BLOCK_GENERATORS)}")
+        module_name, function_name = BLOCK_GENERATORS[table]
+        block = getattr(importlib.import_module(module_name), function_name)
+        kwargs = {"messy": messy}
+        if table in ("customers", "adjusters"):
+            kwargs["seed"] = self.seed
+        if table in ("customers", "policies"):
+            kwargs["reference_date"] = self.reference_date
+        return partial(block, **kwargs)
+
+    def iter_arrow(self, table: str, chunk_size: int) -> Iterator:
+        """
+        Yields generated rows as Arrow tables of at most chunk_size rows: clean rows, then messy rows.
+        Messy tables carry their extra column, so the two kinds of tables have different schemas.
+        """
+        for messy in (False, True):
+            yield from self.iter_rows(table, messy, chunk_size)
+
+    def iter_rows(self, table: str, messy: bool, chunk_size: int) -> Iterator:
+        """
+        Yields the clean or the messy rows of a table as Arrow tables of at most chunk_size rows.
+        """
+        block = self.block_function(table, messy)
+        generated = (block(np.random.default_rng([self.seed + messy, number]), first_id, shard_rows)
+                     for number, first_id, shard_rows in shards(self.rows[table][messy], self.shard_size))
+        yield from rechunk(generated, chunk_size)
+
+    def iter_batches(self, table: str, schema: SchemaType,
+                     chunk_size: int) -> Iterator[tuple[pd.DataFrame, pd.DataFrame | None]]:
+        import pyarrow as pa
+
+        from etl.utils.arrow_ingest import arrow_to_pandas, cast_to_schema
+
+        offset = 0
+        for generated in self.iter_arrow(table, chunk_size):
+            # Same view of the data as reading it back from CSV: strings projected to the schema
+            strings = pa.table({
+                column: (generated.column(column).cast(pa.string()) if column in generated.column_names
+                         else pa.nulls(generated.num_rows, pa.string()))
+                for column in schema
+            })
+            typed, parse_errors = cast_to_schema(strings, schema, offset)
+            yield arrow_to_pandas(typed, offset), parse_errors
+            offset += generated.num_rows
+        logging.info(f"Generated {offset} rows for table {table}")
@@ -1,25 +1,147 @@
+import calendar
 import pandas as pd
 import logging
-from etl.schema_definition import SchemaType
-from etl.utils.paths import TRANSFORMED_DATA_DIR, REJECTED_DATA_DIR, ensure_dir
-from etl.validation.validate_data import validate_data
-from etl.utils.helpers import parse_date, normalize_gender, normalize_region
+from pathlib import Path
+from typing import Callable, Iterator
+from config.settings import ETL_INGEST_ENGINE
+from etl.schema_definition import SchemaType, adjusters_schema, customers_schema, dates_schema, policies_schema
+from etl.utils.paths import TRANSFORMED_DATA_DIR, REJECTED_DATA_DIR
+from etl.utils.output_formats import open_writer, write_output
+from etl import metrics
+from etl.sources import RawSource
+from etl.utils.load import iter_raw_table, load_raw_table, raw_table_bytes
+from etl.validation.constraints import Constraint
+from etl.validation.referential import KeyIndexes
+from etl.validation.dedup import Deduplicator
+from etl.validation.key_index import KeyIndexBuilder
+from etl.validation.rejections import CODE_COLUMN, RejectionSink, RuleCodes
+from etl.validation.validate_data import evaluate_codes, scan_keys
+from etl.utils.helpers import normalize_dates, normalize_gender, normalize_region, string_mask
 
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    STRING_DTYPE = pd.StringDtype()
 
-def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+
+INGEST_ENGINES = ("pandas", "arrow")
+
+
+def _resolve_engine(engine: str | None) -> str:
+    engine = engine or ETL_INGEST_ENGINE
+    if engine not in INGEST_ENGINES:
+        raise ValueError(f"Unsupported ingest engine {engine!r}; expected one of {list(INGEST_ENGINES)}")
+    return engine
+
+
+def load_raw_data(table: str, schema: SchemaType, engine: str | None = None,
+                  directory: Path | None = None) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    Loads a raw table with the configured ingest engine.
+    Args:
+        table (str): Raw table name, e.g. 'claims'
+        schema (SchemaType): Table schema, used by the arrow engine for projection and types
+        engine (str, optional): 'pandas' or 'arrow', defaults to ETL_INGEST_ENGINE
+        directory (Path, optional): Raw data directory, defaults to data/raw/
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame | None]: Raw DataFrame, and the cells that failed to
+        parse (arrow engine only, None for pandas)
+    """
+    with metrics.stage("load") as counts:
+        if _resolve_engine(engine) == "arrow":
+            from etl.utils.arrow_ingest import read_raw_table_arrow
+
+            df, parse_errors = read_raw_table_arrow(table, schema, directory)
+        else:
+            df, parse_errors = load_raw_table(table, directory), None
+        counts.rows_out = len(df)
+        counts.bytes_read = raw_table_bytes(table, directory)
+    return df, parse_errors
+
+
+def iter_raw_data(table: str, schema: SchemaType, chunk_size: int,
+                  engine: str | None = None) -> Iterator[tuple[pd.DataFrame, pd.DataFrame | None]]:
+    """
+    Streams a raw table in chunks with the configured ingest engine (see load_raw_data).
+    """
+    if _resolve_engine(engine) == "arrow":
+        from etl.utils.arrow_ingest import iter_raw_table_arrow
+
+        yield from iter_raw_table_arrow(table, schema, chunk_size)
+        return
+    for chunk in iter_raw_table(table, chunk_size):
+        yield chunk, None
+
+
+@metrics.stage_function("clean")
+def clean_dataframe(df: pd.DataFrame, schema: SchemaType | None = None) -> pd.DataFrame:
     """
     Performs basic data cleaning operations such as:
     - Removing duplicate rows
     - Stripping whitespace from string fields
     Args:
         df (pd.DataFrame): Raw input DataFrame
+        schema (SchemaType, optional): Table schema; columns declared numeric keep their dtype
     Returns:
         pd.DataFrame: Cleaned DataFrame
     """
     df = df.drop_duplicates()
-    df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
+    df = strip_string_columns(df, schema)
     return df
 
+def strip_string_columns(df: pd.DataFrame, schema: SchemaType | None = None) -> pd.DataFrame:
+    """
+    Strips surrounding whitespace from string-typed columns with vectorized .str operations.
+    Columns holding only strings are converted to the (Arrow-backed when available) string dtype;
+    mixed object columns keep their non-string values untouched.
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        schema (SchemaType, optional): Table schema; object columns declared int or float only get
+            their string cells stripped (e.g. ' 1 ', which the type checks accept) and stay object
+    Returns:
+        pd.DataFrame: DataFrame with stripped string columns
+    """
+    numeric_columns = {column for column, expected_type in (schema or {}).items() if expected_type in (int, float)}
+    stripped = {}
+
+    for column in df.columns:
+        series = df[column]
+
+        if pd.api.types.is_object_dtype(series.dtype):
+            is_str = string_mask(series)
+            if not is_str.any():
+                continue
+            if column not in numeric_columns and is_str.sum() == series.notna().sum():
+                stripped[column] = series.astype(STRING_DTYPE).str.strip()
+            else:
+                stripped[column] = series.where(~is_str, series.str.strip())
+        elif pd.api.types.is_string_dtype(series.dtype):
+            stripped[column] = series.str.strip()
+
+    if not stripped:
+        return df
+    return df.assign(**stripped)
+
+def standardize_date_column(df: pd.DataFrame, column: str, table: str) -> pd.Series:
+    """
+    Normalizes a date column to 'YYYY-MM-DD' in one vectorized pass per format.
+    Values that match none of the supported formats are kept unchanged so that
+    validation rejects them.
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        column (str): Date column to normalize
+        table (str): Table name (used for logging)
+    Returns:
+        pd.Series: Normalized date column
+    """
+    normalized, unparsable = normalize_dates(df[column])
+    if unparsable.any():
+        logging.warning(f"{int(unparsable.sum())} unparsable values in {table}.{column}",
+                        extra={"rate_key": f"unparsable:{table}.{column}"})
+    return normalized
+
+@metrics.stage_function("clean")
 def clean_customers(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans the customers table with additional field-specific logic:
@@ -28,7 +150,7 @@ def clean_customers(df: pd.DataFrame) -> pd.DataFrame:
     - Format names and emails
     - Ensure risk score is numeric
     """
-    df = clean_dataframe(df)
+    df = clean_dataframe(df, customers_schema)
 
     # Standardize names and email
     df["email"] = df["email"].str.lower()
@@ -36,7 +158,7 @@ def clean_customers(df: pd.DataFrame) -> pd.DataFrame:
     df["last_name"] = df["last_name"].str.title()
 
     # Standardize date
-    df["birth_date"] = df["birth_date"].apply(parse_date)
+    df["birth_date"] = standardize_date_column(df, "birth_date", "customers")
 
     # Normalize gender
     gender_map = {
@@ -58,41 +180,210 @@ def clean_customers(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
-def split_valid_invalid(df: pd.DataFrame, schema: SchemaType, table: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+@metrics.stage_function("clean")
+def clean_policies(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans the policies table with additional field-specific logic:
+    - Standardize start and end dates to 'YYYY-MM-DD'
+    """
+    df = clean_dataframe(df, policies_schema)
+
+    for column in ["start_date", "end_date"]:
+        df[column] = standardize_date_column(df, column, "policies")
+
+    return df
+
+def restore_raw_values(df: pd.DataFrame, parse_errors: pd.DataFrame | None) -> pd.DataFrame:
+    """
+    Puts the raw strings of cells that failed to parse at ingest back into (rejected) rows,
+    so the rejected output shows what was actually in the source file.
+    """
+    if parse_errors is None or parse_errors.empty or df.empty:
+        return df
+    df = df.copy()
+    for column, errors in parse_errors.groupby("column", sort=False):
+        errors = errors[errors["row"].isin(df.index)]
+        if column in df.columns and not errors.empty:
+            df[column] = df[column].astype(object)
+            df.loc[errors["row"].to_numpy(), column] = errors["raw_value"].to_numpy()
+    return df
+
+@metrics.stage_function("clean")
+def clean_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans the dates table with additional field-specific logic:
+    - Normalize month to its full English name ('07' -> 'July', 'july' -> 'July')
+    """
+    df = clean_dataframe(df, dates_schema)
+
+    month_names = {name.lower(): name for name in calendar.month_name[1:]}
+    month_names.update({f"{number:02d}": name for number, name in enumerate(calendar.month_name) if number})
+    month_names.update({str(number): name for number, name in enumerate(calendar.month_name) if number})
+    month = df["month"].astype("string")
+    df["month"] = month.str.lower().map(month_names).fillna(month)
+
+    return df
+
+@metrics.stage_function("clean")
+def clean_adjusters(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans the adjusters table with additional field-specific logic:
+    - Normalize region capitalization
+    """
+    df = clean_dataframe(df, adjusters_schema)
+    df["region"] = df["region"].apply(normalize_region)
+    return df
+
+def split_valid_invalid(df: pd.DataFrame, schema: SchemaType, table: str,
+                        key_indexes: KeyIndexes | None = None,
+                        parse_errors: pd.DataFrame | None = None,
+                        rules: list[Constraint] | None = None,
+                        codes: RuleCodes | None = None,
+                        primary_key: str | None = None,
+                        deduplicator: Deduplicator | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Validates the dataframe and splits it into valid and invalid rows.
     Args:
         df (pd.DataFrame): Input DataFrame
         schema (SchemaType): Table schema
         table (str): Table name
+        key_indexes (KeyIndexes, optional): Dimension keys for foreign key checks
+        parse_errors (pd.DataFrame, optional): Cells that failed to parse at ingest (arrow engine)
+        rules (list[Constraint], optional): Domain rules of the table (etl.schema_definition.constraints)
+        codes (RuleCodes, optional): Rejection codes of the table, derived from schema, rules,
+            key_indexes and primary_key when not given
+        primary_key (str, optional): Primary key of the table; rows sharing a key are deduplicated
+            with the configured survivorship rule (ETL_SURVIVORSHIP)
+        deduplicator (Deduplicator, optional): Deduplicator carrying state across chunks, instead of
+            deduplicating df on its own
     Returns:
-        Tuple of valid and invalid DataFrames
+        Tuple of valid and invalid DataFrames; invalid rows carry a rejection_code column
+        (see etl.validation.rejections)
     """
-    is_valid = validate_data(df, schema, table).fillna(False)
-    return df[is_valid], df[~is_valid]
+    if deduplicator is None:
+        deduplicator = Deduplicator.for_table(primary_key, schema)
+    primary_key = deduplicator.key if deduplicator is not None else primary_key
+    codes = codes or RuleCodes.for_table(schema, rules, key_indexes, primary_key)
+    with metrics.stage("validate", len(df)) as counts:
+        is_valid, rejection_codes = evaluate_codes(df, schema, codes, key_indexes, parse_errors, rules,
+                                                   deduplicator)
+        valid_df, invalid_df = df[is_valid], restore_raw_values(df[~is_valid], parse_errors)
+        invalid_df[CODE_COLUMN] = rejection_codes
+        counts.rows_out = len(valid_df)
+        counts.rows_rejected = len(invalid_df)
+    return valid_df, invalid_df
 
 
-def save_transformed_data(df: pd.DataFrame, table: str) -> None:
+def save_transformed_data(df: pd.DataFrame, table: str, schema: SchemaType | None = None,
+                          fmt: str | None = None) -> None:
     """
-    Saves the valid (cleaned + validated) DataFrame to transformed/ as a CSV.
+    Saves the valid (cleaned + validated) DataFrame to transformed/, with the key index of
+    dimension tables (see etl.validation.key_index).
     Args:
         df (pd.DataFrame): Clean and validated DataFrame
         table (str): Table name (used for filename)
+        schema (SchemaType, optional): Table schema, used for column types in Parquet/Feather output
+        fmt (str, optional): Output format (csv, parquet, feather), defaults to ETL_OUTPUT_FORMAT
     """
-    ensure_dir(TRANSFORMED_DATA_DIR)
-    path = TRANSFORMED_DATA_DIR / f"{table}.csv"
-    df.to_csv(path, index=False)
+    with metrics.stage("save", len(df)) as counts:
+        path = write_output(df, TRANSFORMED_DATA_DIR, table, schema, fmt)
+        counts.rows_out = len(df)
+        counts.bytes_written = path.stat().st_size
+        key_index = KeyIndexBuilder.for_table(table)
+        if key_index is not None:
+            key_index.add(df)
+            key_index.write(path)
     logging.info(f"Saved {len(df)} rows to {path}")
 
 
-def save_rejected_data(df: pd.DataFrame, table: str) -> None:
+def save_rejected_data(df: pd.DataFrame, table: str, codes: RuleCodes, fmt: str | None = None) -> None:
     """
-    Saves the invalid DataFrame to rejected/ as a CSV.
+    Saves the invalid DataFrame to rejected/, with the lookup table of its rejection codes.
     Args:
-        df (pd.DataFrame): Invalid rows
+        df (pd.DataFrame): Invalid rows, with their rejection_code column
         table (str): Table name (used for filename)
+        codes (RuleCodes): Rejection codes of the table
+        fmt (str, optional): Output format (csv, parquet, feather), defaults to ETL_OUTPUT_FORMAT
+    """
+    with metrics.stage("save", len(df)) as counts:
+        with RejectionSink(table, codes, fmt, directory=REJECTED_DATA_DIR) as sink:
+            sink.write(df)
+        counts.rows_out = len(df)
+        counts.bytes_written = sink.path.stat().st_size if sink.rows else 0
+
+
+def transform_in_chunks(
+    table: str,
+    schema: SchemaType,
+    clean: Callable[[pd.DataFrame], pd.DataFrame],
+    chunk_size: int,
+    output_table: str | None = None,
+    key_indexes: KeyIndexes | None = None,
+    fmt: str | None = None,
+    engine: str | None = None,
+    rules: list[Constraint] | None = None,
+    source: RawSource | None = None,
+    primary_key: str | None = None,
+) -> tuple[int, int]:
     """
-    ensure_dir(REJECTED_DATA_DIR)
-    path = REJECTED_DATA_DIR / f"{table}.csv"
-    df.to_csv(path, index=False)
-    logging.warning(f"Rejected {len(df)} rows saved to {path}")
\ No newline at end of file
+    Streams a raw table through load -> clean -> validate -> append, one chunk at a time,
+    so memory use is bounded by the chunk size instead of the table size.
+    Identical rows are only dropped within a chunk, but rows sharing the primary key are
+    deduplicated across chunks (see etl.validation.dedup); the last and most_complete survivorship
+    rules first read, clean and validate the whole table once to pick the survivors.
+    Args:
+        table (str): Raw table name, e.g. 'claims'
+        schema (SchemaType): Table schema
+        clean (Callable): Cleaning function applied to each chunk
+        chunk_size (int): Number of rows per chunk
+        output_table (str, optional): Name of the output files, defaults to table
+        key_indexes (KeyIndexes, optional): Dimension keys for foreign key checks
+        fmt (str, optional): Output format, defaults to ETL_OUTPUT_FORMAT
+        engine (str, optional): Ingest engine, defaults to ETL_INGEST_ENGINE
+        rules (list[Constraint], optional): Domain rules of the table
+        source (RawSource, optional): Where raw batches come from (see etl.sources), defaults to the
+            CSVs in data/raw/ read with the given engine
+        primary_key (str, optional): Primary key of the table, deduplicated with ETL_SURVIVORSHIP
+    Returns:
+        tuple[int, int]: Number of valid and rejected rows written
+    """
+    def raw_chunks() -> Iterator[tuple[pd.DataFrame, pd.DataFrame | None]]:
+        if source is not None:
+            return source.iter_batches(table, schema, chunk_size)
+        return iter_raw_data(table, schema, chunk_size, engine)
+
+    output_table = output_table or table
+    deduplicator = Deduplicator.for_table(primary_key, schema)
+    if deduplicator is not None and deduplicator.needs_plan:
+        with metrics.stage("dedup"):
+            deduplicator.plan(scan_keys(clean(chunk), schema, deduplicator, key_indexes, parse_errors, rules)
+                              for chunk, parse_errors in raw_chunks())
+
+    chunks = raw_chunks()
+    if source is None:
+        metrics.count("load", bytes_read=raw_table_bytes(table))
+    chunks = metrics.iter_stage("load", chunks)
+    cleaned = ((clean(chunk), parse_errors) for chunk, parse_errors in chunks)
+    codes = RuleCodes.for_table(schema, rules, key_indexes, primary_key)
+    validated = (split_valid_invalid(chunk, schema, table, key_indexes, parse_errors, rules, codes,
+                                     deduplicator=deduplicator)
+                 for chunk, parse_errors in cleaned)
+
+    key_index = KeyIndexBuilder.for_table(output_table)
+    with open_writer(TRANSFORMED_DATA_DIR, output_table, schema, fmt) as valid_writer, \
+            RejectionSink(output_table, codes, fmt, directory=REJECTED_DATA_DIR) as sink:
+        for valid_df, invalid_df in validated:
+            with metrics.stage("save", len(valid_df) + len(invalid_df)) as counts:
+                valid_writer.write(valid_df)
+                sink.write(invalid_df)
+                if key_index is not None:
+                    key_index.add(valid_df)
+                counts.rows_out = counts.rows_in
+    if key_index is not None and valid_writer.path.exists():
+        key_index.write(valid_writer.path)
+
+    valid_rows = valid_writer.rows
+    written = [valid_writer.path] + ([sink.path] if sink.rows else [])
+    metrics.count("save", bytes_written=sum(path.stat().st_size for path in written if path.exists()))
+    logging.info(f"Saved {valid_rows} rows to {valid_writer.path}")
+    return valid_rows, sink.rows
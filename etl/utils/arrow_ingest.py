@@ -0,0 +1,154 @@
+"""
+Schema-driven CSV ingest on the multithreaded pyarrow CSV reader.
+
+Only the columns declared in the table schema are read (unknown columns such as 'notes' are
+projected away by the reader), every cell is read as a string, and each column is then cast to
+its schema type in one vectorized pass:
+- int/float cells that do not parse become nulls, and their raw strings are kept in a
+  side-channel DataFrame (row, column, raw_value) so validation can reject and report them
+- date and str columns stay strings; dates are normalized later by the cleaning stage
+
+The result is an Arrow-backed DataFrame (pd.ArrowDtype columns).
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from etl.schema_definition import SchemaType
+from etl.utils.load import raw_table_paths
+
+# RE2 patterns (applied to whitespace-trimmed cells) for values Arrow can cast to int64 / float64
+ARROW_INT_PATTERN = r"^[+-]?[0-9]+$"
+ARROW_FLOAT_PATTERN = r"^[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?$|^(?i)[+-]?(nan|inf|infinity)$"
+
+PARSE_ERROR_COLUMNS = ["row", "column", "raw_value"]
+
+
+def _convert_options(schema: SchemaType):
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    return pv.ConvertOptions(
+        include_columns=list(schema),
+        include_missing_columns=True,
+        column_types={column: pa.string() for column in schema},
+        strings_can_be_null=True,
+    )
+
+
+def cast_to_schema(table, schema: SchemaType, offset: int = 0):
+    """
+    Casts the string columns of an Arrow table to the schema's numeric types.
+    Args:
+        table (pa.Table): Table of string columns, as read from CSV
+        schema (SchemaType): Table schema
+        offset (int): Row number of the table's first row, used in the side-channel
+    Returns:
+        tuple[pa.Table, pd.DataFrame]: Typed table, and raw strings of cells that failed to parse
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    targets = {int: (pa.int64(), ARROW_INT_PATTERN), float: (pa.float64(), ARROW_FLOAT_PATTERN)}
+    errors = []
+    columns = {}
+
+    for column, expected_type in schema.items():
+        values = table.column(column)
+        if expected_type not in targets:
+            columns[column] = values
+            continue
+
+        arrow_type, pattern = targets[expected_type]
+        trimmed = pc.utf8_trim_whitespace(values)
+        parsable = pc.match_substring_regex(trimmed, pattern)
+        columns[column] = pc.cast(pc.if_else(parsable, trimmed, pa.scalar(None, pa.string())), arrow_type)
+
+        bad = pc.and_(pc.is_valid(values), pc.invert(pc.fill_null(parsable, False)))
+        bad_rows = pc.indices_nonzero(bad).to_numpy()
+        if len(bad_rows):
+            errors.append(pd.DataFrame({
+                "row": bad_rows + offset,
+                "column": column,
+                "raw_value": pc.take(values, pa.array(bad_rows)).to_pylist(),
+            }))
+
+    parse_errors = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=PARSE_ERROR_COLUMNS)
+    return pa.table(columns), parse_errors
+
+
+def arrow_to_pandas(table, offset: int) -> pd.DataFrame:
+    """
+    Converts an Arrow table to an Arrow-backed DataFrame whose index starts at offset.
+    """
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    df.index = pd.RangeIndex(offset, offset + len(df))
+    return df
+
+
+def read_raw_table_arrow(table: str, schema: SchemaType,
+                         directory: Path | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Loads and combines the clean and messy CSVs of a table with the pyarrow CSV reader.
+    Args:
+        table (str): Table name without suffix, e.g. 'customers', 'claims'
+        schema (SchemaType): Table schema (columns to read and their types)
+        directory (Path, optional): Raw data directory, defaults to data/raw/
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Arrow-backed DataFrame projected to the schema columns,
+        and the side-channel of unparsable cells (row, column, raw_value)
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    read_options = pv.ReadOptions(use_threads=True)
+    raw = pa.concat_tables([
+        pv.read_csv(path, read_options=read_options, convert_options=_convert_options(schema))
+        for path in raw_table_paths(table, directory)
+    ])
+    typed, parse_errors = cast_to_schema(raw, schema)
+    logging.info(f"Loaded {typed.num_rows} rows from table {table} ({len(parse_errors)} unparsable cells)")
+    return arrow_to_pandas(typed, 0), parse_errors
+
+
+def iter_raw_table_arrow(table: str, schema: SchemaType,
+                         chunk_size: int) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Streams the clean and then the messy CSV of a table in chunks of chunk_size rows,
+    re-slicing the reader's record batches so chunks match the pandas path.
+    Args:
+        table (str): Table name without suffix
+        schema (SchemaType): Table schema (columns to read and their types)
+        chunk_size (int): Rows per chunk
+    Yields:
+        tuple[pd.DataFrame, pd.DataFrame]: Arrow-backed chunk, and its unparsable cells
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    read_options = pv.ReadOptions(use_threads=True)
+    buffered, buffered_rows, offset = [], 0, 0
+
+    def flush(rows: int):
+        nonlocal buffered, buffered_rows, offset
+        combined = pa.Table.from_batches(buffered)
+        rest = combined.slice(rows)
+        buffered, buffered_rows = rest.to_batches(), rest.num_rows
+        typed, parse_errors = cast_to_schema(combined.slice(0, rows), schema, offset)
+        chunk = arrow_to_pandas(typed, offset)
+        offset += rows
+        return chunk, parse_errors
+
+    for path in raw_table_paths(table):
+        with pv.open_csv(path, read_options=read_options, convert_options=_convert_options(schema)) as reader:
+            for batch in reader:
+                buffered.append(batch)
+                buffered_rows += batch.num_rows
+                while buffered_rows >= chunk_size:
+                    yield flush(chunk_size)
+    if buffered_rows:
+        yield flush(buffered_rows)
+    logging.info(f"Streamed {offset} rows from table {table}")
@@ -1,4 +1,23 @@
-from datetime import datetime
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+# Supported input date formats, in priority order (ambiguous dates resolve to the earlier format)
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y", "%d/%m/%Y"]
+
+# Rough shape of each format, used to route values to the formats that could apply
+DATE_FORMAT_PATTERNS = {
+    "%Y-%m-%d": r"\d{4}-\d{1,2}-\d{1,2}",
+    "%m/%d/%Y": r"\d{1,2}/\d{1,2}/\d{4}",
+    "%d-%m-%Y": r"\d{1,2}-\d{1,2}-\d{4}",
+    "%d/%m/%Y": r"\d{1,2}/\d{1,2}/\d{4}",
+}
 
 def is_valid_type(value: any, expected_type: type) -> tuple[bool, str | None]:
     """
@@ -9,6 +28,13 @@ def is_valid_type(value: any, expected_type: type) -> tuple[bool, str | None]:
     Returns:
         bool: True if the value matches the expected type or is a valid coercion, False otherwise.
     """
+    if expected_type is date:
+        try:
+            datetime.strptime(value, ISO_DATE_FORMAT)
+            return True, None
+        except (ValueError, TypeError):
+            return False, "Invalid date: expected YYYY-MM-DD"
+
     try:
         expected_type(value)
         if expected_type == int and not float(value).is_integer():
@@ -29,9 +55,8 @@ def parse_date(value: str) -> str:
         return value
 
     value = value.strip()
-    date_formats = ["%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y", "%d/%m/%Y"]
 
-    for fmt in date_formats:
+    for fmt in DATE_FORMATS:
         try:
             parsed = datetime.strptime(value, fmt)
             return parsed.strftime("%Y-%m-%d")
@@ -40,6 +65,62 @@ def parse_date(value: str) -> str:
 
     return value  # Return original if no format matched
 
+def string_mask(series: pd.Series) -> pd.Series:
+    """
+    Flags which values of a column are Python strings, without a Python call per value.
+    Args:
+        series (pd.Series): Column to inspect
+    Returns:
+        pd.Series: True where the value is a string
+    """
+    import pandas as pd
+
+    if pd.api.types.is_string_dtype(series.dtype) and not pd.api.types.is_object_dtype(series.dtype):
+        return series.notna()
+    try:
+        # .str accessors return NaN for non-string elements of mixed object columns
+        return series.str.len().notna()
+    except AttributeError:
+        return pd.Series(False, index=series.index)
+
+def infer_date_formats(values: pd.Series) -> list[str]:
+    """
+    Infers which of the supported date formats occur in a column.
+    Args:
+        values (pd.Series): Stripped date strings
+    Returns:
+        list[str]: Formats from DATE_FORMATS whose shape matches at least one value, in priority order
+    """
+    return [fmt for fmt in DATE_FORMATS if values.str.fullmatch(DATE_FORMAT_PATTERNS[fmt]).any()]
+
+def normalize_dates(series: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Vectorized version of parse_date for a whole column.
+    Each inferred format is parsed in a single pass over the values that are still unparsed
+    and have that format's shape.
+    Args:
+        series (pd.Series): Raw date column
+    Returns:
+        tuple[pd.Series, pd.Series]: Dates standardized to 'YYYY-MM-DD' (unparsable values are kept
+        as-is), and a boolean mask flagging the non-missing values that could not be parsed
+    """
+    import pandas as pd
+
+    is_str = string_mask(series)
+    values = series[is_str].astype(str).str.strip()
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[us]")
+    for fmt in infer_date_formats(values):
+        pending = parsed.isna() & values.str.fullmatch(DATE_FORMAT_PATTERNS[fmt])
+        if pending.any():
+            parsed[pending] = pd.to_datetime(values[pending], format=fmt, errors="coerce")
+
+    normalized = series.astype(object)
+    normalized[is_str] = values.where(parsed.isna(), parsed.dt.strftime(ISO_DATE_FORMAT))
+    unparsable = series.notna() & ~is_str
+    unparsable[is_str] = parsed.isna()
+    return normalized, unparsable
+
 def normalize_gender(value: str) -> str:
     """
     Standardizes gender values to 'M', 'F', or 'Other'.
@@ -1,40 +1,95 @@
-import pandas as pd
+from __future__ import annotations
+
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 import logging
 from etl.utils.paths import RAW_DATA_DIR
 
-def load_raw_table(table:str) -> pd.DataFrame:
+if TYPE_CHECKING:
+    import pandas as pd
+
+def load_raw_table(table:str, directory: Path | None = None) -> pd.DataFrame:
     """
     Loads and combines clean and messy versions of a table from data/raw/.
     Args:
         table (str): Table name without suffix, e.g. 'customers', 'claims'
+        directory (Path, optional): Raw data directory, defaults to data/raw/
     Returns:
         pd.DataFrame: Combined DataFrame from clean and messy CSVs.
     """
-
-    clean_path = RAW_DATA_DIR / f"{table}_clean.csv"
-    print(f"Loading clean table: {clean_path}")
-    messy_path = RAW_DATA_DIR / f"{table}_messy.csv"
-    print(f"Loading messy: {messy_path}")
+    import pandas as pd
 
     dfs = []
-    print("clean_path type:", type(clean_path))
-    print("clean_path resolved:", clean_path.resolve())
-    print("clean_path exists:", clean_path.exists())
-    if clean_path.exists():
-        dfs.append(pd.read_csv(clean_path))
-    print("messy_path type:", type(messy_path))
-    print("messy_path resolved:", messy_path.resolve())
-    print("messy_path exists:", messy_path.exists())
-    if messy_path.exists():
-        print("Messy path exists")
-        dfs.append(pd.read_csv(messy_path))
-
-    if not dfs:
-        raise FileNotFoundError(f"No data found for {table} in {RAW_DATA_DIR}")
+    for path in raw_table_paths(table, directory):
+        logging.debug(f"Loading {path}")
+        dfs.append(pd.read_csv(path))
 
     combined = pd.concat(dfs, ignore_index=True)
     logging.info(f"Loaded {len(combined)} rows from table {table}")
     return combined
 
-load_raw_table("customers")
\ No newline at end of file
+def raw_table_paths(table: str, directory: Path | None = None) -> list[Path]:
+    """
+    Lists the existing clean and messy CSVs of a table in data/raw/, in load order.
+    Args:
+        table (str): Table name without suffix, e.g. 'customers', 'claims'
+        directory (Path, optional): Raw data directory, defaults to data/raw/
+    Returns:
+        list[Path]: Paths of the clean and/or messy CSVs
+    """
+    directory = directory or RAW_DATA_DIR
+    paths = [directory / f"{table}_{variant}.csv" for variant in ("clean", "messy")]
+    paths = [path for path in paths if path.exists()]
+    if not paths:
+        raise FileNotFoundError(f"No data found for {table} in {directory}")
+    return paths
+
+
+def raw_table_bytes(table: str, directory: Path | None = None) -> int:
+    """
+    Returns the total size in bytes of the clean and messy CSVs of a table.
+    """
+    return sum(path.stat().st_size for path in raw_table_paths(table, directory))
+
+
+def raw_table_columns(table: str) -> list[str]:
+    """
+    Returns the union of the clean and messy CSV headers, in the order pd.concat would produce.
+    Args:
+        table (str): Table name without suffix
+    Returns:
+        list[str]: Column names
+    """
+    import pandas as pd
+
+    columns = []
+    for path in raw_table_paths(table):
+        for column in pd.read_csv(path, nrows=0).columns:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def iter_raw_table(table: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Streams the clean and then the messy CSV of a table in fixed-size chunks.
+    Every chunk is aligned to the same columns (see raw_table_columns) so chunks can be
+    appended to one output file, and the index keeps counting across chunks.
+    Args:
+        table (str): Table name without suffix
+        chunk_size (int): Number of rows per chunk
+    Yields:
+        pd.DataFrame: Next chunk of raw rows
+    """
+    import pandas as pd
+
+    columns = raw_table_columns(table)
+    offset = 0
+    for path in raw_table_paths(table):
+        with pd.read_csv(path, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                chunk = chunk.reindex(columns=columns)
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+                yield chunk
+    logging.info(f"Streamed {offset} rows from table {table}")
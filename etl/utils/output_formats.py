@@ -0,0 +1,426 @@
+"""
+Pluggable output formats for transformed and rejected tables.
+
+- csv: plain text, the historical default
+- parquet: compressed columnar files with configurable row groups, the fast path for downstream loads
+- feather: Arrow IPC files, for zero-copy reads from Arrow-aware tools
+
+Valid rows are written with column types derived from etl/schema_definition.py (int -> int64,
+float -> float64, str -> string, date -> date32). Rejected rows hold values that failed those
+types, so they are written as strings. Columns outside the schema are written as strings.
+
+CSV outputs can be gzip-compressed (compression="gzip", written as <table>.csv.gz); the Arrow
+formats are always compressed (Parquet with ETL_PARQUET_COMPRESSION, Feather with lz4).
+"""
+
+from __future__ import annotations
+
+import gzip
+import shutil
+from abc import ABC, abstractmethod
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from config.settings import ETL_OUTPUT_FORMAT, ETL_PARQUET_COMPRESSION, ETL_PARQUET_ROW_GROUP_SIZE
+from etl.schema_definition import SchemaType
+from etl.utils.helpers import ISO_DATE_FORMAT
+from etl.utils.paths import ensure_dir
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FORMAT_SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# CSV compression -> suffix added after .csv
+CSV_COMPRESSIONS = {"gzip": ".gz"}
+
+
+def resolve_format(fmt: str | None = None) -> str:
+    """
+    Returns the requested output format, or the configured default (ETL_OUTPUT_FORMAT).
+    """
+    fmt = fmt or ETL_OUTPUT_FORMAT
+    if fmt not in FORMAT_SUFFIXES:
+        raise ValueError(f"Unsupported output format {fmt!r}; expected one of {sorted(FORMAT_SUFFIXES)}")
+    return fmt
+
+
+def output_path(directory: Path, table: str, fmt: str | None = None, compression: str | None = None) -> Path:
+    """
+    Builds the path of a table's output file in the given format (and CSV compression).
+    """
+    fmt = resolve_format(fmt)
+    suffix = FORMAT_SUFFIXES[fmt]
+    if compression and fmt == "csv":
+        if compression not in CSV_COMPRESSIONS:
+            raise ValueError(f"Unsupported CSV compression {compression!r}; expected one of {sorted(CSV_COMPRESSIONS)}")
+        suffix += CSV_COMPRESSIONS[compression]
+    return directory / f"{table}{suffix}"
+
+
+def output_variants(directory: Path, table: str) -> list[Path]:
+    """
+    Lists every path a table's output can have, one per format and CSV compression.
+    """
+    return [output_path(directory, table, fmt) for fmt in FORMAT_SUFFIXES] + \
+        [output_path(directory, table, "csv", compression) for compression in CSV_COMPRESSIONS]
+
+
+def is_csv(path: Path) -> bool:
+    """
+    Whether an output file is a CSV, compressed or not.
+    """
+    return path.suffix == FORMAT_SUFFIXES["csv"] or (
+        path.suffix in CSV_COMPRESSIONS.values() and path.with_suffix("").suffix == FORMAT_SUFFIXES["csv"])
+
+
+def find_output(directory: Path, table: str, fmt: str | None = None) -> Path:
+    """
+    Finds a table's output file, preferring the requested/configured format over the others.
+    Args:
+        directory (Path): Output directory
+        table (str): Output table name
+        fmt (str, optional): Preferred format
+    Returns:
+        Path: Existing output file
+    """
+    preferred = resolve_format(fmt)
+    for candidate in [preferred] + [other for other in FORMAT_SUFFIXES if other != preferred]:
+        path = output_path(directory, table, candidate)
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"No output found for {table} in {directory}")
+
+
+def arrow_schema(columns: list[str], schema: SchemaType | None):
+    """
+    Derives the Arrow schema of an output file from the table schema.
+    Args:
+        columns (list[str]): Columns of the output, in order
+        schema (SchemaType, optional): Table schema; when None every column is a string
+    Returns:
+        pa.Schema: Arrow schema
+    """
+    import pyarrow as pa
+
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string(), date: pa.date32()}
+    return pa.schema([(column, arrow_types[(schema or {}).get(column, str)]) for column in columns])
+
+
+def _numbers(series: pd.Series) -> pd.Series:
+    """
+    Converts a column to numbers, including the numeric strings the type checks accept but
+    pd.to_numeric does not parse ('1_000', 'nan', ' +5 '); anything else becomes NaN.
+    """
+    import pandas as pd
+
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        series = series.astype("string").str.strip().str.replace("_", "", regex=False)
+    return pd.to_numeric(series, errors="coerce")
+
+
+def conform_to_schema(df: pd.DataFrame, schema: SchemaType | None) -> pd.DataFrame:
+    """
+    Casts a DataFrame to the pandas dtypes matching its Arrow schema, column by column.
+    Values that do not convert (e.g. a 'nan' in an int column) are written as missing.
+    """
+    import numpy as np
+    import pandas as pd
+
+    conformed = {}
+    for column in df.columns:
+        expected_type = (schema or {}).get(column, str)
+        series = df[column]
+        if expected_type is int:
+            numbers = _numbers(series)
+            if not pd.api.types.is_integer_dtype(numbers.dtype):
+                numbers = numbers.where(np.isfinite(numbers) & (np.floor(numbers) == numbers))
+            conformed[column] = numbers.astype("Int64")
+        elif expected_type is float:
+            conformed[column] = _numbers(series).astype("float64")
+        elif expected_type is date:
+            conformed[column] = pd.to_datetime(series, format=ISO_DATE_FORMAT).dt.date
+        else:
+            conformed[column] = series.astype("string")
+    return pd.DataFrame(conformed, index=df.index)
+
+
+class TableWriter(ABC):
+    """
+    Writes a table as a sequence of DataFrame chunks to a single output file.
+    Use as a context manager; the file is complete once the writer is closed.
+    """
+
+    fmt = ""
+
+    def __init__(self, path: Path, schema: SchemaType | None = None):
+        ensure_dir(path.parent)
+        self.path = path
+        self.schema = schema
+        self.rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        self._write(df)
+        self.rows += len(df)
+
+    @abstractmethod
+    def _write(self, df: pd.DataFrame) -> None:
+        """
+        Writes one chunk to the output file.
+        """
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class CsvTableWriter(TableWriter):
+    """
+    Appends chunks to a CSV file, writing the header once. With compression="gzip" every chunk is
+    appended as a gzip member, which gzip readers decompress as one stream.
+    """
+
+    fmt = "csv"
+
+    def __init__(self, path: Path, schema: SchemaType | None = None, compression: str | None = None):
+        super().__init__(path, schema)
+        self.compression = compression
+
+    def _open(self, mode: str):
+        if self.compression:
+            return gzip.open(self.path, mode, compresslevel=6)
+        return open(self.path, mode)
+
+    def _write(self, df: pd.DataFrame) -> None:
+        first = self.rows == 0
+        if not self.compression:
+            df.to_csv(self.path, index=False, mode="w" if first else "a", header=first)
+            return
+        with self._open("wt" if first else "at") as f:
+            df.to_csv(f, index=False, header=first)
+
+    def write_arrow(self, table) -> None:
+        """
+        Appends an Arrow table with the pyarrow CSV writer, several times faster than DataFrame.to_csv.
+        Values are only quoted if some value in the table needs it.
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pv
+
+        buffer = pa.BufferOutputStream()
+        try:
+            pv.write_csv(table, buffer, pv.WriteOptions(include_header=False, quoting_style="none"))
+        except pa.ArrowInvalid:
+            buffer = pa.BufferOutputStream()
+            pv.write_csv(table, buffer, pv.WriteOptions(include_header=False))
+
+        first = self.rows == 0
+        with self._open("wb" if first else "ab") as f:
+            if first:
+                f.write((",".join(table.column_names) + "\n").encode())
+            f.write(buffer.getvalue())
+        self.rows += table.num_rows
+
+
+class ArrowTableWriter(TableWriter):
+    """
+    Base for Arrow-backed formats: converts each chunk to a table with the schema-derived types.
+    """
+
+    def __init__(self, path: Path, schema: SchemaType | None = None):
+        super().__init__(path, schema)
+        self._writer = None
+
+    def _to_arrow(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(
+            conform_to_schema(df, self.schema),
+            schema=arrow_schema(list(df.columns), self.schema),
+            preserve_index=False,
+        )
+
+    @abstractmethod
+    def _open(self, arrow_schema):
+        """
+        Opens the Arrow writer of the output file, on the first chunk.
+        """
+
+    def _write_table(self, table) -> None:
+        self._writer.write_table(table)
+
+    def write_arrow(self, table) -> None:
+        """
+        Writes an Arrow table that already has the output's column types.
+        """
+        if self._writer is None:
+            self._writer = self._open(table.schema)
+        self._write_table(table)
+        self.rows += table.num_rows
+
+    def _write(self, df: pd.DataFrame) -> None:
+        table = self._to_arrow(df)
+        if self._writer is None:
+            self._writer = self._open(table.schema)
+        self._write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ParquetTableWriter(ArrowTableWriter):
+    """
+    Writes a Parquet file with the configured compression and row group size.
+    """
+
+    fmt = "parquet"
+
+    def __init__(self, path: Path, schema: SchemaType | None = None,
+                 compression: str = ETL_PARQUET_COMPRESSION, row_group_size: int = ETL_PARQUET_ROW_GROUP_SIZE):
+        super().__init__(path, schema)
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    def _open(self, arrow_schema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.path, arrow_schema, compression=self.compression)
+
+    def _write_table(self, table) -> None:
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+
+class FeatherTableWriter(ArrowTableWriter):
+    """
+    Writes an Arrow IPC (Feather v2) file, one record batch per chunk.
+    """
+
+    fmt = "feather"
+
+    def _open(self, arrow_schema):
+        import pyarrow as pa
+
+        return pa.ipc.new_file(str(self.path), arrow_schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+
+
+WRITERS: dict[str, type[TableWriter]] = {
+    "csv": CsvTableWriter,
+    "parquet": ParquetTableWriter,
+    "feather": FeatherTableWriter,
+}
+
+
+def open_writer(directory: Path, table: str, schema: SchemaType | None = None, fmt: str | None = None,
+                compression: str | None = None) -> TableWriter:
+    """
+    Opens a writer for a table's output file.
+    Args:
+        directory (Path): Output directory
+        table (str): Output table name
+        schema (SchemaType, optional): Table schema for typed formats; None writes strings
+        fmt (str, optional): Output format, defaults to ETL_OUTPUT_FORMAT
+        compression (str, optional): CSV compression (gzip); ignored by the Arrow formats
+    Returns:
+        TableWriter: Writer for the table
+    """
+    fmt = resolve_format(fmt)
+    path = output_path(directory, table, fmt, compression)
+    if fmt == "csv":
+        return CsvTableWriter(path, schema, compression)
+    return WRITERS[fmt](path, schema)
+
+
+def write_output(df: pd.DataFrame, directory: Path, table: str, schema: SchemaType | None = None,
+                 fmt: str | None = None) -> Path:
+    """
+    Writes a whole DataFrame as a table's output file.
+    Returns:
+        Path: Written file
+    """
+    with open_writer(directory, table, schema, fmt) as writer:
+        writer.write(df)
+    return writer.path
+
+
+def concat_outputs(parts: list[Path], path: Path) -> None:
+    """
+    Concatenates output files of the same format and columns into one file, in order,
+    without converting the rows back to pandas.
+    Args:
+        parts (list[Path]): Part files, all in the format given by path's suffix
+        path (Path): Combined output file
+    """
+    ensure_dir(path.parent)
+    if is_csv(path):
+        # Parts are plain CSVs; the combined file is compressed when its name says so
+        opener = gzip.open if path.suffix in CSV_COMPRESSIONS.values() else open
+        with opener(path, "wt", newline="") as out:
+            for i, part in enumerate(parts):
+                with open(part, newline="") as f:
+                    header = f.readline()
+                    if i == 0:
+                        out.write(header)
+                    shutil.copyfileobj(f, out)
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with WRITERS[resolve_format(path.suffix.lstrip("."))](path) as writer:
+        for part in parts:
+            if path.suffix == FORMAT_SUFFIXES["parquet"]:
+                writer.write_arrow(pq.read_table(part))
+            else:
+                with pa.memory_map(str(part)) as source:
+                    writer.write_arrow(pa.ipc.open_file(source).read_all())
+
+
+def iter_output(path: Path, columns: list[str] | None = None, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Streams an output file of any supported format in chunks.
+    Args:
+        path (Path): Output file
+        columns (list[str], optional): Columns to read
+        chunk_size (int): Rows per chunk
+    Yields:
+        pd.DataFrame: Next chunk
+    """
+    import pandas as pd
+
+    if is_csv(path):
+        with pd.read_csv(path, usecols=columns, chunksize=chunk_size) as reader:
+            yield from reader
+    elif path.suffix == FORMAT_SUFFIXES["parquet"]:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        import pyarrow as pa
+
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                yield (batch.select(columns) if columns else batch).to_pandas()
+
+
+def read_output(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Reads a whole output file of any supported format.
+    """
+    import pandas as pd
+
+    if is_csv(path):
+        return pd.read_csv(path, usecols=columns)
+    if path.suffix == FORMAT_SUFFIXES["parquet"]:
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
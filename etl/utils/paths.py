@@ -4,7 +4,9 @@ BASE_DIR = Path(__file__).resolve().parents[2] / "data"
 
 RAW_DATA_DIR = BASE_DIR / "raw"
 PROCESSED_DATA_DIR = BASE_DIR / "processed"
+TRANSFORMED_DATA_DIR = BASE_DIR / "transformed"
 REJECTED_DATA_DIR = BASE_DIR / "rejected"
+MARTS_DATA_DIR = BASE_DIR / "marts"
 
 def ensure_dir(path: str | Path) -> Path:
     """
@@ -0,0 +1,279 @@
+"""
+Declarative domain rules on top of the type checks in etl.validation.type_checks.
+
+Rules are small frozen dataclasses declared per table in etl/schema_definition.py:
+- NotNull: value present and not blank
+- OneOf: value in an allowed set
+- Range: numeric value within [min, max]
+- Pattern: string fully matches a regular expression
+- Compare: cross-column predicate such as end_date >= start_date
+
+Each rule compiles to a vectorized boolean failure mask. Columns are converted (to numbers, strings
+or dates) once per check run and shared by every rule on that column. Missing values only fail
+NotNull, and values that fail their type check (e.g. 'discount' in a float column) are left to
+the type check rather than reported twice.
+
+Rules are declared when etl.schema_definition is imported, so NumPy and pandas are only
+imported once rules are evaluated.
+"""
+
+from __future__ import annotations
+
+import operator
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING
+
+from etl.utils.helpers import ISO_DATE_FORMAT, string_mask
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+COMPARISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class ColumnViews:
+    """
+    Lazily converted views of a DataFrame's columns, computed once and shared between rules.
+    """
+
+    def __init__(self, df: pd.DataFrame, schema: dict[str, type] | None = None):
+        self.df = df
+        self.schema = schema or {}
+        self._cache: dict[tuple[str, str], object] = {}
+
+    def _cached(self, column: str, kind: str, convert):
+        key = (column, kind)
+        if key not in self._cache:
+            self._cache[key] = convert()
+        return self._cache[key]
+
+    def raw(self, column: str) -> pd.Series:
+        import pandas as pd
+
+        if column not in self.df.columns:
+            return pd.Series(None, index=self.df.index, dtype=object)
+        return self.df[column]
+
+    def text(self, column: str) -> pd.Series:
+        """
+        Column as a nullable string Series (string columns are used as they are).
+        """
+        import pandas as pd
+
+        def convert():
+            series = self.raw(column)
+            if pd.api.types.is_string_dtype(series.dtype) and not pd.api.types.is_object_dtype(series.dtype):
+                return series
+            return series.astype("string")
+        return self._cached(column, "text", convert)
+
+    def missing(self, column: str) -> np.ndarray:
+        """
+        Mask of missing values; blank strings count as missing.
+        """
+        import pandas as pd
+
+        def convert():
+            series = self.raw(column)
+            missing = series.isna().to_numpy(dtype=bool, copy=True)
+            if pd.api.types.is_string_dtype(series.dtype) or pd.api.types.is_object_dtype(series.dtype):
+                is_str = string_mask(series).to_numpy(dtype=bool)
+                if is_str.any():
+                    missing[is_str] = (series[is_str].astype("string").str.strip() == "").to_numpy(dtype=bool)
+            return missing
+        return self._cached(column, "missing", convert)
+
+    def numeric(self, column: str) -> np.ndarray:
+        """
+        Column as float64, NaN where missing or not numeric.
+        """
+        import numpy as np
+        import pandas as pd
+
+        return self._cached(column, "numeric", lambda: pd.to_numeric(self.raw(column), errors="coerce")
+                            .to_numpy(dtype="float64", na_value=np.nan))
+
+    def dates(self, column: str) -> np.ndarray:
+        """
+        Column as datetime64, NaT where missing or not a 'YYYY-MM-DD' string.
+        """
+        import pandas as pd
+
+        return self._cached(column, "dates", lambda: pd.to_datetime(
+            self.text(column), format=ISO_DATE_FORMAT, errors="coerce").to_numpy())
+
+    def comparable(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Column as values that can be compared with operators, and a mask of usable values.
+        """
+        import numpy as np
+
+        if self.schema.get(column) is date:
+            values = self.dates(column)
+            return values, ~np.isnat(values)
+        values = self.numeric(column)
+        return values, ~np.isnan(values)
+
+
+@dataclass(frozen=True)
+class NotNull:
+    column: str
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    @property
+    def reason(self) -> str:
+        return f"Missing value in '{self.column}'"
+
+    def failures(self, views: ColumnViews) -> np.ndarray:
+        return views.missing(self.column)
+
+
+@dataclass(frozen=True)
+class OneOf:
+    column: str
+    values: tuple[str, ...]
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    @property
+    def reason(self) -> str:
+        return f"Invalid value in '{self.column}': expected one of {', '.join(self.values)}"
+
+    def failures(self, views: ColumnViews) -> np.ndarray:
+        series = views.raw(self.column)
+        return (series.notna() & ~series.isin(self.values)).to_numpy(dtype=bool, na_value=False)
+
+
+@dataclass(frozen=True)
+class Range:
+    column: str
+    min: float | None = None
+    max: float | None = None
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    @property
+    def reason(self) -> str:
+        if self.min is not None and self.max is not None:
+            bounds = f"between {self.min} and {self.max}"
+        elif self.min is not None:
+            bounds = f">= {self.min}"
+        else:
+            bounds = f"<= {self.max}"
+        return f"Out of range value in '{self.column}': expected {bounds}"
+
+    def failures(self, views: ColumnViews) -> np.ndarray:
+        import numpy as np
+
+        values = views.numeric(self.column)
+        failed = np.zeros(len(values), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            if self.min is not None:
+                failed |= values < self.min
+            if self.max is not None:
+                failed |= values > self.max
+        return failed
+
+
+@dataclass(frozen=True)
+class Pattern:
+    column: str
+    regex: str
+    description: str
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    @property
+    def reason(self) -> str:
+        return f"Invalid format in '{self.column}': expected {self.description}"
+
+    def failures(self, views: ColumnViews) -> np.ndarray:
+        matches = views.text(self.column).str.fullmatch(self.regex).to_numpy(dtype=bool, na_value=True)
+        return ~views.missing(self.column) & ~matches
+
+
+@dataclass(frozen=True)
+class Compare:
+    left: str
+    op: str
+    right: str
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.left, self.right)
+
+    @property
+    def reason(self) -> str:
+        return f"Constraint violation in '{self.left}': expected {self.left} {self.op} {self.right}"
+
+    def failures(self, views: ColumnViews) -> np.ndarray:
+        import numpy as np
+
+        left, left_ok = views.comparable(self.left)
+        right, right_ok = views.comparable(self.right)
+        checkable = left_ok & right_ok
+        failed = np.zeros(len(left), dtype=bool)
+        failed[checkable] = ~COMPARISONS[self.op](left[checkable], right[checkable])
+        return failed
+
+
+Constraint = NotNull | OneOf | Range | Pattern | Compare
+
+
+def compile_constraints(rules: list[Constraint]) -> list[Constraint]:
+    """
+    Checks a list of rules up front, so that mistakes in a rule fail before any data is read.
+    Args:
+        rules (list[Constraint]): Table rules
+    Returns:
+        list[Constraint]: The rules, in declaration order
+    """
+    for rule in rules:
+        if isinstance(rule, Compare) and rule.op not in COMPARISONS:
+            raise ValueError(f"Unsupported comparison {rule.op!r}; expected one of {list(COMPARISONS)}")
+        if isinstance(rule, Pattern):
+            re.compile(rule.regex)
+        if isinstance(rule, Range) and rule.min is None and rule.max is None:
+            raise ValueError(f"Range on '{rule.column}' needs a min or a max")
+    return list(rules)
+
+
+def check_constraints(df: pd.DataFrame, rules: list[Constraint],
+                      schema: dict[str, type] | None = None) -> dict[str, pd.Series]:
+    """
+    Evaluates every rule against a DataFrame.
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        rules (list[Constraint]): Table rules
+        schema (dict[str, type], optional): Table schema, used to compare date columns as dates
+    Returns:
+        dict[str, pd.Series]: Rejection reason -> boolean failure mask, only for rules with failures
+    """
+    import pandas as pd
+
+    views = ColumnViews(df, schema)
+    failures = {}
+    for rule in compile_constraints(rules):
+        failed = rule.failures(views)
+        if failed.any():
+            failures[rule.reason] = pd.Series(failed, index=df.index)
+    return failures
@@ -0,0 +1,218 @@
+"""
+Primary key deduplication with survivorship rules.
+
+Rows sharing a table's primary key (etl.schema_definition.primary_keys) are reduced to one
+survivor; the others are rejected with a "Duplicate key" reason. The survivorship rule decides
+which row wins (ETL_SURVIVORSHIP):
+- first: the first row in file order
+- last: the last row in file order
+- most_complete: the row with the most non-empty values, the first one on ties
+- none: no key deduplication (only the whole-row drop_duplicates of clean_dataframe)
+
+Keys are reduced to int64 hashes (integer keys are their own hash; other keys go through
+pandas' hash_array), and rows whose key is missing or not an integer are left to the type checks.
+Only rows passing every other check (types, domain rules, foreign keys) compete for a key, so a
+rejected row never wins over a valid one; callers pass that mask as `eligible`.
+
+"first" runs in a single pass: a KeySet of the keys seen so far carries over from chunk to chunk.
+The other rules need to know the winner before any row is written, so they start with a plan: a
+pre-pass over the (cleaned, validated) chunks that keeps only each row's key hash, position and score, and
+turns them into the sorted positions of the losing rows. Rows are identified by their index
+label, which keeps counting across streaming chunks (see etl.utils.load.iter_raw_table).
+"""
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from config.settings import ETL_SURVIVORSHIP
+from etl.validation.referential import integer_values
+
+SURVIVORSHIP_RULES = ("first", "last", "most_complete", "none")
+
+
+def duplicate_key_reason(column: str) -> str:
+    """
+    Builds the rejection reason recorded for a row that lost to another row with the same key.
+    """
+    return f"Duplicate key in '{column}'"
+
+
+def key_hashes(series: pd.Series, integer: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hashes a key column.
+    Args:
+        series (pd.Series): Key column
+        integer (bool): Whether the key is declared int; only integral values are then hashed
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Boolean mask of the rows with a usable key, and int64 hashes
+    """
+    if integer:
+        return integer_values(series)
+    usable = series.notna().to_numpy(dtype=bool)
+    hashes = pd.util.hash_array(series.astype(str).to_numpy(dtype=object)).view("int64")
+    return usable, hashes
+
+
+def completeness(df: pd.DataFrame) -> np.ndarray:
+    """
+    Counts the non-missing, non-empty values of each row.
+    """
+    filled = df.notna().to_numpy()
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        if not pd.api.types.is_numeric_dtype(series.dtype):
+            filled[:, i] &= (series.astype(str).str.strip() != "").to_numpy(dtype=bool)
+    return filled.sum(axis=1)
+
+
+class KeySet:
+    """
+    Compact set of int64 key hashes, kept as a few sorted arrays that are merged as they grow
+    (so adding n keys in chunks costs O(n log n) overall, and a lookup one searchsorted per array).
+    """
+
+    def __init__(self):
+        self.levels: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for level in self.levels:
+            positions = np.minimum(np.searchsorted(level, hashes), len(level) - 1)
+            found |= level[positions] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray) -> None:
+        level = np.unique(hashes)
+        # Merge with the newest levels while they are not much bigger, keeping O(log n) levels
+        while self.levels and len(self.levels[-1]) <= 2 * len(level):
+            level = np.union1d(self.levels.pop(), level)
+        if len(level):
+            self.levels.append(level)
+
+
+def pick_losers(hashes: np.ndarray, positions: np.ndarray, survivorship: str,
+                scores: np.ndarray | None = None) -> np.ndarray:
+    """
+    Applies a survivorship rule to every group of rows sharing a key hash.
+    Args:
+        hashes (np.ndarray): int64 key hash of each row
+        positions (np.ndarray): Position (index label) of each row
+        survivorship (str): first, last or most_complete
+        scores (np.ndarray, optional): Completeness of each row, required for most_complete
+    Returns:
+        np.ndarray: Sorted positions of the rows that lose
+    """
+    if survivorship == "first":
+        order = np.lexsort((positions, hashes))
+    elif survivorship == "last":
+        order = np.lexsort((-positions, hashes))
+    else:
+        order = np.lexsort((positions, -scores, hashes))
+    sorted_hashes = hashes[order]
+    loses = np.ones(len(order), dtype=bool)
+    loses[:1] = False
+    loses[1:] = sorted_hashes[1:] == sorted_hashes[:-1]
+    return np.sort(positions[order][loses])
+
+
+class Deduplicator:
+    """
+    Flags the rows of a table that lose to another row with the same primary key.
+    """
+
+    def __init__(self, key: str, survivorship: str = ETL_SURVIVORSHIP, integer: bool = True,
+                 losers: np.ndarray | None = None):
+        if survivorship not in SURVIVORSHIP_RULES or survivorship == "none":
+            raise ValueError(f"Unsupported survivorship rule {survivorship!r}; "
+                             f"expected one of {list(SURVIVORSHIP_RULES[:-1])}")
+        self.key = key
+        self.survivorship = survivorship
+        self.integer = integer
+        self.losers = losers
+        self.seen = KeySet()
+
+    @classmethod
+    def for_table(cls, key: str | None, schema: dict, survivorship: str | None = None) -> "Deduplicator | None":
+        """
+        Creates the deduplicator of a table, or None when it has no key or deduplication is off.
+        """
+        survivorship = survivorship or ETL_SURVIVORSHIP
+        if key is None or survivorship == "none":
+            return None
+        return cls(key, survivorship, schema.get(key) is int)
+
+    @property
+    def needs_plan(self) -> bool:
+        return self.survivorship != "first" and self.losers is None
+
+    def hashes(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        if self.key not in df.columns:
+            return np.zeros(len(df), dtype=bool), np.zeros(len(df), dtype="int64")
+        return key_hashes(df[self.key], self.integer)
+
+    def candidates(self, df: pd.DataFrame, eligible: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Hashes the keys of a chunk, keeping only the eligible rows with a usable key as candidates.
+        """
+        usable, hashes = self.hashes(df)
+        if eligible is not None:
+            usable &= eligible
+        return usable, hashes
+
+    def scan(self, df: pd.DataFrame, eligible: np.ndarray | None = None
+             ) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+        """
+        Reduces a chunk to the key hash, position and (for most_complete) score of its candidate rows.
+        Args:
+            df (pd.DataFrame): Cleaned chunk
+            eligible (np.ndarray, optional): Boolean mask of the rows passing every other check
+        """
+        usable, hashes = self.candidates(df, eligible)
+        positions = df.index.to_numpy(dtype="int64")[usable]
+        scores = completeness(df)[usable] if self.survivorship == "most_complete" else None
+        return hashes[usable], positions, scores
+
+    def plan(self, scans: Iterable[tuple[np.ndarray, np.ndarray, np.ndarray | None]]) -> None:
+        """
+        Picks the survivors of the whole table from the scans of all its chunks (see scan).
+        """
+        scans = list(scans)
+        if not scans:
+            self.losers = np.empty(0, dtype="int64")
+            return
+        hashes, positions, scores = zip(*scans)
+        self.losers = pick_losers(np.concatenate(hashes), np.concatenate(positions), self.survivorship,
+                                  np.concatenate(scores) if self.survivorship == "most_complete" else None)
+
+    def check(self, df: pd.DataFrame, eligible: np.ndarray | None = None) -> dict[str, pd.Series]:
+        """
+        Flags the losing rows of a chunk; chunks must come in file order.
+        Args:
+            df (pd.DataFrame): Cleaned chunk
+            eligible (np.ndarray, optional): Boolean mask of the rows passing every other check;
+                the other rows neither win nor lose a key
+        Returns:
+            dict[str, pd.Series]: Rejection reason -> boolean failure mask, empty without duplicates
+        """
+        if self.needs_plan:
+            self.plan([self.scan(df, eligible)])
+        if self.losers is not None:
+            lost = np.zeros(len(df), dtype=bool)
+            if len(self.losers):
+                positions = df.index.to_numpy(dtype="int64")
+                found = np.minimum(np.searchsorted(self.losers, positions), len(self.losers) - 1)
+                lost = self.losers[found] == positions
+        else:
+            usable, hashes = self.candidates(df, eligible)
+            hashes = hashes[usable]
+            lost = np.zeros(len(df), dtype=bool)
+            lost[usable] = pd.Series(hashes).duplicated().to_numpy() | self.seen.contains(hashes)
+            self.seen.add(hashes)
+        if not lost.any():
+            return {}
+        return {duplicate_key_reason(self.key): pd.Series(lost, index=df.index)}
@@ -0,0 +1,200 @@
+"""
+Persistent, memory-mapped key indexes of the transformed dimension tables.
+
+Every dimension referenced by a foreign key (etl.schema_definition.foreign_keys) gets a key index
+in an _index/ directory next to its output, written by the dimension transform while it saves
+its rows:
+- <table>.<key>.keys.npy: sorted, unique int64 keys
+- <table>.<key>.rows.npy: row offset of each key in the output (its first row)
+- <table>.<key>.json: the output file the arrays describe (name, size, mtime) and the key count
+
+Fact transforms memory-map the arrays instead of reading and hashing the dimension outputs, so
+resolving a foreign key is one searchsorted over pages the OS shares between processes.
+MappedKeys arrays pickle as the path of their file, so partition workers map the same pages
+instead of each receiving a copy of the keys.
+
+The index is maintained incrementally: files are replaced atomically (processes still mapping
+the old ones keep a consistent view), a rewrite whose keys and offsets did not change leaves the
+arrays alone, and an index whose recorded output no longer matches the dimension output (e.g. the
+output was replaced outside a transform) is rebuilt from the output on first use.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etl.schema_definition import foreign_keys
+from etl.utils.output_formats import iter_output
+from etl.validation.referential import integer_values
+
+INDEX_DIR_NAME = "_index"
+
+
+class MappedKeys(np.ndarray):
+    """
+    Read-only int64 array memory-mapped from a key index file. Pickles as the path of the file;
+    views and results of operations on it are not mapped and pickle as plain arrays.
+    """
+    path: Path | None = None
+
+    def __array_finalize__(self, obj) -> None:
+        self.path = None
+
+    def __reduce_ex__(self, protocol):
+        if self.path is None:
+            return np.asarray(self).__reduce_ex__(protocol)
+        return map_array, (self.path,)
+
+
+def map_array(path: Path) -> MappedKeys:
+    """
+    Memory-maps a .npy file read-only.
+    """
+    array = np.load(path, mmap_mode="r")
+    if not len(array):
+        # Nothing to map in an empty array
+        return np.asarray(array).view(MappedKeys)
+    array = array.view(MappedKeys)
+    array.path = path
+    return array
+
+
+def dimension_key(table: str) -> str | None:
+    """
+    Returns the key column other tables reference a dimension by, or None if nothing references it.
+    """
+    for columns in foreign_keys.values():
+        for dimension, key in columns.values():
+            if dimension == table:
+                return key
+    return None
+
+
+def index_paths(output: Path, key: str) -> tuple[Path, Path, Path]:
+    """
+    Returns the keys, row offsets and metadata paths of the key index of an output file.
+    """
+    directory = output.parent / INDEX_DIR_NAME
+    stem = f"{output.name.split('.')[0]}.{key}"
+    return directory / f"{stem}.keys.npy", directory / f"{stem}.rows.npy", directory / f"{stem}.json"
+
+
+def output_signature(output: Path, key: str) -> dict:
+    stat = output.stat()
+    return {"output": output.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "key": key}
+
+
+def replace_file(path: Path, write) -> None:
+    """
+    Writes a file through a temporary file and an atomic rename.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def same_array(path: Path, array: np.ndarray) -> bool:
+    return path.exists() and np.array_equal(map_array(path), array)
+
+
+def write_key_index(output: Path, key: str, keys: np.ndarray, rows: np.ndarray) -> None:
+    """
+    Writes the key index of an output file, leaving unchanged arrays untouched.
+    Args:
+        output (Path): Dimension output file the index describes
+        key (str): Key column
+        keys (np.ndarray): Sorted, unique int64 keys
+        rows (np.ndarray): Row offset of each key in the output
+    """
+    keys_path, rows_path, meta_path = index_paths(output, key)
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    changed = 0
+    for path, array in ((keys_path, keys), (rows_path, rows)):
+        if not same_array(path, array):
+            replace_file(path, lambda f: np.save(f, np.ascontiguousarray(array, dtype="int64")))
+            changed += 1
+    document = {**output_signature(output, key), "keys": len(keys)}
+    replace_file(meta_path, lambda f: f.write(json.dumps(document, indent=2).encode()))
+    logging.info(f"{'Updated' if changed else 'Kept'} key index of {output.name} ({len(keys)} keys) in {meta_path.parent}")
+
+
+class KeyIndexBuilder:
+    """
+    Collects a dimension's keys and row offsets while its output is written, chunk by chunk.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.keys: list[np.ndarray] = []
+        self.rows: list[np.ndarray] = []
+        self.offset = 0
+
+    @classmethod
+    def for_table(cls, table: str) -> "KeyIndexBuilder | None":
+        """
+        Creates the builder of an output table, or None when no foreign key references it.
+        """
+        key = dimension_key(table)
+        return cls(key) if key is not None else None
+
+    def add(self, df: pd.DataFrame) -> None:
+        """
+        Adds the next rows written to the output (in output order).
+        """
+        if self.key in df.columns:
+            usable, ints = integer_values(df[self.key])
+            self.keys.append(ints[usable])
+            self.rows.append(np.flatnonzero(usable) + self.offset)
+        self.offset += len(df)
+
+    def write(self, output: Path) -> None:
+        """
+        Writes the index of the output once it is complete, keeping each key's first row.
+        """
+        keys = np.concatenate(self.keys) if self.keys else np.empty(0, dtype="int64")
+        rows = np.concatenate(self.rows) if self.rows else np.empty(0, dtype="int64")
+        keys, first = np.unique(keys, return_index=True)
+        write_key_index(output, self.key, keys, rows[first].astype("int64"))
+
+
+def is_current(output: Path, key: str) -> bool:
+    """
+    Checks whether the key index of an output exists and was built from the output as it is now.
+    """
+    keys_path, rows_path, meta_path = index_paths(output, key)
+    if not (keys_path.exists() and rows_path.exists() and meta_path.exists()):
+        return False
+    document = json.loads(meta_path.read_text())
+    return {field: document.get(field) for field in ("output", "size", "mtime_ns", "key")} == \
+        output_signature(output, key)
+
+
+def build_key_index(output: Path, key: str) -> None:
+    """
+    Builds the key index of an existing output file, streaming its key column.
+    """
+    builder = KeyIndexBuilder(key)
+    for chunk in iter_output(output, [key]):
+        builder.add(chunk)
+    builder.write(output)
+
+
+def load_key_index(output: Path, key: str) -> tuple[MappedKeys, MappedKeys]:
+    """
+    Maps the key index of a dimension output, rebuilding it first when missing or stale.
+    Args:
+        output (Path): Dimension output file
+        key (str): Key column
+    Returns:
+        tuple[MappedKeys, MappedKeys]: Sorted, unique int64 keys and the row offset of each key
+    """
+    if not is_current(output, key):
+        logging.info(f"Key index of {output.name} missing or stale; rebuilding it")
+        build_key_index(output, key)
+    keys_path, rows_path, _ = index_paths(output, key)
+    return map_array(keys_path), map_array(rows_path)
@@ -0,0 +1,122 @@
+"""
+Referential-integrity checks of fact rows against the keys of the transformed dimension tables.
+
+The valid keys of each dimension are a sorted int64 array, memory-mapped from the key index the
+dimension transform wrote next to its output (see etl.validation.key_index), and every foreign key
+column is resolved with a single np.searchsorted call, so the check stays vectorized no matter
+how many claims are validated.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from etl.utils.output_formats import find_output
+from etl.utils.paths import TRANSFORMED_DATA_DIR
+
+# fact column -> (dimension output table, dimension key column)
+ForeignKeys = dict[str, tuple[str, str]]
+
+# fact column -> (dimension output table, sorted int64 keys)
+KeyIndexes = dict[str, tuple[str, np.ndarray]]
+
+
+def unique_keys(values: pd.Series) -> np.ndarray:
+    """
+    Converts a key column to sorted, unique int64 keys, dropping values that are not numeric.
+    """
+    values = pd.to_numeric(values, errors="coerce").dropna()
+    return np.unique(values.to_numpy(dtype="int64"))
+
+
+def integer_values(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts a key column to int64 for lookups.
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Mask of values that are integers, and their int64 values (0 elsewhere)
+    """
+    if pd.api.types.is_integer_dtype(values.dtype) and not values.hasnans:
+        return np.ones(len(values), dtype=bool), values.to_numpy(dtype="int64")
+    numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    usable = np.isfinite(numbers) & (np.floor(numbers) == numbers)
+    return usable, np.where(usable, numbers, 0).astype("int64")
+
+
+def load_dimension_keys(table: str, key: str) -> np.ndarray:
+    """
+    Maps the distinct keys of a transformed dimension table from its key index.
+    Args:
+        table (str): Transformed table name, e.g. 'customers'
+        key (str): Key column, e.g. 'customer_id'
+    Returns:
+        np.ndarray: Sorted, unique int64 keys (read-only, memory-mapped)
+    """
+    from etl.validation.key_index import load_key_index
+
+    try:
+        path = find_output(TRANSFORMED_DATA_DIR, table)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Dimension output for {table} not found; transform {table} before its facts")
+
+    keys, _ = load_key_index(path, key)
+    logging.info(f"Mapped {len(keys)} keys of {table}.{key}")
+    return keys
+
+
+def build_key_indexes(foreign_keys: ForeignKeys) -> KeyIndexes:
+    """
+    Builds the sorted key array for every foreign key column.
+    Args:
+        foreign_keys (ForeignKeys): fact column -> (dimension table, key column)
+    Returns:
+        KeyIndexes: fact column -> (dimension table, sorted int64 keys)
+    """
+    return {column: (table, load_dimension_keys(table, key)) for column, (table, key) in foreign_keys.items()}
+
+
+def keys_present(values: pd.Series, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Looks up a column of foreign key values in a sorted key array.
+    Args:
+        values (pd.Series): Foreign key column
+        keys (np.ndarray): Sorted int64 keys
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Mask of values that are integers (and so can be checked),
+        and mask of values found in keys
+    """
+    checkable, ints = integer_values(values)
+    keys = np.asarray(keys)
+    positions = np.searchsorted(keys, ints)
+    found = np.zeros(len(ints), dtype=bool)
+    in_bounds = positions < len(keys)
+    found[in_bounds] = keys[positions[in_bounds]] == ints[in_bounds]
+    return checkable, found
+
+
+def foreign_key_reason(column: str, table: str) -> str:
+    """
+    Builds the rejection reason recorded for a foreign key violation.
+    """
+    return f"Foreign key violation in '{column}': not found in {table}"
+
+
+def check_foreign_keys(df: pd.DataFrame, key_indexes: KeyIndexes) -> dict[str, pd.Series]:
+    """
+    Flags rows whose foreign keys have no match in the dimension key indexes.
+    Values that are not integers are left to the type checks.
+    Args:
+        df (pd.DataFrame): Fact rows
+        key_indexes (KeyIndexes): fact column -> (dimension table, sorted int64 keys)
+    Returns:
+        dict[str, pd.Series]: Rejection reason -> boolean failure mask, only for columns with violations
+    """
+    failures = {}
+    for column, (table, keys) in key_indexes.items():
+        if column not in df.columns:
+            continue
+        checkable, found = keys_present(df[column], keys)
+        violations = checkable & ~found
+        if violations.any():
+            failures[foreign_key_reason(column, table)] = pd.Series(violations, index=df.index)
+    return failures
@@ -0,0 +1,191 @@
+"""
+Compact rejection codes and the single sink rejected rows are written through.
+
+Every reason a table's validation can produce (type checks, domain rules, foreign keys, duplicate
+keys) is known up front from its schema, rules and key indexes, so RuleCodes numbers them once: reason i is bit
+i of the int64 rejection_code column of rejected rows, and a row failing several checks carries
+the OR of their bits. The numbering is the same for every chunk and worker of a run.
+
+RejectionSink writes a table's rejected rows exactly once per run, appending chunk by chunk in
+streaming mode or concatenating worker part files in partitioned mode, optionally gzip-compressed
+(ETL_REJECTED_COMPRESSION, CSV only). It counts rows per rule while writing and, on close, writes
+the lookup table next to the output as <table>.rules.json:
+    {"table": ..., "path": ..., "rows": ..., "rules": [{"bit": 0, "code": 1, "reason": ..., "rows": ...}]}
+so per-rule counts never require re-reading the rejected file.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config.settings import ETL_REJECTED_COMPRESSION
+from etl.schema_definition import SchemaType
+from etl.utils.output_formats import concat_outputs, open_writer, output_path, output_variants, resolve_format
+from etl.utils.paths import REJECTED_DATA_DIR
+from etl.validation.constraints import Constraint
+from etl.validation.dedup import duplicate_key_reason
+from etl.validation.referential import KeyIndexes, foreign_key_reason
+from etl.validation.type_checks import type_failure_reason
+
+CODE_COLUMN = "rejection_code"
+
+# Bits available in an int64 code (the sign bit is left alone)
+MAX_RULES = 63
+
+
+class RuleCodes:
+    """
+    Numbering of a table's rejection reasons, one bit per reason.
+    """
+
+    def __init__(self, reasons: list[str]):
+        self.reasons = list(dict.fromkeys(reasons))
+        if len(self.reasons) > MAX_RULES:
+            raise ValueError(f"{len(self.reasons)} rejection reasons do not fit in a {MAX_RULES}-bit code")
+        self.bits = {reason: bit for bit, reason in enumerate(self.reasons)}
+
+    @classmethod
+    def for_table(cls, schema: SchemaType, rules: list[Constraint] | None = None,
+                  key_indexes: KeyIndexes | None = None, primary_key: str | None = None) -> "RuleCodes":
+        """
+        Lists every reason the validation of a table can produce.
+        Args:
+            schema (SchemaType): Table schema
+            rules (list[Constraint], optional): Domain rules of the table
+            key_indexes (KeyIndexes, optional): Foreign key column -> (dimension table, sorted keys)
+            primary_key (str, optional): Primary key column, whose duplicates are rejected
+        Returns:
+            RuleCodes: Codes of the table's reasons, type checks first
+        """
+        reasons = []
+        for column, expected_type in schema.items():
+            if expected_type is str:
+                continue
+            reasons.append(type_failure_reason(column, expected_type))
+            if expected_type is int:
+                reasons.append(type_failure_reason(column, int, non_integer=True))
+        reasons += [rule.reason for rule in rules or []]
+        reasons += [foreign_key_reason(column, table) for column, (table, _) in (key_indexes or {}).items()]
+        if primary_key is not None:
+            reasons.append(duplicate_key_reason(primary_key))
+        return cls(reasons)
+
+    def encode(self, failures: dict[str, pd.Series], index: pd.Index) -> tuple[pd.Series, np.ndarray]:
+        """
+        Combines per-check failure masks into a validity mask and the codes of the invalid rows.
+        Args:
+            failures (dict[str, pd.Series]): Rejection reason -> boolean failure mask
+            index (pd.Index): Index of the validated DataFrame
+        Returns:
+            tuple[pd.Series, np.ndarray]: Boolean validity mask, and int64 codes of the invalid rows
+        """
+        codes = np.zeros(len(index), dtype="int64")
+        for reason, mask in failures.items():
+            if reason not in self.bits:
+                raise ValueError(f"Unknown rejection reason {reason!r}")
+            codes[mask.to_numpy(dtype=bool)] |= 1 << self.bits[reason]
+        invalid = codes != 0
+        return pd.Series(~invalid, index=index), codes[invalid]
+
+    def decode(self, codes) -> list[str]:
+        """
+        Turns codes back into '; '-joined reasons, in rule order.
+        """
+        return ["; ".join(reason for bit, reason in enumerate(self.reasons) if code >> bit & 1)
+                for code in np.asarray(codes, dtype="int64")]
+
+    def count(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Counts the rows failing each rule.
+        Returns:
+            np.ndarray: Rows per bit, one entry per reason
+        """
+        codes = np.ascontiguousarray(codes, dtype="<i8")
+        bits = np.unpackbits(codes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        return bits.sum(axis=0, dtype="int64")[:len(self.reasons)]
+
+
+class RejectionSink:
+    """
+    Writes a table's rejected rows once, chunk by chunk, and the lookup table with per-rule counts.
+    Use as a context manager; nothing is written for a table without rejected rows except its
+    lookup table. Closing removes the table's rejected outputs of earlier runs in other formats or
+    compressions (and its own path when this run rejected nothing), so only this run's file remains.
+    """
+
+    def __init__(self, table: str, codes: RuleCodes, fmt: str | None = None,
+                 compression: str | None = ETL_REJECTED_COMPRESSION, directory: Path | None = None):
+        self.table = table
+        self.codes = codes
+        self.fmt = resolve_format(fmt)
+        self.compression = compression or None
+        self.directory = directory or REJECTED_DATA_DIR
+        self.path = output_path(self.directory, table, self.fmt, self.compression)
+        self.rows = 0
+        self.counts = np.zeros(len(codes.reasons), dtype="int64")
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Appends rejected rows carrying a rejection_code column.
+        """
+        if df.empty:
+            return
+        if self._writer is None:
+            self._writer = open_writer(self.directory, self.table, {CODE_COLUMN: int}, self.fmt, self.compression)
+        self._writer.write(df)
+        self.add_counts(len(df), self.codes.count(df[CODE_COLUMN].to_numpy()))
+
+    def add_counts(self, rows: int, counts: np.ndarray) -> None:
+        """
+        Adds rows counted elsewhere, e.g. by a worker whose part file is concatenated later.
+        """
+        self.rows += rows
+        self.counts += counts
+
+    def concat(self, parts: list[Path]) -> None:
+        """
+        Writes the rejected output from part files (without counting their rows; see add_counts).
+        """
+        concat_outputs(parts, self.path)
+
+    def rule_counts(self) -> dict[str, int]:
+        return {reason: int(rows) for reason, rows in zip(self.codes.reasons, self.counts)}
+
+    def lookup_path(self) -> Path:
+        return self.directory / f"{self.table}.rules.json"
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for stale in output_variants(self.directory, self.table):
+            if stale != self.path or not self.rows:
+                stale.unlink(missing_ok=True)
+        rules = [{"bit": bit, "code": 1 << bit, "reason": reason, "rows": int(self.counts[bit])}
+                 for bit, reason in enumerate(self.codes.reasons)]
+        document = {"table": self.table, "path": self.path.name if self.rows else None, "rows": self.rows,
+                    "rules": rules}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.lookup_path().write_text(json.dumps(document, indent=2))
+        if self.rows:
+            top = sorted(self.rule_counts().items(), key=lambda item: item[1], reverse=True)
+            summary = ", ".join(f"{reason}: {rows}" for reason, rows in top if rows)
+            logging.warning(f"Rejected {self.rows} rows saved to {self.path} ({summary})")
+
+    def __enter__(self) -> "RejectionSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_rule_counts(table: str, directory: Path | None = None) -> dict[str, int]:
+    """
+    Reads the per-rule rejected row counts of a table's last run from its lookup table.
+    """
+    document = json.loads(((directory or REJECTED_DATA_DIR) / f"{table}.rules.json").read_text())
+    return {rule["reason"]: rule["rows"] for rule in document["rules"]}
@@ -0,0 +1,250 @@
+"""
+Column-at-a-time type checks compiled from the table schemas in etl/schema_definition.py.
+
+Each schema entry ({column: type}) is compiled into a function that takes the whole column
+and returns a boolean failure mask, so validation runs as a handful of vectorized pandas/NumPy
+operations per column instead of one Python call per cell.
+
+The masks reproduce the semantics of etl.utils.helpers.is_valid_type for data read from CSV:
+- int: numeric values must be finite and integral, strings must look like an integer literal,
+  missing values are rejected
+- float: any numeric value or float literal (including 'nan'/'inf'), missing values are accepted
+- str: every value is accepted
+- date: only valid 'YYYY-MM-DD' strings are accepted (see etl.utils.helpers.normalize_dates)
+"""
+
+from datetime import date
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from etl.schema_definition import SchemaType
+from etl.utils.helpers import ISO_DATE_FORMAT, string_mask
+
+# Literals accepted by int() / float() for string input (surrounding whitespace allowed)
+_DIGITS = r"\d+(?:_\d+)*"
+INT_PATTERN = rf"\s*[+-]?{_DIGITS}\s*"
+FLOAT_PATTERN = (
+    rf"\s*[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?"
+    r"|(?i:nan|inf|infinity))\s*"
+)
+
+ColumnCheck = Callable[[pd.Series], pd.Series]
+
+
+def _numeric_values(series: pd.Series) -> np.ndarray:
+    """
+    Converts a column to a float64 array, with NaN for missing or non-numeric values.
+    """
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _int_failures(series: pd.Series) -> pd.Series:
+    """
+    Failure mask for int columns: True where int(value) would fail or lose precision.
+    """
+    if pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_integer_dtype(series.dtype):
+        return series.isna()
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = _numeric_values(series)
+        ok = np.isfinite(values) & (np.floor(values) == values)
+        return pd.Series(~ok, index=series.index)
+
+    is_str = string_mask(series)
+    ok = pd.Series(False, index=series.index)
+    if is_str.any():
+        ok[is_str] = series[is_str].astype(str).str.fullmatch(INT_PATTERN).to_numpy(dtype=bool)
+    others = ~is_str & series.notna()
+    if others.any():
+        values = _numeric_values(series[others])
+        ok[others] = np.isfinite(values) & (np.floor(values) == values)
+    return ~ok
+
+
+def _float_failures(series: pd.Series) -> pd.Series:
+    """
+    Failure mask for float columns: True where float(value) would raise.
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        return pd.Series(False, index=series.index)
+
+    is_str = string_mask(series)
+    failures = pd.Series(False, index=series.index)
+    if is_str.any():
+        matches = series[is_str].astype(str).str.fullmatch(FLOAT_PATTERN).to_numpy(dtype=bool)
+        failures[is_str] = ~matches
+    others = ~is_str & series.notna()
+    if others.any():
+        failures[others] = np.isnan(_numeric_values(series[others])) & series[others].notna().to_numpy()
+    return failures
+
+
+def _date_failures(series: pd.Series) -> pd.Series:
+    """
+    Failure mask for date columns: True unless the value is a valid 'YYYY-MM-DD' string.
+    """
+    is_str = string_mask(series)
+    failures = pd.Series(True, index=series.index)
+    if is_str.any():
+        parsed = pd.to_datetime(series[is_str].astype(str), format=ISO_DATE_FORMAT, errors="coerce")
+        failures[is_str] = parsed.isna().to_numpy()
+    return failures
+
+
+def _str_failures(series: pd.Series) -> pd.Series:
+    """
+    Failure mask for str columns: every value can be converted with str().
+    """
+    return pd.Series(False, index=series.index)
+
+
+TYPE_CHECKS: dict[type, ColumnCheck] = {
+    int: _int_failures,
+    float: _float_failures,
+    str: _str_failures,
+    date: _date_failures,
+}
+
+
+def compile_schema(schema: SchemaType) -> list[tuple[str, type, ColumnCheck]]:
+    """
+    Compiles a schema into a list of (column, expected_type, check) entries.
+    Args:
+        schema (SchemaType): Expected schema definition {column: type}
+    Returns:
+        list: One entry per column, where check(series) returns a failure mask
+    """
+    compiled = []
+    for column, expected_type in schema.items():
+        if expected_type not in TYPE_CHECKS:
+            raise ValueError(f"Unsupported type for column '{column}': {expected_type!r}")
+        compiled.append((column, expected_type, TYPE_CHECKS[expected_type]))
+    return compiled
+
+
+def type_failure_reason(column: str, expected_type: type, non_integer: bool = False) -> str:
+    """
+    Builds the rejection reason recorded for a failed type check.
+    """
+    if expected_type is date:
+        return f"Invalid date in '{column}': expected YYYY-MM-DD"
+    if non_integer:
+        return f"Non-integer value in '{column}'"
+    return f"Invalid type in '{column}': expected {expected_type.__name__}"
+
+
+def check_schema(df: pd.DataFrame, schema: SchemaType) -> dict[str, pd.Series]:
+    """
+    Runs every compiled column check against a DataFrame.
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        schema (SchemaType): Expected schema definition {column: type}
+    Returns:
+        dict[str, pd.Series]: Rejection reason -> boolean failure mask, only for checks with failures
+    """
+    failures = {}
+    for column, expected_type, check in compile_schema(schema):
+        if column not in df.columns:
+            # A missing column behaves like a column full of None
+            if expected_type is not str:
+                failures[type_failure_reason(column, expected_type)] = pd.Series(True, index=df.index)
+            continue
+
+        series = df[column]
+        failed = check(series)
+        if not failed.any():
+            continue
+
+        if expected_type is int:
+            # Separate fractional numbers from missing/non-finite values, like is_valid_type does
+            numeric = ~string_mask(series) & pd.Series(np.isfinite(_numeric_values(series)), index=df.index)
+            fractional = failed & numeric
+            if fractional.any():
+                failures[type_failure_reason(column, int, non_integer=True)] = fractional
+            failed = failed & ~fractional
+            if not failed.any():
+                continue
+
+        failures[type_failure_reason(column, expected_type)] = failed
+    return failures
+
+
+def combine_failures(failures: dict[str, pd.Series], index: pd.Index) -> tuple[pd.Series, pd.Series]:
+    """
+    Combines per-check failure masks into a validity mask and per-row rejection reasons.
+    Args:
+        failures (dict[str, pd.Series]): Rejection reason -> boolean failure mask
+        index (pd.Index): Index of the validated DataFrame
+    Returns:
+        tuple[pd.Series, pd.Series]: Boolean validity mask, and '; '-joined reasons for invalid rows
+    """
+    invalid = pd.Series(False, index=index)
+    for mask in failures.values():
+        invalid |= mask.to_numpy(dtype=bool)
+
+    reasons = pd.Series("", index=index[invalid.to_numpy()], dtype=object)
+    for reason, mask in failures.items():
+        hit = mask.to_numpy(dtype=bool)[invalid.to_numpy()]
+        reasons[hit] = reasons[hit] + reason + "; "
+    reasons = reasons.str.slice(0, -2)
+    return ~invalid, reasons
+
+
+def evaluate_schema(df: pd.DataFrame, schema: SchemaType) -> tuple[pd.Series, pd.Series]:
+    """
+    Validates a DataFrame against a schema one column at a time.
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        schema (SchemaType): Expected schema definition {column: type}
+    Returns:
+        tuple[pd.Series, pd.Series]: Boolean validity mask, and rejection reasons for invalid rows
+    """
+    return combine_failures(check_schema(df, schema), df.index)
+
+
+def add_parse_failures(failures: dict[str, pd.Series], parse_errors: pd.DataFrame | None,
+                       schema: SchemaType, index: pd.Index) -> dict[str, pd.Series]:
+    """
+    Adds the cells that failed to parse at ingest (see etl.utils.arrow_ingest) to the failure masks.
+    Those cells are nulls in the DataFrame, so their reasons are derived from the raw strings:
+    fractional numbers in int columns are reported as non-integer, everything else as invalid type.
+    Args:
+        failures (dict[str, pd.Series]): Rejection reason -> failure mask, updated in place
+        parse_errors (pd.DataFrame, optional): Side-channel with row (index label), column and raw_value
+        schema (SchemaType): Expected schema definition {column: type}
+        index (pd.Index): Index of the validated DataFrame
+    Returns:
+        dict[str, pd.Series]: The updated failures
+    """
+    if parse_errors is None or parse_errors.empty:
+        return failures
+
+    for column, errors in parse_errors.groupby("column", sort=False):
+        expected_type = schema.get(column)
+        if expected_type is None:
+            continue
+        failed = pd.Series(index.isin(errors["row"]), index=index)
+        if not failed.any():
+            continue
+
+        reason = type_failure_reason(column, expected_type)
+        if expected_type is int:
+            raw = errors["raw_value"].astype(str)
+            fractional_rows = errors["row"][raw.str.fullmatch(FLOAT_PATTERN).to_numpy(dtype=bool)
+                                            & np.isfinite(pd.to_numeric(raw, errors="coerce").to_numpy(dtype="float64"))]
+            fractional = pd.Series(index.isin(fractional_rows), index=index)
+            if fractional.any():
+                non_integer = type_failure_reason(column, int, non_integer=True)
+                failures[non_integer] = failures.get(non_integer, pd.Series(False, index=index)) | fractional
+                # The null left behind by the failed cast must not also count as an invalid type
+                if reason in failures:
+                    failures[reason] = failures[reason] & ~fractional
+                failed = failed & ~fractional
+
+        if failed.any():
+            failures[reason] = failures.get(reason, pd.Series(False, index=index)) | failed
+        elif reason in failures and not failures[reason].any():
+            del failures[reason]
+    return failures
@@ -1,50 +1,106 @@
-import pandas as pd
-from pathlib import Path
 import logging
-from etl.utils.helpers import is_valid_type
 
-REJECTED_DATA_DIR = Path("data/rejected")
-REJECTED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+import numpy as np
+import pandas as pd
+
+from etl.validation.constraints import Constraint, check_constraints
+from etl.validation.dedup import Deduplicator
+from etl.validation.referential import KeyIndexes, check_foreign_keys
+from etl.validation.rejections import RuleCodes
+from etl.validation.type_checks import add_parse_failures, check_schema, combine_failures
+
+
+def collect_failures(df: pd.DataFrame, schema: dict, key_indexes: KeyIndexes | None = None,
+                     parse_errors: pd.DataFrame | None = None,
+                     rules: list[Constraint] | None = None,
+                     deduplicator: Deduplicator | None = None) -> dict[str, pd.Series]:
+    """
+    Runs the type checks, the table's domain rules and, when given, the foreign key checks and
+    the primary key deduplication.
+    Args:
+        df (pd.DataFrame): Input DataFrame to validate.
+        schema (dict): Expected schema definition {column: dtype}.
+        key_indexes (KeyIndexes, optional): Foreign key column -> (dimension table, sorted keys).
+        parse_errors (pd.DataFrame, optional): Cells that failed to parse at ingest (see etl.utils.arrow_ingest).
+        rules (list[Constraint], optional): Domain rules (see etl.validation.constraints).
+        deduplicator (Deduplicator, optional): Flags rows losing to another row with the same key
+            among the rows passing every other check (see etl.validation.dedup).
+    Returns:
+        dict[str, pd.Series]: Rejection reason -> boolean failure mask, only for checks with failures.
+    """
+    failures = add_parse_failures(check_schema(df, schema), parse_errors, schema, df.index)
+    if rules:
+        failures.update(check_constraints(df, rules, schema))
+    if key_indexes:
+        failures.update(check_foreign_keys(df, key_indexes))
+    if deduplicator is not None:
+        # Only rows passing every other check compete for their key
+        failures.update(deduplicator.check(df, passing_rows(failures, len(df))))
+    return failures
+
+
+def passing_rows(failures: dict[str, pd.Series], rows: int) -> np.ndarray:
+    """
+    Combines per-check failure masks into a boolean mask of the rows failing none of them.
+    """
+    failed = np.zeros(rows, dtype=bool)
+    for mask in failures.values():
+        failed |= mask.to_numpy(dtype=bool)
+    return ~failed
+
+
+def scan_keys(df: pd.DataFrame, schema: dict, deduplicator: Deduplicator,
+              key_indexes: KeyIndexes | None = None, parse_errors: pd.DataFrame | None = None,
+              rules: list[Constraint] | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """
+    Validates a chunk and scans the keys of its rows passing every check for the deduplication
+    plan (see Deduplicator.scan).
+    """
+    failures = collect_failures(df, schema, key_indexes, parse_errors, rules)
+    return deduplicator.scan(df, passing_rows(failures, len(df)))
+
+
+def evaluate_rows(df: pd.DataFrame, schema: dict, key_indexes: KeyIndexes | None = None,
+                  parse_errors: pd.DataFrame | None = None,
+                  rules: list[Constraint] | None = None) -> tuple[pd.Series, pd.Series]:
+    """
+    Validates a DataFrame and describes why each invalid row failed (see collect_failures).
+    Returns:
+        tuple[pd.Series, pd.Series]: Boolean validity mask, and rejection reasons for invalid rows.
+    """
+    return combine_failures(collect_failures(df, schema, key_indexes, parse_errors, rules), df.index)
+
+
+def evaluate_codes(df: pd.DataFrame, schema: dict, codes: RuleCodes, key_indexes: KeyIndexes | None = None,
+                   parse_errors: pd.DataFrame | None = None, rules: list[Constraint] | None = None,
+                   deduplicator: Deduplicator | None = None) -> tuple[pd.Series, np.ndarray]:
+    """
+    Validates a DataFrame and encodes why each invalid row failed as a rule bitmask (see collect_failures).
+    Returns:
+        tuple[pd.Series, np.ndarray]: Boolean validity mask, and int64 rejection codes of the invalid rows.
+    """
+    return codes.encode(collect_failures(df, schema, key_indexes, parse_errors, rules, deduplicator), df.index)
+
 
-def validate_data(df: pd.DataFrame, schema: dict, table_name: str) -> pd.Series:
+def validate_data(df: pd.DataFrame, schema: dict, table_name: str, key_indexes: KeyIndexes | None = None,
+                  parse_errors: pd.DataFrame | None = None, rules: list[Constraint] | None = None) -> pd.Series:
     """
     Validates the input DataFrame against the provided schema.
-    Invalid rows are written to a rejected file with a rejection reason.
+    Checks are evaluated column by column (see etl.validation.type_checks and
+    etl.validation.constraints), plus foreign key lookups when key indexes are given (see etl.validation.referential).
+    Rejected rows are not written here; they go through etl.validation.rejections.RejectionSink.
     Args:
         df (pd.DataFrame): Input DataFrame to validate.
-        table_name (str): Name of the table (used for file naming).
+        table_name (str): Name of the table (used for logging).
         schema (dict): Expected schema definition {column: dtype}.
+        key_indexes (KeyIndexes, optional): Foreign key column -> (dimension table, sorted keys).
+        parse_errors (pd.DataFrame, optional): Cells that failed to parse at ingest.
+        rules (list[Constraint], optional): Domain rules of the table.
     Returns:
         pd.Series: Boolean Series indicating which rows are valid.
     """
-    valid_rows = []
-    rejected_rows = []
-    is_valid_list = []
-
-    for _, row in df.iterrows():
-        reasons = []
-
-        for column, expected_type in schema.items():
-            value = row.get(column, None)
-
-            if not is_valid_type(value, expected_type):
-                reasons.append(f"Invalid type in '{column}': expected {expected_type}, got {type(value).__name__}")
-
-        if reasons:
-            row_with_reason = row.to_dict()
-            row_with_reason["rejection_reason"] = "; ".join(reasons)
-            rejected_rows.append(row_with_reason)
-            is_valid_list.append(False)
-        else:
-            valid_rows.append(row)
-            is_valid_list.append(True)
-
-    # Save rejected rows
-    if rejected_rows:
-        rejected_df = pd.DataFrame(rejected_rows)
-        rejected_path = REJECTED_DATA_DIR / f"{table_name}.csv"
-        rejected_df.to_csv(rejected_path, index=False)
-        logging.warning(f"{len(rejected_df)} rows rejected from {table_name} — written to {rejected_path}")
-
-    logging.info(f"{len(valid_rows)} valid rows retained from {table_name}")
-    return pd.Series(is_valid_list, index=df.index).fillna(False)
\ No newline at end of file
+    is_valid, reasons = evaluate_rows(df, schema, key_indexes, parse_errors, rules)
+    if not reasons.empty:
+        logging.warning(f"{len(reasons)} rows rejected from {table_name}", extra={"rate_key": f"rejected:{table_name}"})
+    logging.info(f"{int(is_valid.sum())} valid rows retained from {table_name}")
+    return is_valid
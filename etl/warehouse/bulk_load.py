@@ -0,0 +1,223 @@
+"""
+Loads the transformed star schema into a database.
+
+Each table is loaded in its own transaction: rows are streamed into a staging table, the target
+is emptied, and the staged rows are moved over in one INSERT ... SELECT, so readers never see a
+half-loaded table.
+
+- PostgresBulkLoader streams CSV chunks through COPY FROM STDIN on a pooled SQLAlchemy engine
+- SQLiteBulkLoader implements the same interface with executemany, for local runs and tests
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import time
+from abc import ABC, abstractmethod
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from config.settings import get_connection_url
+from etl.schema_definition import (
+    SchemaType,
+    adjusters_schema,
+    claims_fact_schema,
+    customers_schema,
+    dates_schema,
+    policies_schema,
+)
+from etl.utils.helpers import ISO_DATE_FORMAT
+from etl.utils.output_formats import find_output, iter_output
+from etl.utils.paths import TRANSFORMED_DATA_DIR
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from sqlalchemy.engine import Engine
+
+# Database table -> (transformed output name, schema); dimensions come before the fact table
+STAR_SCHEMA: dict[str, tuple[str, SchemaType]] = {
+    "customers_dim": ("customers", customers_schema),
+    "policies_dim": ("policies", policies_schema),
+    "dates_dim": ("dates", dates_schema),
+    "adjusters_dim": ("adjusters", adjusters_schema),
+    "claims_fact": ("claims_fact", claims_fact_schema),
+}
+
+
+def iter_load_chunks(path: Path, schema: SchemaType, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Streams a transformed output file in chunks, projected to the schema columns and cast to their types.
+    Args:
+        path (Path): Transformed output (CSV, Parquet or Feather)
+        schema (SchemaType): Table schema
+        chunk_size (int): Rows per chunk
+    Yields:
+        pd.DataFrame: Chunk ready to be written to the database
+    """
+    import pandas as pd
+
+    columns = list(schema)
+    for chunk in iter_output(path, columns, chunk_size):
+        chunk = chunk[columns].copy()
+        for column, expected_type in schema.items():
+            if expected_type is int:
+                chunk[column] = pd.to_numeric(chunk[column]).astype("Int64")
+            elif expected_type is float:
+                chunk[column] = pd.to_numeric(chunk[column])
+            elif expected_type is date:
+                chunk[column] = pd.to_datetime(chunk[column]).dt.strftime(ISO_DATE_FORMAT)
+            else:
+                values = chunk[column].astype(object)
+                chunk[column] = values.where(values.notna() & (values != ""), None)
+        yield chunk
+
+
+class BulkLoader(ABC):
+    """
+    Base class for star schema loaders. Subclasses provide the SQL types and the staged load.
+    """
+
+    sql_types: dict[type, str] = {}
+
+    def __init__(self, engine: Engine, chunk_size: int = 100_000):
+        self.engine = engine
+        self.chunk_size = chunk_size
+
+    def create_table(self, table: str, schema: SchemaType) -> None:
+        """
+        Creates the target table if it does not exist yet.
+        """
+        columns = ", ".join(f"{column} {self.sql_types[expected_type]}" for column, expected_type in schema.items())
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+
+    @abstractmethod
+    def load_chunks(self, table: str, schema: SchemaType, chunks: Iterator[pd.DataFrame]) -> int:
+        """
+        Replaces the contents of a table with the given chunks in a single transaction.
+        Returns:
+            int: Number of rows loaded
+        """
+
+    def load_table(self, table: str, path: Path, schema: SchemaType) -> dict:
+        """
+        Loads one transformed output into its table and measures throughput.
+        Args:
+            table (str): Database table name
+            path (Path): Transformed output file
+            schema (SchemaType): Table schema
+        Returns:
+            dict: rows, seconds and rows_per_sec for the table
+        """
+        self.create_table(table, schema)
+        start = time.perf_counter()
+        rows = self.load_chunks(table, schema, iter_load_chunks(path, schema, self.chunk_size))
+        seconds = time.perf_counter() - start
+        stats = {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else 0.0}
+        logging.info(f"Loaded {rows} rows into {table} in {seconds:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+        return stats
+
+    def load_star_schema(self, tables: list[str] | None = None, source_dir: Path = TRANSFORMED_DATA_DIR) -> dict[str, dict]:
+        """
+        Loads the transformed outputs of every star schema table, dimensions first.
+        Args:
+            tables (list[str], optional): Subset of STAR_SCHEMA tables to load
+            source_dir (Path): Directory holding the transformed outputs
+        Returns:
+            dict[str, dict]: Load statistics per table
+        """
+        results = {}
+        for table, (output_name, schema) in STAR_SCHEMA.items():
+            if tables is not None and table not in tables:
+                continue
+            path = find_output(source_dir, output_name)
+            results[table] = self.load_table(table, path, schema)
+        return results
+
+
+class PostgresBulkLoader(BulkLoader):
+    """
+    Loads tables with COPY FROM STDIN into a temporary staging table.
+    """
+
+    sql_types = {int: "BIGINT", float: "DOUBLE PRECISION", str: "TEXT", date: "DATE"}
+
+    @classmethod
+    def from_settings(cls, pool_size: int = 5, chunk_size: int = 100_000) -> "PostgresBulkLoader":
+        """
+        Builds a loader on a pooled engine for the database configured in config.settings.
+        """
+        from sqlalchemy import create_engine
+
+        engine = create_engine(get_connection_url(), pool_size=pool_size, max_overflow=pool_size, pool_pre_ping=True)
+        return cls(engine, chunk_size)
+
+    def load_chunks(self, table: str, schema: SchemaType, chunks: Iterator[pd.DataFrame]) -> int:
+        columns = ", ".join(schema)
+        stage = f"{table}_stage"
+        rows = 0
+
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"CREATE TEMP TABLE {stage} (LIKE {table}) ON COMMIT DROP")
+                for chunk in chunks:
+                    buffer = io.StringIO()
+                    chunk.to_csv(buffer, index=False, header=False)
+                    buffer.seek(0)
+                    cursor.copy_expert(f"COPY {stage} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+                    rows += len(chunk)
+                cursor.execute(f"TRUNCATE {table}")
+                cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return rows
+
+
+class SQLiteBulkLoader(BulkLoader):
+    """
+    Same staged, one-transaction-per-table load for SQLite, using executemany instead of COPY.
+    """
+
+    sql_types = {int: "INTEGER", float: "REAL", str: "TEXT", date: "TEXT"}
+
+    @classmethod
+    def from_path(cls, path: str | Path, chunk_size: int = 100_000) -> "SQLiteBulkLoader":
+        """
+        Builds a loader for a SQLite database file.
+        """
+        from sqlalchemy import create_engine
+
+        return cls(create_engine(f"sqlite:///{path}"), chunk_size)
+
+    def load_chunks(self, table: str, schema: SchemaType, chunks: Iterator[pd.DataFrame]) -> int:
+        columns = ", ".join(schema)
+        placeholders = ", ".join("?" for _ in schema)
+        stage = f"{table}_stage"
+        rows = 0
+
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS temp.{stage}")
+            cursor.execute(f"CREATE TEMP TABLE {stage} AS SELECT {columns} FROM {table} WHERE 0")
+            for chunk in chunks:
+                records = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+                cursor.executemany(f"INSERT INTO {stage} ({columns}) VALUES ({placeholders})", records)
+                rows += len(chunk)
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage}")
+            cursor.execute(f"DROP TABLE temp.{stage}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return rows
@@ -0,0 +1,110 @@
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from config.logger import script_logging
+from etl.benchmark import (SCALE_FACTORS, STARTUP_BUDGET_SECONDS, STARTUP_MODULES, find_regressions, measure_startup,
+                           read_results, run_benchmark, write_results)
+
+"""
+Runs the stage benchmarks of etl/benchmark.py at one or more scale factors, writes the results
+to JSON and fails (exit status 1) when a stage's rows/sec regressed past the threshold against
+the stored baseline.
+
+With --startup, only the import time of the CLI entry points is measured instead, failing when
+one of them exceeds the startup budget.
+
+Run from the project root using:
+    python -m scripts.benchmark [--scales 1 10 100] [--baseline PATH] [--threshold 0.25] [--update-baseline]
+    python -m scripts.benchmark --startup [--startup-budget 1.0]
+"""
+
+DEFAULT_OUTPUT = Path("benchmarks/results.json")
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+
+
+def main(scales: list[float], output: Path = DEFAULT_OUTPUT, baseline: Path = DEFAULT_BASELINE,
+         threshold: float = 0.25, update_baseline: bool = False, engine: str | None = None,
+         fmt: str | None = None, workdir: Path | None = None) -> int:
+    """
+    Benchmarks every scale factor and checks the results against the baseline.
+    Args:
+        scales (list[float]): Multiples of the default row counts
+        output (Path): JSON file for the results
+        baseline (Path): Stored baseline results
+        threshold (float): Allowed relative drop in rows/sec per stage
+        update_baseline (bool): Store the results as the new baseline instead of comparing
+        engine (str, optional): Ingest engine, defaults to ETL_INGEST_ENGINE
+        fmt (str, optional): Output format, defaults to ETL_OUTPUT_FORMAT
+        workdir (Path, optional): Scratch directory, defaults to a temporary directory
+    Returns:
+        int: Exit status, 1 when a stage regressed
+    """
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"etl-benchmark-x{scale}-", dir=workdir) as scratch:
+            results.extend(run_benchmark(scale, Path(scratch), engine, fmt))
+
+    metadata = {"scales": scales, "engine": engine, "format": fmt}
+    write_results(output, results, **metadata)
+    logging.info(f"Wrote {len(results)} stage results to {output}")
+
+    if update_baseline:
+        write_results(baseline, results, **metadata)
+        logging.info(f"Stored results as the baseline in {baseline}")
+        return 0
+    if not baseline.exists():
+        logging.warning(f"No baseline at {baseline}; run with --update-baseline to store one")
+        return 0
+
+    regressions = find_regressions(results, read_results(baseline), threshold)
+    for regression in regressions:
+        logging.error(f"Regression: {regression}")
+    if regressions:
+        return 1
+    logging.info(f"No stage regressed by more than {threshold:.0%} against {baseline}")
+    return 0
+
+
+def check_startup(budget: float = STARTUP_BUDGET_SECONDS) -> int:
+    """
+    Times the import of every CLI entry point against the startup budget.
+    Args:
+        budget (float): Seconds each import may take
+    Returns:
+        int: Exit status, 1 when an import exceeded the budget
+    """
+    status = 0
+    for module in STARTUP_MODULES:
+        result = measure_startup(module)
+        slowest = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in result["slowest_imports"].items())
+        logging.info(f"Startup {module}: {result['seconds']:.3f}s (slowest imports: {slowest})")
+        if result["seconds"] > budget:
+            logging.error(f"Startup regression: importing {module} took {result['seconds']:.3f}s, "
+                          f"budget {budget:.3f}s")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage at several scale factors")
+    parser.add_argument("--scales", type=float, nargs="+", default=list(SCALE_FACTORS),
+                        help="Multiples of the default row counts")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Results JSON file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed rows/sec drop per stage")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--engine", choices=["pandas", "arrow"], help="Ingest engine")
+    parser.add_argument("--format", choices=["csv", "parquet", "feather"], help="Output format")
+    parser.add_argument("--workdir", type=Path, help="Directory for scratch files")
+    parser.add_argument("--startup", action="store_true", help="Only check the import time of the entry points")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="Seconds each entry point import may take")
+    args = parser.parse_args()
+    with script_logging():
+        if args.startup:
+            sys.exit(check_startup(args.startup_budget))
+        sys.exit(main(args.scales, args.output, args.baseline, args.threshold, args.update_baseline,
+                      args.engine, args.format, args.workdir))
@@ -0,0 +1,39 @@
+import argparse
+import logging
+from pathlib import Path
+from config.logger import script_logging
+from etl.marts import MARTS, update_marts
+from etl.metrics import track_run
+
+"""
+Updates the claims aggregate marts (data/marts/gen-*/*.parquet, the generation named by
+data/marts/CURRENT) from the transformed claims_fact output, aggregating only the claims that
+arrived since the last update (see etl/marts.py).
+
+Run from the project root, after the transforms, using:
+    python -m scripts.build_marts [--rebuild] [--claims PATH ...]
+"""
+
+
+@track_run("marts")
+def main(paths: list[Path] | None = None, rebuild: bool = False) -> int:
+    """
+    Folds new claims into every mart, rebuilding the marts when aggregated claims changed.
+    Args:
+        paths (list[Path], optional): Claims fact files holding the new claims, defaults to the claims_fact output
+        rebuild (bool): Recompute every mart from all claims
+    Returns:
+        int: Number of newly aggregated claims
+    """
+    new_claims = update_marts(paths, rebuild)
+    logging.info(f"Marts up to date: {', '.join(MARTS)}")
+    return new_claims
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the claims aggregate marts")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the marts from all claims")
+    parser.add_argument("--claims", type=Path, nargs="+", help="Claims fact files holding the new claims")
+    args = parser.parse_args()
+    with script_logging():
+        main(args.claims, args.rebuild)
@@ -1,7 +1,11 @@
+import argparse
 import csv
 import random
-from faker import Faker
+from functools import partial
 from pathlib import Path
+import numpy as np
+from config.logger import script_logging
+from etl.generation import LazyFaker, choice, corruption_masks, faker_pool, replace_where, write_sharded
 from etl.schema_definition import adjusters_schema
 
 """
@@ -11,30 +15,42 @@ Outputs:
 - adjusters_clean.csv
 - adjusters_messy.csv
 
+With --pooled, names are drawn from a pre-sampled Faker pool with vectorized draws and rows are
+generated in fixed-size shards across --workers processes (see etl/generation.py); the output
+depends only on --seed and the row counts.
+
 Run from the project root using:
-    python -m scripts.generate_adjusters
+    python -m scripts.generate_adjusters [--pooled] [--rows N] [--messy-rows N] [--seed S] [--workers N]
 """
 
 random.seed(42)
-Faker.seed(42)
-
-fake = Faker()
+fake = LazyFaker(42)
 output_dir = Path("data/raw")
-output_dir.mkdir(parents=True, exist_ok=True)
 
 columns = list(adjusters_schema.keys())
 
+REGIONS = ["Northeast", "Southeast", "Midwest", "Southwest", "West"]
+CORRUPTIONS = [
+    "missing_name",
+    "invalid_region",
+    "non_numeric_id",
+    "extra_column",
+    "extra_whitespace",
+    "region_case_sensitivity",
+]
+
 
 def generate_clean_adjuster(adjuster_id: int) -> dict:
     return {
         "adjuster_id": adjuster_id,
         "name": fake.name(),
-        "region": random.choice(["Northeast", "Southeast", "Midwest", "Southwest", "West"]),
+        "region": random.choice(REGIONS),
         "team_lead_id": random.randint(1, 10),
     }
 
 
 def write_clean_adjusters(num_rows: int) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
     file_path = output_dir / "adjusters_clean.csv"
     with open(file_path, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=columns)
@@ -45,14 +61,7 @@ def write_clean_adjusters(num_rows: int) -> None:
 
 def generate_messy_adjuster(adjuster_id: int) -> dict:
     row = generate_clean_adjuster(adjuster_id)
-    corruption_type = random.choice([
-        "missing_name",
-        "invalid_region",
-        "non_numeric_id",
-        "extra_column",
-        "extra_whitespace",
-        "region_case_sensitivity",
-    ])
+    corruption_type = random.choice(CORRUPTIONS)
 
     if corruption_type == "missing_name":
         row["name"] = ""
@@ -77,6 +86,7 @@ def generate_messy_adjuster(adjuster_id: int) -> dict:
 
 def write_messy_adjusters(num_rows: int) -> None:
     all_columns = columns + ["team_notes"]  # for extra column
+    output_dir.mkdir(parents=True, exist_ok=True)
     file_path = output_dir / "adjusters_messy.csv"
     with open(file_path, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=all_columns, extrasaction="ignore")
@@ -85,6 +95,57 @@ def write_messy_adjusters(num_rows: int) -> None:
             writer.writerow(generate_messy_adjuster(i))
 
 
+def generate_adjusters_block(rng: np.random.Generator, first_id: int, num_rows: int, messy: bool = False,
+                             seed: int = 42):
+    """
+    Generates a block of adjusters from a pre-sampled Faker name pool, one vectorized draw per column.
+    Messy rows get the same corruption mix as generate_messy_adjuster.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    block = {
+        "adjuster_id": pa.array(np.arange(first_id, first_id + num_rows, dtype=np.int64)),
+        "name": choice(rng, faker_pool(seed, "name"), num_rows),
+        "region": choice(rng, REGIONS, num_rows),
+        "team_lead_id": pa.array(rng.integers(1, 11, num_rows)),
+    }
+    if not messy:
+        return pa.table(block)
+
+    hit = corruption_masks(rng, CORRUPTIONS, num_rows)
+    padded = pc.binary_join_element_wise(block["name"], pa.scalar("    "), "")
+    block["name"] = pc.if_else(pa.array(hit["extra_whitespace"]), padded, block["name"])
+    block["name"] = replace_where(block["name"], hit["missing_name"], None)
+    block["region"] = replace_where(block["region"], hit["invalid_region"], "Atlantis")
+    block["region"] = replace_where(block["region"], hit["region_case_sensitivity"], "northeast")
+    block["adjuster_id"] = replace_where(block["adjuster_id"], hit["non_numeric_id"], "A-XYZ")
+    block["team_notes"] = replace_where(pa.nulls(num_rows, pa.string()), hit["extra_column"], "Temp contract")
+    return pa.table(block)
+
+
+def write_adjusters_pooled(num_rows: int, messy: bool = False, seed: int = 42, workers: int = 1) -> Path:
+    """
+    Writes clean or messy adjusters in pooled mode, sharded across worker processes.
+    """
+    block = partial(generate_adjusters_block, messy=messy, seed=seed)
+    table = "adjusters_messy" if messy else "adjusters_clean"
+    return write_sharded(output_dir, table, block, num_rows, seed + messy, workers, fmt="csv")
+
+
 if __name__ == "__main__":
-    write_clean_adjusters(100)
-    write_messy_adjusters(30)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate clean and messy adjusters")
+    parser.add_argument("--pooled", action="store_true", help="Vectorized generation from a Faker name pool")
+    parser.add_argument("--rows", type=int, default=100, help="Clean rows to generate")
+    parser.add_argument("--messy-rows", type=int, default=30, help="Messy rows to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for pooled mode")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for pooled mode")
+    args = parser.parse_args()
+
+    with script_logging():
+        if args.pooled:
+            write_adjusters_pooled(args.rows, False, args.seed, args.workers)
+            write_adjusters_pooled(args.messy_rows, True, args.seed, args.workers)
+        else:
+            write_clean_adjusters(args.rows)
+            write_messy_adjusters(args.messy_rows)
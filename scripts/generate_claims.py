@@ -1,135 +1,157 @@
-import csv
-import random
-from faker import Faker
+import argparse
+import logging
+import time
+from functools import partial
 from pathlib import Path
+
+import numpy as np
+
+from config.logger import script_logging
+from etl.generation import corruption_masks, write_sharded
 from etl.schema_definition import claims_fact_schema
-import time
-import logging
 
 """
 Generates clean and messy insurance claims for the ETL pipeline simulation.
+
+Columns are drawn a block at a time with a seeded numpy.random.Generator and written in large
+blocks through the pyarrow CSV/Parquet writers, so hundreds of millions of rows can be generated
+for load tests. Messy rows get one corruption each, chosen uniformly from CORRUPTIONS and
+applied with boolean masks.
+
+Blocks are the fixed-size shards of etl.generation: each uses its own generator seeded with
+(seed, block number) and may run in a worker process, so the output is reproducible for a given
+seed and block size whatever the number of workers.
+
 Outputs:
-- claims_clean.csv
-- claims_messy.csv
+- claims_clean.csv (or .parquet)
+- claims_messy.csv (or .parquet)
 Run from the project root using:
-    python -m scripts.generate_claims
+    python -m scripts.generate_claims [--rows N] [--messy-rows N] [--seed S] [--format csv|parquet] [--workers N]
 """
 
-random.seed(42)
-fake=Faker()
-
-customer_ids = list(range(1, 801))
-policy_ids = list(range(1, 551))
-adjuster_ids = list(range(1, 101))
-date_ids = list(range(1, 366))
-statuses = ["Approved", "Denied", "Pending"]
+# Key ranges of the generated dimension tables (1..N)
+NUM_CUSTOMERS = 800
+NUM_POLICIES = 550
+NUM_ADJUSTERS = 100
+NUM_DATES = 365
+
+STATUSES = ["Approved", "Denied", "Pending"]
+
+# Messy row corruptions, injected in equal proportions
+CORRUPTIONS = [
+    "missing_amount",
+    "negative_amount",
+    "invalid_status",
+    "foreign_key_violation_customer",
+    "foreign_key_violation_policy",
+    "foreign_key_violation_date",
+    "foreign_key_violation_adjuster",
+    "extra_column",
+]
 
 output_dir = Path("data/raw")
-output_dir.mkdir(parents=True, exist_ok=True)
 
 columns = list(claims_fact_schema.keys())
 
-def generate_clean_claim(claim_id: int) -> dict:
+
+def generate_claims_block(rng: np.random.Generator, first_id: int, num_rows: int, messy: bool = False):
     """
-    Generate a clean insurance claim record.
+    Generates a block of claims as an Arrow table, one vectorized draw per column.
     Args:
-        claim_id (int): Unique claim ID
+        rng (np.random.Generator): Seeded generator for this block
+        first_id (int): claim_id of the first row
+        num_rows (int): Number of rows to generate
+        messy (bool): Inject one corruption per row and add the notes column
     Returns:
-        dict: Clean claim data
+        pa.Table: Claims block with the claims_fact columns (plus notes when messy)
     """
-    return {
-        "claim_id": claim_id,
-        "customer_id": random.choice(customer_ids),
-        "policy_id": random.choice(policy_ids),
-        "adjuster_id": random.choice(adjuster_ids),
-        "date_id": random.choice(date_ids),
-        "amount": round(random.uniform(100.0, 10000.0), 2),
-        "status": random.choice(statuses),
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    block = {
+        "claim_id": np.arange(first_id, first_id + num_rows, dtype=np.int64),
+        "customer_id": rng.integers(1, NUM_CUSTOMERS + 1, num_rows),
+        "policy_id": rng.integers(1, NUM_POLICIES + 1, num_rows),
+        "date_id": rng.integers(1, NUM_DATES + 1, num_rows),
+        "adjuster_id": rng.integers(1, NUM_ADJUSTERS + 1, num_rows),
+        "amount": np.round(rng.uniform(100.0, 10000.0, num_rows), 2),
     }
+    status_codes = rng.integers(0, len(STATUSES), num_rows)
+    if not messy:
+        return pa.table({**block, "status": pc.take(pa.array(STATUSES), status_codes)})
+
+    hit = corruption_masks(rng, CORRUPTIONS, num_rows)
+
+    block["customer_id"][hit["foreign_key_violation_customer"]] = 999999  # unlikely to exist
+    block["policy_id"][hit["foreign_key_violation_policy"]] = 888888
+    block["date_id"][hit["foreign_key_violation_date"]] = 777777
+    block["adjuster_id"][hit["foreign_key_violation_adjuster"]] = 666666
+    block["amount"][hit["negative_amount"]] = -500.00
 
-def write_clean_claims(num_rows: int) -> None:
+    table = {column: pa.array(values) for column, values in block.items()}
+    table["amount"] = pa.array(block["amount"], mask=hit["missing_amount"])
+    status_codes[hit["invalid_status"]] = len(STATUSES)
+    table["status"] = pc.take(pa.array(STATUSES + ["In Progress"]), status_codes)
+    table["notes"] = pc.if_else(pa.array(hit["extra_column"]), "Urgent payout requested", pa.scalar(None, pa.string()))
+    return pa.table(table)
+
+
+def write_claims(table: str, num_rows: int, messy: bool = False, seed: int = 42, fmt: str = "csv",
+                 block_size: int = 1_000_000, workers: int = 1) -> Path:
+    """
+    Generates claims block by block and appends each block to the output file.
+    Args:
+        table (str): Output file name without suffix, e.g. 'claims_clean'
+        num_rows (int): Number of rows to generate
+        messy (bool): Generate corrupted rows
+        seed (int): Base seed; block i uses numpy.random.default_rng([seed, i])
+        fmt (str): Output format, 'csv' or 'parquet'
+        block_size (int): Rows per generated and written block
+        workers (int): Worker processes generating blocks
+    Returns:
+        Path: Written file
+    """
+    block = partial(generate_claims_block, messy=messy)
+    return write_sharded(output_dir, table, block, num_rows, seed, workers, block_size, claims_fact_schema, fmt)
+
+
+def write_clean_claims(num_rows: int, seed: int = 42, fmt: str = "csv", block_size: int = 1_000_000,
+                       workers: int = 1) -> Path:
     """
-    Write clean claims to CSV.
+    Write clean claims.
     Args:
         num_rows (int): Number of rows to generate
     """
-    filepath = output_dir / "claims_clean.csv"
-    with open(filepath, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
-        for i in range(1, num_rows + 1):
-            writer.writerow(generate_clean_claim(i))
-
-def generate_messy_claim(claim_id: int) -> dict:
+    return write_claims("claims_clean", num_rows, False, seed, fmt, block_size, workers)
+
+
+def write_messy_claims(num_rows: int, seed: int = 42, fmt: str = "csv", block_size: int = 1_000_000,
+                       workers: int = 1) -> Path:
     """
-        Generate a corrupted insurance claim for testing.
-        Args:
-            claim_id (int): Nominal claim ID
-        Returns:
-            dict: Messy claim row with injected error
-        """
-    row = generate_clean_claim(claim_id)
-    corruption_type = random.choice([
-        "missing_amount",
-        "negative_amount",
-        "invalid_status",
-        "foreign_key_violation_customer",
-        "foreign_key_violation_policy",
-        "foreign_key_violation_date",
-        "foreign_key_violation_adjuster",
-        "extra_column"
-    ])
-
-    if corruption_type == "missing_amount":
-        row["amount"] = ""
-
-    elif corruption_type == "negative_amount":
-        row["amount"] = -500.00
-
-    elif corruption_type == "invalid_status":
-        row["status"] = "In Progress"
-
-    elif corruption_type == "foreign_key_violation_customer":
-        row["customer_id"] = 999999  # unlikely to exist
-
-    elif corruption_type == "foreign_key_violation_policy":
-        row["policy_id"] = 888888
-
-    elif corruption_type == "foreign_key_violation_date":
-        row["date_id"] = 777777
-
-    elif corruption_type == "foreign_key_violation_adjuster":
-        row["adjuster_id"] = 666666
-
-    elif corruption_type == "extra_column":
-        row["notes"] = "Urgent payout requested"
-
-    return row
-
-def write_messy_claims(num_rows: int) -> None:
+    Write messy claims with intentional errors. Uses a different seed stream than the clean rows.
+    Args:
+        num_rows (int): Number of rows to generate
     """
-        Write messy claims to CSV with intentional errors.
-        Args:
-            num_rows (int): Number of rows to generate
-        """
-    all_columns = columns + ["notes"]
-    filepath = output_dir / "claims_messy.csv"
-    with open(filepath, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=all_columns, extrasaction="ignore")
-        writer.writeheader()
-        for i in range(1, num_rows + 1):
-            writer.writerow(generate_messy_claim(i))
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    return write_claims("claims_messy", num_rows, True, seed + 1, fmt, block_size, workers)
+
 
 if __name__ == "__main__":
-    t0 = time.perf_counter()
-    write_clean_claims(50000)
-    t1 = time.perf_counter()
-    logging.info(f"Clean claims generated in {t1 - t0:.2f} seconds")
-
-    t2 = time.perf_counter()
-    write_messy_claims(250)
-    t3 = time.perf_counter()
-    logging.info(f"Messy claims generated in {t3 - t2:.2f} seconds")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate clean and messy claims")
+    parser.add_argument("--rows", type=int, default=50000, help="Clean rows to generate")
+    parser.add_argument("--messy-rows", type=int, default=250, help="Messy rows to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--block-size", type=int, default=1_000_000, help="Rows per block")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes generating blocks")
+    args = parser.parse_args()
+
+    with script_logging():
+        t0 = time.perf_counter()
+        write_clean_claims(args.rows, args.seed, args.format, args.block_size, args.workers)
+        t1 = time.perf_counter()
+        logging.info(f"Clean claims generated in {t1 - t0:.2f} seconds ({args.rows / (t1 - t0):,.0f} rows/sec)")
+
+        t2 = time.perf_counter()
+        write_messy_claims(args.messy_rows, args.seed, args.format, args.block_size, args.workers)
+        t3 = time.perf_counter()
+        logging.info(f"Messy claims generated in {t3 - t2:.2f} seconds")
@@ -1,7 +1,12 @@
+import argparse
 import csv
 import random
-from faker import Faker
+from datetime import date
+from functools import partial
 from pathlib import Path
+import numpy as np
+from config.logger import script_logging
+from etl.generation import LazyFaker, choice, corruption_masks, faker_pool, iso_dates, random_dates, replace_where, write_sharded
 from etl.schema_definition import customers_schema
 
 """
@@ -11,16 +16,17 @@ Outputs:
 - customers_clean.csv: realistic, valid customer data
 - customers_messy.csv: includes corruptions for testing data cleaning and validation
 
+With --pooled, rows are composed from pre-sampled Faker pools with vectorized draws and generated
+in fixed-size shards across --workers processes (see etl/generation.py); the output depends only
+on --seed and the row counts.
+
 Run from the project root using:
-    python -m scripts.generate_customers
+    python -m scripts.generate_customers [--pooled] [--rows N] [--messy-rows N] [--seed S] [--workers N]
 """
 
 random.seed(42)
-Faker.seed(42)
-
-fake = Faker()
+fake = LazyFaker(42)
 output_dir = Path("data/raw")
-output_dir.mkdir(parents=True, exist_ok=True)
 
 columns = [
     "customer_id",
@@ -34,6 +40,17 @@ columns = [
     "risk_score"
 ]
 
+GENDERS = ["M", "F", "Other"]
+REGIONS = ["Northeast", "Southeast", "Midwest", "Southwest", "West"]
+CORRUPTIONS = [
+    "missing_value",
+    "invalid_format",
+    "extra_column",
+    "wrong_gender",
+    "duplicate_id",
+    "null_risk_score",
+]
+
 
 def generate_clean_customer(customer_id: int) -> dict:
     """
@@ -62,6 +79,7 @@ def write_clean_customers(num_rows: int) -> None:
     Args:
         num_rows (int): Number of rows to generate.
     """
+    output_dir.mkdir(parents=True, exist_ok=True)
     filepath = output_dir / "customers_clean.csv"
     with open(filepath, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=columns)
@@ -81,14 +99,7 @@ def generate_messy_customer(customer_id: int) -> dict:
         dict: A corrupted customer record.
     """
     row = generate_clean_customer(customer_id)
-    corruption_type = random.choice([
-        "missing_value",
-        "invalid_format",
-        "extra_column",
-        "wrong_gender",
-        "duplicate_id",
-        "null_risk_score",
-    ])
+    corruption_type = random.choice(CORRUPTIONS)
 
     if corruption_type == "missing_value":
         row["email"] = ""  # remove email
@@ -117,6 +128,7 @@ def write_messy_customers(num_rows: int) -> None:
     Args:
         num_rows (int): Number of rows to generate.
     """
+    output_dir.mkdir(parents=True, exist_ok=True)
     filepath = output_dir / "customers_messy.csv"
     all_columns = list(customers_schema.keys()) + ["notes"]  # handles extra column
     with open(filepath, mode="w", newline="") as f:
@@ -126,6 +138,77 @@ def write_messy_customers(num_rows: int) -> None:
             writer.writerow(generate_messy_customer(i))
 
 
+def generate_customers_block(rng: np.random.Generator, first_id: int, num_rows: int, messy: bool = False,
+                             seed: int = 42, reference_date: date | None = None):
+    """
+    Generates a block of customers from pre-sampled Faker pools, one vectorized draw per column.
+    Args:
+        rng (np.random.Generator): Seeded generator for this block
+        first_id (int): customer_id of the first row
+        num_rows (int): Number of rows to generate
+        messy (bool): Inject one corruption per row (same mix as generate_messy_customer)
+        seed (int): Seed of the Faker pools
+        reference_date (date, optional): 'Today' for birth dates, defaults to date.today()
+    Returns:
+        pa.Table: Customer records
+    """
+    import pyarrow as pa
+
+    today = np.datetime64(reference_date or date.today(), "D")
+    oldest, youngest = today - np.timedelta64(80 * 365, "D"), today - np.timedelta64(18 * 365, "D")
+    block = {
+        "customer_id": pa.array(np.arange(first_id, first_id + num_rows, dtype=np.int64)),
+        "first_name": choice(rng, faker_pool(seed, "first_name"), num_rows),
+        "last_name": choice(rng, faker_pool(seed, "last_name"), num_rows),
+        "birth_date": iso_dates(random_dates(rng, oldest, youngest, num_rows)),
+        "gender": choice(rng, GENDERS, num_rows),
+        "email": choice(rng, faker_pool(seed, "email"), num_rows),
+        "phone_number": choice(rng, faker_pool(seed, "phone_number"), num_rows),
+        "region": choice(rng, REGIONS, num_rows),
+        "risk_score": pa.array(np.round(rng.uniform(1.0, 5.0, num_rows), 2)),
+    }
+    if not messy:
+        return pa.table(block)
+
+    hit = corruption_masks(rng, CORRUPTIONS, num_rows)
+    block["email"] = replace_where(block["email"], hit["missing_value"], None)
+    block["birth_date"] = replace_where(block["birth_date"], hit["invalid_format"], "April 18th, 1992")
+    block["gender"] = replace_where(block["gender"], hit["wrong_gender"], "X")
+    block["customer_id"] = replace_where(block["customer_id"], hit["duplicate_id"], 1)
+    block["risk_score"] = replace_where(block["risk_score"], hit["null_risk_score"], None)
+    block["notes"] = replace_where(pa.nulls(num_rows, pa.string()), hit["extra_column"], "Preferred customer")
+    return pa.table(block)
+
+
+def write_customers_pooled(num_rows: int, messy: bool = False, seed: int = 42, workers: int = 1,
+                           reference_date: date | None = None) -> Path:
+    """
+    Writes clean or messy customers in pooled mode, sharded across worker processes.
+    Args:
+        num_rows (int): Number of rows to generate.
+        messy (bool): Write customers_messy.csv instead of customers_clean.csv.
+        seed (int): Seed of the Faker pools and of the shard generators.
+        workers (int): Worker processes.
+        reference_date (date, optional): 'Today' for birth dates, defaults to date.today().
+    """
+    block = partial(generate_customers_block, messy=messy, seed=seed, reference_date=reference_date or date.today())
+    table = "customers_messy" if messy else "customers_clean"
+    return write_sharded(output_dir, table, block, num_rows, seed + messy, workers, fmt="csv")
+
+
 if __name__ == "__main__":
-    write_clean_customers(800)
-    write_messy_customers(200)
+    parser = argparse.ArgumentParser(description="Generate clean and messy customers")
+    parser.add_argument("--pooled", action="store_true", help="Vectorized generation from Faker pools")
+    parser.add_argument("--rows", type=int, default=800, help="Clean rows to generate")
+    parser.add_argument("--messy-rows", type=int, default=200, help="Messy rows to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for pooled mode")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for pooled mode")
+    args = parser.parse_args()
+
+    with script_logging():
+        if args.pooled:
+            write_customers_pooled(args.rows, False, args.seed, args.workers)
+            write_customers_pooled(args.messy_rows, True, args.seed, args.workers)
+        else:
+            write_clean_customers(args.rows)
+            write_messy_customers(args.messy_rows)
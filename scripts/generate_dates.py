@@ -1,6 +1,9 @@
+import calendar
 import csv
 from datetime import datetime, timedelta
 from pathlib import Path
+import numpy as np
+from config.logger import script_logging
 from etl.schema_definition import dates_schema
 
 """
@@ -15,7 +18,6 @@ Run from the project root using:
 """
 
 output_dir = Path("data/raw")
-output_dir.mkdir(parents=True, exist_ok=True)
 
 columns = list(dates_schema.keys())
 
@@ -47,6 +49,7 @@ def write_clean_dates() -> None:
     """
     Writes a clean CSV file of 365 valid date records.
     """
+    output_dir.mkdir(parents=True, exist_ok=True)
     file_path = output_dir / "dates_clean.csv"
     records = generate_clean_dates(datetime(2023, 1, 1), 365)
     with open(file_path, "w", newline="") as f:
@@ -96,6 +99,7 @@ def write_messy_dates() -> None:
     """
     Writes a messy CSV file with 100 intentionally corrupted date records.
     """
+    output_dir.mkdir(parents=True, exist_ok=True)
     file_path = output_dir / "dates_messy.csv"
     all_columns = columns + ["extra_column"]
     start_date = datetime(2023, 1, 1)
@@ -108,6 +112,50 @@ def write_messy_dates() -> None:
             writer.writerow(generate_messy_date(i, base_date))
 
 
+def generate_dates_block(rng: np.random.Generator, first_id: int, num_rows: int, messy: bool = False,
+                         start_date: datetime = datetime(2023, 1, 1)):
+    """
+    Vectorized equivalent of generate_clean_dates / generate_messy_date for a range of date_ids,
+    with the same rotating corruptions. Takes a generator for interface parity with the other
+    block generators (see etl/generation.py); dates are fully determined by their date_id.
+    Args:
+        rng (np.random.Generator): Unused
+        first_id (int): date_id of the first row
+        num_rows (int): Number of rows to generate
+        messy (bool): Apply the corruption selected by date_id % 6
+        start_date (datetime): Date of date_id 1 (messy rows are shifted by one day, as in write_messy_dates)
+    Returns:
+        pa.Table: Date records
+    """
+    import pyarrow as pa
+
+    date_ids = np.arange(first_id, first_id + num_rows, dtype=np.int64)
+    days = np.datetime64(start_date.date(), "D") + (date_ids if messy else date_ids - 1).astype("timedelta64[D]")
+    months = days.astype("datetime64[M]").astype(int) % 12 + 1
+    weekdays = (days.astype(int) + 3) % 7  # 1970-01-01 was a Thursday; Monday is 0
+    block = {
+        "date_id": pa.array(date_ids),
+        "day": pa.array((days - days.astype("datetime64[M]")).astype(int) + 1),
+        "month": pa.array(np.array(calendar.month_name)[months]),
+        "year": pa.array(days.astype("datetime64[Y]").astype(int) + 1970),
+        "quarter": pa.array(np.char.add("Q", ((months - 1) // 3 + 1).astype(str))),
+        "weekday": pa.array(np.array(calendar.day_name)[weekdays]),
+    }
+    if not messy:
+        return pa.table(block)
+
+    corruption = date_ids % 6  # Rotate between types
+    month = np.array(calendar.month_name)[months]
+    month = np.where(corruption == 0, "07", np.where(corruption == 5, np.char.lower(month.astype(str)), month))
+    block["month"] = pa.array(month)
+    block["quarter"] = pa.array(np.where(corruption == 1, "Q5", np.array(block["quarter"])))
+    block["weekday"] = pa.array(np.where(corruption == 2, "Fridday", np.array(block["weekday"])))
+    block["day"] = pa.array(np.array(block["day"]), mask=corruption == 3)
+    block["extra_column"] = pa.array(np.where(corruption == 4, "calendar glitch", None))
+    return pa.table(block)
+
+
 if __name__ == "__main__":
-    write_clean_dates()
-    write_messy_dates()
\ No newline at end of file
+    with script_logging():
+        write_clean_dates()
+        write_messy_dates()
@@ -1,8 +1,12 @@
+import argparse
 import csv
 import random
-from faker import Faker
 from pathlib import Path
-from datetime import timedelta
+from datetime import date, timedelta
+from functools import partial
+import numpy as np
+from config.logger import script_logging
+from etl.generation import LazyFaker, choice, corruption_masks, iso_dates, random_dates, replace_where, write_sharded
 from etl.schema_definition import policies_schema
 
 """
@@ -12,15 +16,15 @@ Outputs:
 - policies_clean.csv: realistic, valid customer data
 - policies_messy.csv: includes corruptions for testing data cleaning and validation
 
+With --pooled, rows are composed with vectorized draws and generated in fixed-size shards across
+--workers processes (see etl/generation.py); the output depends only on --seed and the row counts.
+
 Run from the project root using:
-    python -m scripts.generate_policies
+    python -m scripts.generate_policies [--pooled] [--rows N] [--messy-rows N] [--seed S] [--workers N]
 """
 random.seed(42)
-Faker.seed(42)
-
-fake = Faker()
+fake = LazyFaker(42)
 output_dir = Path("data/raw")
-output_dir.mkdir(parents=True, exist_ok=True)
 
 columns = [
     "policy_id",
@@ -30,6 +34,16 @@ columns = [
     "premium",
 ]
 
+POLICY_TYPES = ["life", "auto", "house", "travel", "health", "pet"]
+CORRUPTIONS = [
+    "missing_value",
+    "invalid_date_format",
+    "extra_column",
+    "end_before_start_date",
+    "non_numeric_premium",
+    "unknown_policy_type",
+]
+
 def generate_clean_policy(policy_id: int) -> dict:
     """
     Generates a single valid policy record using Faker.
@@ -43,7 +57,7 @@ def generate_clean_policy(policy_id: int) -> dict:
 
     return {
         "policy_id": policy_id,
-        "policy_type": random.choice(["life", "auto", "house", "travel", "health", "pet"]),
+        "policy_type": random.choice(POLICY_TYPES),
         "start_date": start_date_obj.isoformat(),
         "end_date": end_date_obj.isoformat(),
         "premium": round(random.uniform(40.0, 300.0), 2),
@@ -56,6 +70,7 @@ def write_clean_policies(num_rows: int) -> None:
         num_rows (int): Number of rows to generate.
     """
 
+    output_dir.mkdir(parents=True, exist_ok=True)
     file_path = output_dir / "policies_clean.csv"
     with open(file_path, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=columns)
@@ -75,14 +90,7 @@ def generate_messy_policy(policy_id: int) -> dict:
     """
 
     row = generate_clean_policy(policy_id)
-    corruption_type = random.choice([
-        "missing_value",
-        "invalid_date_format",
-        "extra_column",
-        "end_before_start_date",
-        "non_numeric_premium",
-        "unknown_policy_type",
-    ])
+    corruption_type = random.choice(CORRUPTIONS)
 
     start_date_obj = fake.date_between(start_date='-3y', end_date='today')
     end_date_obj = start_date_obj + timedelta(days=random.randint(90, 1095))
@@ -115,6 +123,7 @@ def write_messy_policies(num_rows: int) -> None:
         num_rows (int): Number of rows to generate.
     """
 
+    output_dir.mkdir(parents=True, exist_ok=True)
     file_path = output_dir / "policies_messy.csv"
     all_columns = list(policies_schema.keys()) + ["notes"]  # handles extra column
     with open(file_path, "w", newline="") as f:
@@ -123,6 +132,75 @@ def write_messy_policies(num_rows: int) -> None:
         for i in range(1, num_rows + 1):
             writer.writerow(generate_messy_policy(i))
 
+def generate_policies_block(rng: np.random.Generator, first_id: int, num_rows: int, messy: bool = False,
+                            reference_date: date | None = None):
+    """
+    Generates a block of policies with one vectorized draw per column.
+    Args:
+        rng (np.random.Generator): Seeded generator for this block
+        first_id (int): policy_id of the first row
+        num_rows (int): Number of rows to generate
+        messy (bool): Inject one corruption per row (same mix as generate_messy_policy)
+        reference_date (date, optional): 'Today' for start dates, defaults to date.today()
+    Returns:
+        pa.Table: Policy records
+    """
+    import pyarrow as pa
+
+    today = np.datetime64(reference_date or date.today(), "D")
+    three_years_ago = today - np.timedelta64(3 * 365, "D")
+    start = random_dates(rng, three_years_ago, today, num_rows)
+    end = start + rng.integers(90, 1096, num_rows).astype("timedelta64[D]")
+    block = {
+        "policy_id": pa.array(np.arange(first_id, first_id + num_rows, dtype=np.int64)),
+        "policy_type": choice(rng, POLICY_TYPES, num_rows),
+        "start_date": iso_dates(start),
+        "end_date": iso_dates(end),
+        "premium": pa.array(np.round(rng.uniform(40.0, 300.0, num_rows), 2)),
+    }
+    if not messy:
+        return pa.table(block)
+
+    hit = corruption_masks(rng, CORRUPTIONS, num_rows)
+    swapped = hit["end_before_start_date"]
+    block["start_date"] = iso_dates(np.where(swapped, end, start))
+    block["end_date"] = iso_dates(np.where(swapped, start, end))
+    block["policy_type"] = replace_where(block["policy_type"], hit["missing_value"], None)
+    block["policy_type"] = replace_where(block["policy_type"], hit["unknown_policy_type"], "magic")
+    block["start_date"] = replace_where(block["start_date"], hit["invalid_date_format"], "March 15, 2022")
+    block["premium"] = replace_where(block["premium"], hit["non_numeric_premium"], "discount")
+    block["notes"] = replace_where(pa.nulls(num_rows, pa.string()), hit["extra_column"], "Loyal customer")
+    return pa.table(block)
+
+
+def write_policies_pooled(num_rows: int, messy: bool = False, seed: int = 42, workers: int = 1,
+                          reference_date: date | None = None) -> Path:
+    """
+    Writes clean or messy policies in vectorized mode, sharded across worker processes.
+    Args:
+        num_rows (int): Number of rows to generate.
+        messy (bool): Write policies_messy.csv instead of policies_clean.csv.
+        seed (int): Seed of the shard generators.
+        workers (int): Worker processes.
+        reference_date (date, optional): 'Today' for start dates, defaults to date.today().
+    """
+    block = partial(generate_policies_block, messy=messy, reference_date=reference_date or date.today())
+    table = "policies_messy" if messy else "policies_clean"
+    return write_sharded(output_dir, table, block, num_rows, seed + messy, workers, fmt="csv")
+
 if __name__ == "__main__":
-    write_clean_policies(400)
-    write_messy_policies(150)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate clean and messy policies")
+    parser.add_argument("--pooled", action="store_true", help="Vectorized, sharded generation")
+    parser.add_argument("--rows", type=int, default=400, help="Clean rows to generate")
+    parser.add_argument("--messy-rows", type=int, default=150, help="Messy rows to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for pooled mode")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for pooled mode")
+    args = parser.parse_args()
+
+    with script_logging():
+        if args.pooled:
+            write_policies_pooled(args.rows, False, args.seed, args.workers)
+            write_policies_pooled(args.messy_rows, True, args.seed, args.workers)
+        else:
+            write_clean_policies(args.rows)
+            write_messy_policies(args.messy_rows)
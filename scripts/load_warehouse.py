@@ -0,0 +1,36 @@
+import argparse
+from config.logger import script_logging
+from etl.warehouse.bulk_load import PostgresBulkLoader, SQLiteBulkLoader
+
+"""
+Bulk-loads the transformed star schema (data/transformed/) into the warehouse database.
+
+Run from the project root using:
+    python -m scripts.load_warehouse                       # PostgreSQL from config/settings.py
+    python -m scripts.load_warehouse --sqlite data/etl.db  # local SQLite file
+"""
+
+
+def main(sqlite_path: str | None = None, tables: list[str] | None = None) -> dict[str, dict]:
+    """
+    Loads every transformed table and logs rows/sec per table.
+    Args:
+        sqlite_path (str, optional): Load into this SQLite file instead of PostgreSQL
+        tables (list[str], optional): Subset of tables to load
+    Returns:
+        dict[str, dict]: Load statistics per table
+    """
+    loader = SQLiteBulkLoader.from_path(sqlite_path) if sqlite_path else PostgresBulkLoader.from_settings()
+    try:
+        return loader.load_star_schema(tables)
+    finally:
+        loader.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load the transformed star schema")
+    parser.add_argument("--sqlite", help="Path of a SQLite database to load instead of PostgreSQL")
+    parser.add_argument("--tables", nargs="+", help="Tables to load, e.g. customers_dim claims_fact")
+    args = parser.parse_args()
+    with script_logging():
+        main(args.sqlite, args.tables)
@@ -1,29 +1,51 @@
-import logging
-from etl.utils.load import load_raw_table
-from etl.schema_definition import adjusters_schema
+import argparse
+from config.logger import script_logging
+from config.settings import ETL_CHUNK_SIZE
+from etl.metrics import track_run
+from etl.profiling import add_profile_argument, profiled, run_directory
+from etl.sources import SOURCE_BATCH_SIZE, RawSource
+from etl.schema_definition import adjusters_schema, constraints, primary_keys
+from etl.validation.rejections import RuleCodes
 from etl.transform_base import (
-    clean_dataframe,
+    load_raw_data,
+    clean_adjusters,
     split_valid_invalid,
     save_transformed_data,
     save_rejected_data,
+    transform_in_chunks,
 )
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-def main():
+@track_run("adjusters")
+def main(chunk_size: int = ETL_CHUNK_SIZE, source: RawSource | None = None):
     """
     ETL transform script for adjusters data.
     Loads raw data, cleans it, validates against schema, and saves outputs.
+    Args:
+        chunk_size (int): Rows per chunk for streaming mode; 0 loads the whole table
+        source (RawSource, optional): Stream raw batches from this source (see etl.sources) instead of data/raw/
     """
     table = "adjusters"
-    raw_df = load_raw_table(table)
+    rules = constraints["adjusters_dim"]
+    primary_key = primary_keys["adjusters_dim"]
+    if chunk_size or source is not None:
+        transform_in_chunks(table, adjusters_schema, clean_adjusters, chunk_size or SOURCE_BATCH_SIZE,
+                            rules=rules, source=source, primary_key=primary_key)
+        return
 
-    cleaned_df = clean_dataframe(raw_df)
-    valid_df, invalid_df = split_valid_invalid(cleaned_df, adjusters_schema)
+    raw_df, parse_errors = load_raw_data(table, adjusters_schema)
 
-    save_transformed_data(valid_df, table)
-    if not invalid_df.empty:
-        save_rejected_data(invalid_df, table)
+    cleaned_df = clean_adjusters(raw_df)
+    codes = RuleCodes.for_table(adjusters_schema, rules, primary_key=primary_key)
+    valid_df, invalid_df = split_valid_invalid(cleaned_df, adjusters_schema, table, parse_errors=parse_errors,
+                                               rules=rules, codes=codes, primary_key=primary_key)
+
+    save_transformed_data(valid_df, table, adjusters_schema)
+    save_rejected_data(invalid_df, table, codes)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Transform the adjusters table")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    with script_logging(), profiled("adjusters", run_directory(args.profile)):
+        main()
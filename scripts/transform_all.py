@@ -1,17 +1,173 @@
-from scripts import (
-    transform_customers,
-    transform_policies,
-    transform_dates,
-    transform_adjusters,
-    transform_claims
-)
-
-def main():
-    transform_customers.main()
-    transform_policies.main()
-    transform_dates.main()
-    transform_adjusters.main()
-    transform_claims.main()
+import argparse
+import importlib
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from config.logger import pool_logging_options, script_logging
+from config.settings import ETL_REJECTED_COMPRESSION
+from etl.manifest import is_up_to_date, load_manifest, record_run, save_manifest, table_fingerprint
+from etl.profiling import add_profile_argument, profiled, run_directory, summarize_runs
+from etl.schema_definition import constraints, primary_keys, schemas
+from etl.utils.output_formats import output_path
+from etl.utils.paths import REJECTED_DATA_DIR, TRANSFORMED_DATA_DIR
+
+"""
+Runs every table transform as a small DAG: the dimension transforms are independent and run
+concurrently in a process pool, and claims starts as soon as all of its dimensions are done.
+
+With --incremental, tables whose raw inputs, schema, output settings and upstream tables are
+unchanged since the last run (see etl/manifest.py) are skipped and their previous outputs reused.
+
+With ETL_LOG_MODE=queue, the workers forward their log records to a single listener thread in
+this process (see script_logging in config/logger.py), so their output is neither interleaved
+nor written under lock.
+
+With --profile, every table's stages are profiled into one run directory (see etl/profiling.py),
+which also gets a summary.txt of the hottest functions across all tables.
+
+Run from the project root using:
+    python -m scripts.transform_all [--incremental] [--workers N] [--profile [DIR]]
+"""
+
+# table -> tables whose transform must finish first
+DEPENDENCIES = {
+    "customers": [],
+    "policies": [],
+    "dates": [],
+    "adjusters": [],
+    "claims": ["customers", "policies", "dates", "adjusters"],
+}
+
+# table -> (schema name in etl.schema_definition.schemas, output file name)
+TABLES = {
+    "customers": ("customers_dim", "customers"),
+    "policies": ("policies_dim", "policies"),
+    "dates": ("dates_dim", "dates"),
+    "adjusters": ("adjusters_dim", "adjusters"),
+    "claims": ("claims_fact", "claims_fact"),
+}
+
+
+def table_outputs(table: str) -> list:
+    """
+    Lists the transformed and rejected output files of a table.
+    """
+    output_name = TABLES[table][1]
+    return [output_path(TRANSFORMED_DATA_DIR, output_name),
+            output_path(REJECTED_DATA_DIR, output_name, compression=ETL_REJECTED_COMPRESSION)]
+
+
+def run_transform(table: str, profile_dir: Path | None = None) -> float:
+    """
+    Runs scripts.transform_<table>.main and times it. Executed inside a worker process.
+    Args:
+        table (str): Table name, e.g. 'customers'
+        profile_dir (Path, optional): Run directory for the table's profiles; None disables profiling
+    Returns:
+        float: Wall time in seconds
+    """
+    module = importlib.import_module(f"scripts.transform_{table}")
+    start = time.perf_counter()
+    with profiled(table, profile_dir):
+        module.main()
+    return time.perf_counter() - start
+
+
+def run_dag(dependencies: dict[str, list[str]], max_workers: int | None = None,
+            incremental: bool = False, profile_dir: Path | None = None) -> dict[str, float]:
+    """
+    Schedules transforms in a process pool, submitting each table once its dependencies are done.
+    Args:
+        dependencies (dict[str, list[str]]): table -> prerequisite tables
+        max_workers (int, optional): Pool size, defaults to the number of CPUs
+        incremental (bool): Skip tables whose fingerprint matches the run manifest
+        profile_dir (Path, optional): Run directory for per-table profiles
+    Returns:
+        dict[str, float]: Wall time per table, in completion order (0.0 for skipped tables)
+    """
+    for table, upstream in dependencies.items():
+        unknown = set(upstream) - set(dependencies)
+        if unknown:
+            raise ValueError(f"Unknown dependencies for {table}: {sorted(unknown)}")
+
+    timings = {}
+    pending = dict(dependencies)
+    running: dict[Future, str] = {}
+    manifest = load_manifest() if incremental else {}
+    fingerprints = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers, **pool_logging_options()) as pool:
+        while pending or running:
+            # Skipping a table can make its dependents ready, so keep scanning until nothing changes
+            ready = True
+            while ready:
+                ready = [table for table, upstream in pending.items() if all(dep in timings for dep in upstream)]
+                for table in ready:
+                    del pending[table]
+                    if incremental:
+                        upstream = {dep: fingerprints[dep] for dep in dependencies[table]}
+                        schema_name = TABLES[table][0]
+                        fingerprints[table] = table_fingerprint(table, schemas[schema_name], upstream,
+                                                                constraints.get(schema_name),
+                                                                primary_keys.get(schema_name))
+                        if is_up_to_date(manifest, table, fingerprints[table], table_outputs(table)):
+                            timings[table] = 0.0
+                            logging.info(f"Skipped transform for {table}: inputs unchanged")
+                            continue
+                    running[pool.submit(run_transform, table, profile_dir)] = table
+                    logging.info(f"Started transform for {table}")
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between {sorted(pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table = running.pop(future)
+                try:
+                    timings[table] = future.result()
+                except Exception:
+                    logging.error(f"Transform for {table} failed; cancelling {sorted(pending)}")
+                    for other in running:
+                        other.cancel()
+                    raise
+                logging.info(f"Finished transform for {table} in {timings[table]:.2f}s")
+                if incremental:
+                    record_run(manifest, table, fingerprints[table], table_outputs(table))
+                    save_manifest(manifest)
+
+    return timings
+
+
+def main(max_workers: int | None = None, incremental: bool = False,
+         profile: Path | None = None) -> dict[str, float]:
+    """
+    Runs all transforms and reports wall time per table.
+    Args:
+        max_workers (int, optional): Pool size, defaults to the number of CPUs
+        incremental (bool): Skip tables whose inputs are unchanged since the last run
+        profile (Path, optional): Base directory for profiles; each run gets its own subdirectory
+    Returns:
+        dict[str, float]: Wall time per table
+    """
+    start = time.perf_counter()
+    profile_dir = run_directory(profile)
+    timings = run_dag(DEPENDENCIES, max_workers, incremental, profile_dir)
+    for table, seconds in timings.items():
+        logging.info(f"{table:<10} {seconds:8.2f}s")
+    logging.info(f"All transforms finished in {time.perf_counter() - start:.2f}s")
+    if profile_dir is not None and profile_dir.exists():
+        logging.info(f"Profiles written to {profile_dir}; summary in {summarize_runs(profile_dir)}")
+    return timings
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run all table transforms")
+    parser.add_argument("--incremental", action="store_true", help="Skip tables whose inputs are unchanged")
+    parser.add_argument("--workers", type=int, help="Process pool size (defaults to the CPU count)")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    with script_logging():
+        main(args.workers, args.incremental, args.profile)
@@ -1,28 +1,65 @@
+import argparse
 import logging
-from etl.schema_definition import claims_fact_schema
-from etl.utils.load import load_raw_table
+from functools import partial
+from config.logger import script_logging
+from config.settings import ETL_CHUNK_SIZE, ETL_WORKERS
+from etl.metrics import track_run
+from etl.profiling import add_profile_argument, profiled, run_directory
+from etl.sources import SOURCE_BATCH_SIZE, RawSource
+from etl.schema_definition import claims_fact_schema, constraints, foreign_keys, primary_keys
+from etl.partitioning import transform_partitioned
+from etl.validation.referential import build_key_indexes
+from etl.validation.rejections import RuleCodes
 from etl.transform_base import (
+    load_raw_data,
     clean_dataframe,
     split_valid_invalid,
     save_transformed_data,
     save_rejected_data,
+    transform_in_chunks,
 )
 
-def main() -> None:
+@track_run("claims")
+def main(chunk_size: int = ETL_CHUNK_SIZE, workers: int = ETL_WORKERS, source: RawSource | None = None) -> None:
+    """
+    ETL transform script for claims data.
+    Args:
+        chunk_size (int): Rows per chunk for streaming mode; 0 loads the whole table
+        workers (int): Worker processes; above 1 the raw files are split into byte-range partitions
+        source (RawSource, optional): Stream raw batches from this source (see etl.sources) instead of data/raw/
+    """
     table = "claims"
     schema = claims_fact_schema
+    key_indexes = build_key_indexes(foreign_keys[f"{table}_fact"])
+    rules = constraints[f"{table}_fact"]
+    primary_key = primary_keys[f"{table}_fact"]
 
-    raw_df = load_raw_table(table)
-    cleaned_df = clean_dataframe(raw_df)
-    valid_df, invalid_df = split_valid_invalid(cleaned_df, schema)
+    if workers > 1 and source is None:
+        transform_partitioned(table, schema, partial(clean_dataframe, schema=schema), workers, f"{table}_fact",
+                              key_indexes=key_indexes, rules=rules, primary_key=primary_key)
+        return
 
-    save_transformed_data(valid_df, f"{table}_fact")
+    if chunk_size or source is not None:
+        transform_in_chunks(table, schema, lambda df: clean_dataframe(df, schema), chunk_size or SOURCE_BATCH_SIZE,
+                            f"{table}_fact", key_indexes, rules=rules, source=source, primary_key=primary_key)
+        return
+
+    raw_df, parse_errors = load_raw_data(table, schema)
+    cleaned_df = clean_dataframe(raw_df, schema)
+    codes = RuleCodes.for_table(schema, rules, key_indexes, primary_key)
+    valid_df, invalid_df = split_valid_invalid(cleaned_df, schema, f"{table}_fact", key_indexes=key_indexes,
+                                               parse_errors=parse_errors, rules=rules, codes=codes,
+                                               primary_key=primary_key)
+
+    save_transformed_data(valid_df, f"{table}_fact", schema)
     logging.info(f"{len(valid_df)} valid rows processed from {table}_fact")
 
-    if not invalid_df.empty:
-        save_rejected_data(invalid_df, f"{table}_fact")
-        logging.warning(f"{len(invalid_df)} rows rejected from {table}_fact")
+    save_rejected_data(invalid_df, f"{table}_fact", codes)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Transform the claims table")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    with script_logging(), profiled("claims", run_directory(args.profile)):
+        main()
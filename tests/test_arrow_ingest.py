@@ -0,0 +1,58 @@
+import pandas as pd
+
+from etl.utils import load
+from etl.utils.arrow_ingest import iter_raw_table_arrow, read_raw_table_arrow
+from etl.validation.validate_data import evaluate_rows
+
+SCHEMA = {"policy_id": int, "policy_type": str, "premium": float}
+
+
+def write_raw(raw_dir):
+    raw_dir.mkdir()
+    (raw_dir / "policies_clean.csv").write_text("policy_id,policy_type,premium\n1,auto,10.5\n2,life,20\n")
+    (raw_dir / "policies_messy.csv").write_text(
+        "policy_id,policy_type,premium,notes\n 3 ,home,discount,late\n4.5,auto,,\nP-9,life,1e2,\n"
+    )
+
+
+def test_read_raw_table_arrow_projects_and_types_columns(tmp_path, monkeypatch):
+    write_raw(tmp_path / "raw")
+    monkeypatch.setattr(load, "RAW_DATA_DIR", tmp_path / "raw")
+
+    df, parse_errors = read_raw_table_arrow("policies", SCHEMA)
+
+    assert list(df.columns) == list(SCHEMA)
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    assert df["policy_id"].tolist()[:3] == [1, 2, 3]
+    assert df["premium"].tolist()[4] == 100.0
+    assert parse_errors.to_dict("records") == [
+        {"row": 3, "column": "policy_id", "raw_value": "4.5"},
+        {"row": 4, "column": "policy_id", "raw_value": "P-9"},
+        {"row": 2, "column": "premium", "raw_value": "discount"},
+    ]
+
+
+def test_parse_errors_become_rejection_reasons(tmp_path, monkeypatch):
+    write_raw(tmp_path / "raw")
+    monkeypatch.setattr(load, "RAW_DATA_DIR", tmp_path / "raw")
+
+    df, parse_errors = read_raw_table_arrow("policies", SCHEMA)
+    is_valid, reasons = evaluate_rows(df, SCHEMA, parse_errors=parse_errors)
+
+    assert is_valid.tolist() == [True, True, False, False, False]
+    assert reasons.tolist() == [
+        "Invalid type in 'premium': expected float",
+        "Non-integer value in 'policy_id'",
+        "Invalid type in 'policy_id': expected int",
+    ]
+
+
+def test_iter_raw_table_arrow_chunks_by_rows(tmp_path, monkeypatch):
+    write_raw(tmp_path / "raw")
+    monkeypatch.setattr(load, "RAW_DATA_DIR", tmp_path / "raw")
+
+    chunks = list(iter_raw_table_arrow("policies", SCHEMA, chunk_size=2))
+
+    assert [len(chunk) for chunk, _ in chunks] == [2, 2, 1]
+    assert [chunk.index.tolist() for chunk, _ in chunks] == [[0, 1], [2, 3], [4]]
+    assert chunks[1][1]["row"].tolist() == [3, 2]
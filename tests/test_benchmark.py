@@ -0,0 +1,31 @@
+from etl.benchmark import TABLES, find_regressions, read_results, run_benchmark, write_results
+
+
+def record(stage, rows_per_sec, seconds=1.0, table="claims", scale=1):
+    return {"scale": scale, "table": table, "stage": stage, "rows": 1000,
+            "seconds": seconds, "rows_per_sec": rows_per_sec, "peak_rss_mb": 100.0}
+
+
+def test_find_regressions_flags_only_throughput_drops_past_threshold():
+    baseline = [record("load", 1000), record("clean", 1000), record("save", 1000, seconds=0.001)]
+    results = [record("load", 700), record("clean", 800), record("save", 10), record("validate.rules", 1)]
+
+    regressions = find_regressions(results, baseline, threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("x1 claims load")
+
+
+def test_run_benchmark_times_every_stage_of_every_table(tmp_path):
+    results = run_benchmark(0.05, tmp_path)
+
+    stages = {(r["table"], r["stage"]) for r in results}
+    for table in TABLES:
+        for stage in ("generate", "load", "clean", "validate.types", "validate.rules", "validate.split", "save"):
+            assert (table, stage) in stages
+    assert [table for table, stage in stages if stage == "validate.foreign_keys"] == ["claims"]
+    assert all(r["rows"] > 0 and r["seconds"] >= 0 and r["peak_rss_mb"] > 0 for r in results)
+    assert (tmp_path / "transformed" / "claims_fact.csv").exists()
+
+    write_results(tmp_path / "results.json", results, scales=[0.05])
+    assert read_results(tmp_path / "results.json") == results
@@ -0,0 +1,35 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from etl.warehouse.bulk_load import BulkLoader, SQLiteBulkLoader
+
+
+def test_sqlite_loader_replaces_table_contents(tmp_path):
+    pd.DataFrame({
+        "adjuster_id": [1, 2, 3],
+        "name": ["Ann Lee", "Bo Chen", ""],
+        "region": ["West", "Midwest", "West"],
+        "team_lead_id": [1.0, 2.0, 2.0],
+        "team_notes": [None, "Temp contract", None],
+    }).to_csv(tmp_path / "adjusters.csv", index=False)
+    db_path = tmp_path / "etl.db"
+    loader = SQLiteBulkLoader.from_path(db_path, chunk_size=2)
+
+    loader.load_star_schema(["adjusters_dim"], source_dir=tmp_path)
+    results = loader.load_star_schema(["adjusters_dim"], source_dir=tmp_path)
+    loader.engine.dispose()
+
+    assert results["adjusters_dim"]["rows"] == 3
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT adjuster_id, name, team_lead_id FROM adjusters_dim ORDER BY adjuster_id").fetchall()
+    assert rows == [(1, "Ann Lee", 1), (2, "Bo Chen", 2), (3, None, 2)]
+
+
+def test_loader_without_staged_load_cannot_be_created():
+    class IncompleteLoader(BulkLoader):
+        sql_types = {int: "INTEGER"}
+
+    with pytest.raises(TypeError, match="load_chunks"):
+        IncompleteLoader(engine=None)
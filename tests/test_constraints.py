@@ -0,0 +1,61 @@
+import pandas as pd
+
+from etl.schema_definition import constraints, policies_schema
+from etl.validation.constraints import Compare, NotNull, OneOf, Pattern, Range, check_constraints
+from etl.validation.validate_data import evaluate_rows
+
+
+def test_check_constraints_reports_one_mask_per_rule():
+    df = pd.DataFrame({
+        "status": ["Approved", "In Progress", None, "Denied"],
+        "amount": [10.0, -500.0, None, "abc"],
+        "email": ["a@example.com", "not-an-email", "  ", None],
+    })
+    rules = [
+        OneOf("status", ("Approved", "Denied", "Pending")),
+        Range("amount", min=0),
+        NotNull("email"),
+        Pattern("email", r"[^@\s]+@[^@\s]+\.[A-Za-z]{2,}", "an email address"),
+    ]
+
+    failures = check_constraints(df, rules)
+
+    assert {reason: mask.tolist() for reason, mask in failures.items()} == {
+        "Invalid value in 'status': expected one of Approved, Denied, Pending": [False, True, False, False],
+        "Out of range value in 'amount': expected >= 0": [False, True, False, False],
+        "Missing value in 'email'": [False, False, True, True],
+        "Invalid format in 'email': expected an email address": [False, True, False, False],
+    }
+
+
+def test_compare_skips_rows_with_unparsable_dates():
+    df = pd.DataFrame({
+        "start_date": ["2023-01-01", "2023-06-01", "March 15, 2022"],
+        "end_date": ["2023-02-01", "2023-01-01", "2023-01-01"],
+    })
+    rule = Compare("end_date", ">=", "start_date")
+
+    failures = check_constraints(df, [rule], policies_schema)
+
+    assert failures[rule.reason].tolist() == [False, True, False]
+
+
+def test_evaluate_rows_combines_type_and_domain_failures():
+    df = pd.DataFrame({
+        "date_id": [1, 2, 3],
+        "day": [1, 2, None],
+        "month": ["January", "January", "January"],
+        "year": [2023, 2023, 2023],
+        "quarter": ["Q1", "Q5", "Q1"],
+        "weekday": ["Sunday", "Monday", "Fridday"],
+    })
+    schema = {"date_id": int, "day": int, "month": str, "year": int, "quarter": str, "weekday": str}
+
+    is_valid, reasons = evaluate_rows(df, schema, rules=constraints["dates_dim"])
+
+    assert is_valid.tolist() == [True, False, False]
+    assert reasons.tolist() == [
+        "Invalid value in 'quarter': expected one of Q1, Q2, Q3, Q4",
+        "Invalid type in 'day': expected int; Invalid value in 'weekday': expected one of "
+        "Monday, Tuesday, Wednesday, Thursday, Friday, Saturday, Sunday",
+    ]
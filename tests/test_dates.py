@@ -0,0 +1,37 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from etl.utils.helpers import infer_date_formats, normalize_dates, parse_date
+from etl.validation.type_checks import evaluate_schema
+
+
+def test_normalize_dates_matches_parse_date():
+    raw = pd.Series(["1992-04-18", " 04/18/1992 ", "18-04-1992", "18/04/1992", "04/05/1992", "April 18th, 1992"])
+
+    normalized, unparsable = normalize_dates(raw)
+
+    assert normalized.tolist() == [parse_date(value) for value in raw]
+    assert unparsable.tolist() == [False, False, False, False, False, True]
+
+
+def test_normalize_dates_keeps_missing_values_unflagged():
+    normalized, unparsable = normalize_dates(pd.Series(["2023-01-01", np.nan]))
+
+    assert normalized.iloc[0] == "2023-01-01"
+    assert pd.isna(normalized.iloc[1])
+    assert unparsable.tolist() == [False, False]
+
+
+def test_infer_date_formats_only_returns_formats_present():
+    assert infer_date_formats(pd.Series(["2023-01-01", "2023-02-01"])) == ["%Y-%m-%d"]
+
+
+def test_unparsable_dates_fail_validation():
+    normalized, _ = normalize_dates(pd.Series(["March 15, 2022", "03/15/2022"]))
+
+    is_valid, reasons = evaluate_schema(pd.DataFrame({"start_date": normalized}), {"start_date": date})
+
+    assert is_valid.tolist() == [False, True]
+    assert reasons.iloc[0] == "Invalid date in 'start_date': expected YYYY-MM-DD"
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl.validation.dedup import Deduplicator, KeySet, duplicate_key_reason
+
+REASON = duplicate_key_reason("customer_id")
+
+
+def customers() -> pd.DataFrame:
+    return pd.DataFrame({
+        "customer_id": [1, 2, 1, 3, 1, "x"],
+        "email": ["a@x.com", "b@x.com", None, "c@x.com", "a2@x.com", "d@x.com"],
+        "phone": [None, "555", "555", "555", "555", "555"],
+    })
+
+
+def losers(df: pd.DataFrame, survivorship: str) -> list[int]:
+    failures = Deduplicator("customer_id", survivorship).check(df)
+    return df.index[failures[REASON]].tolist() if failures else []
+
+
+@pytest.mark.parametrize("survivorship, expected", [
+    ("first", [2, 4]),
+    ("last", [0, 2]),
+    ("most_complete", [0, 2]),
+])
+def test_survivorship_rules(survivorship, expected):
+    assert losers(customers(), survivorship) == expected
+
+
+def test_deduplicator_leaves_unparsable_keys_to_type_checks():
+    df = pd.DataFrame({"customer_id": ["x", "x", None, None]})
+
+    assert Deduplicator("customer_id").check(df) == {}
+
+
+def test_first_survivor_carries_over_chunks():
+    deduplicator = Deduplicator("customer_id", "first")
+    df = customers()
+
+    first = deduplicator.check(df.iloc[:2])
+    second = deduplicator.check(df.iloc[2:])
+
+    assert first == {}
+    assert df.index[2:][second[REASON]].tolist() == [2, 4]
+
+
+def test_planned_survivors_across_chunks():
+    deduplicator = Deduplicator("customer_id", "last")
+    df = customers()
+    chunks = [df.iloc[:3], df.iloc[3:]]
+
+    deduplicator.plan(deduplicator.scan(chunk) for chunk in chunks)
+    lost = [chunk.index[deduplicator.check(chunk).get(REASON, pd.Series(False, index=chunk.index))].tolist()
+            for chunk in chunks]
+
+    assert lost == [[0, 2], []]
+
+
+def test_key_set_merges_levels():
+    keys = KeySet()
+    for start in range(0, 1000, 100):
+        keys.add(np.arange(start, start + 100, dtype="int64") * 3)
+
+    assert len(keys) == 1000
+    assert len(keys.levels) < 10
+    assert keys.contains(np.array([0, 3, 2997, 1, 3000])).tolist() == [True, True, True, False, False]
+
+
+def test_transform_in_chunks_rejects_duplicate_keys(tmp_path, monkeypatch):
+    import etl.transform_base as transform_base
+    import etl.utils.load as load
+    from etl.transform_base import clean_dataframe
+    from etl.validation.rejections import RuleCodes
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"adjuster_id": [1, 2, 3, 2, 1], "name": ["A", "B", "C", "B2", "A2"]}).to_csv(
+        raw_dir / "adjusters_clean.csv", index=False)
+    monkeypatch.setattr(load, "RAW_DATA_DIR", raw_dir)
+    monkeypatch.setattr(transform_base, "TRANSFORMED_DATA_DIR", tmp_path / "transformed")
+    monkeypatch.setattr(transform_base, "REJECTED_DATA_DIR", tmp_path / "rejected")
+    monkeypatch.setattr("etl.validation.dedup.ETL_SURVIVORSHIP", "last")
+    schema = {"adjuster_id": int, "name": str}
+
+    valid_rows, rejected_rows = transform_base.transform_in_chunks(
+        "adjusters", schema, lambda df: clean_dataframe(df, schema), chunk_size=2, primary_key="adjuster_id")
+
+    assert (valid_rows, rejected_rows) == (3, 2)
+    valid = pd.read_csv(tmp_path / "transformed" / "adjusters.csv")
+    assert valid["name"].tolist() == ["C", "B2", "A2"]
+    rejected = pd.read_csv(tmp_path / "rejected" / "adjusters.csv")
+    codes = RuleCodes.for_table(schema, primary_key="adjuster_id")
+    assert codes.decode(rejected["rejection_code"]) == [duplicate_key_reason("adjuster_id")] * 2
+
+
+@pytest.mark.parametrize("survivorship", ["first", "last", "most_complete"])
+def test_survivor_is_picked_among_otherwise_valid_rows(tmp_path, monkeypatch, survivorship):
+    import etl.transform_base as transform_base
+    import etl.utils.load as load
+    from etl.transform_base import clean_dataframe
+    from etl.validation.rejections import RuleCodes
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"adjuster_id": [1, 2, 1], "name": ["A", "B", "A2"], "years": ["5", "3", "many"]}).to_csv(
+        raw_dir / "adjusters_clean.csv", index=False)
+    monkeypatch.setattr(load, "RAW_DATA_DIR", raw_dir)
+    monkeypatch.setattr(transform_base, "TRANSFORMED_DATA_DIR", tmp_path / "transformed")
+    monkeypatch.setattr(transform_base, "REJECTED_DATA_DIR", tmp_path / "rejected")
+    monkeypatch.setattr("etl.validation.dedup.ETL_SURVIVORSHIP", survivorship)
+    schema = {"adjuster_id": int, "name": str, "years": int}
+
+    valid_rows, rejected_rows = transform_base.transform_in_chunks(
+        "adjusters", schema, lambda df: clean_dataframe(df, schema), chunk_size=2, primary_key="adjuster_id")
+
+    assert (valid_rows, rejected_rows) == (2, 1)
+    valid = pd.read_csv(tmp_path / "transformed" / "adjusters.csv")
+    assert valid["name"].tolist() == ["A", "B"]
+    rejected = pd.read_csv(tmp_path / "rejected" / "adjusters.csv")
+    reasons = RuleCodes.for_table(schema, primary_key="adjuster_id").decode(rejected["rejection_code"])
+    assert len(reasons) == 1 and duplicate_key_reason("adjuster_id") not in reasons[0]
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from scripts import generate_claims
+from scripts.generate_claims import CORRUPTIONS, generate_claims_block
+
+
+def test_claims_generation_is_reproducible(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_claims, "output_dir", tmp_path)
+
+    first = generate_claims.write_clean_claims(2500, seed=7, block_size=1000).read_bytes()
+    second = generate_claims.write_clean_claims(2500, seed=7, block_size=1000).read_bytes()
+    other_seed = generate_claims.write_clean_claims(2500, seed=8, block_size=1000).read_bytes()
+
+    assert first == second
+    assert first != other_seed
+    df = pd.read_csv(tmp_path / "claims_clean.csv")
+    assert df.columns.tolist() == generate_claims.columns
+    assert df["claim_id"].tolist() == list(range(1, 2501))
+
+
+def test_messy_claims_inject_every_corruption():
+    df = generate_claims_block(np.random.default_rng(0), 1, 8000, messy=True).to_pandas()
+
+    counts = {
+        "missing_amount": df["amount"].isna().sum(),
+        "negative_amount": (df["amount"] == -500.0).sum(),
+        "invalid_status": (df["status"] == "In Progress").sum(),
+        "foreign_key_violation_customer": (df["customer_id"] == 999999).sum(),
+        "foreign_key_violation_policy": (df["policy_id"] == 888888).sum(),
+        "foreign_key_violation_date": (df["date_id"] == 777777).sum(),
+        "foreign_key_violation_adjuster": (df["adjuster_id"] == 666666).sum(),
+        "extra_column": df["notes"].notna().sum(),
+    }
+    assert list(counts) == CORRUPTIONS
+    assert sum(counts.values()) == 8000
+    assert all(800 < count < 1200 for count in counts.values())
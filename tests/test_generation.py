@@ -0,0 +1,32 @@
+from datetime import date
+from functools import partial
+
+import numpy as np
+
+from etl.generation import corruption_masks, faker_pool, shards, write_sharded
+from scripts.generate_policies import generate_policies_block
+
+
+def test_shards_have_fixed_size():
+    assert list(shards(10, shard_size=4)) == [(0, 1, 4), (1, 5, 4), (2, 9, 2)]
+
+
+def test_sharded_output_does_not_depend_on_worker_count(tmp_path):
+    block = partial(generate_policies_block, messy=True, reference_date=date(2025, 1, 1))
+
+    single = write_sharded(tmp_path / "one", "policies_messy", block, 1000, seed=3, workers=1, shard_size=128)
+    pooled = write_sharded(tmp_path / "three", "policies_messy", block, 1000, seed=3, workers=3, shard_size=128)
+
+    assert single.read_bytes() == pooled.read_bytes()
+    assert single.read_text().count("\n") == 1001
+
+
+def test_faker_pool_is_seeded():
+    assert faker_pool(1, "name", 20).equals(faker_pool.__wrapped__(1, "name", 20))
+    assert not faker_pool(1, "name", 20).equals(faker_pool(2, "name", 20))
+
+
+def test_corruption_masks_assign_one_corruption_per_row():
+    masks = corruption_masks(np.random.default_rng(0), ["a", "b", "c"], 300)
+
+    assert np.array_equal(sum(mask.astype(int) for mask in masks.values()), np.ones(300))
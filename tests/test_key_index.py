@@ -0,0 +1,70 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from etl.validation.key_index import KeyIndexBuilder, MappedKeys, index_paths, load_key_index
+
+
+def write_customers(path, ids):
+    pd.DataFrame({"customer_id": ids, "name": [f"c{i}" for i in range(len(ids))]}).to_csv(path, index=False)
+
+
+def test_builder_writes_sorted_keys_with_row_offsets(tmp_path):
+    output = tmp_path / "customers.csv"
+    write_customers(output, [30, 10, 20, 40])
+    builder = KeyIndexBuilder.for_table("customers")
+
+    builder.add(pd.DataFrame({"customer_id": [30, 10]}))
+    builder.add(pd.DataFrame({"customer_id": ["20", "A-XYZ", 40]}))
+    builder.write(output)
+    keys, rows = load_key_index(output, "customer_id")
+
+    assert keys.tolist() == [10, 20, 30, 40]
+    assert rows.tolist() == [1, 2, 0, 4]
+    assert KeyIndexBuilder.for_table("claims_fact") is None
+
+
+def test_mapped_keys_pickle_as_their_path(tmp_path):
+    output = tmp_path / "customers.csv"
+    write_customers(output, list(range(1000)))
+
+    keys, _ = load_key_index(output, "customer_id")
+    copy = pickle.loads(pickle.dumps(keys))
+
+    assert isinstance(keys, MappedKeys)
+    assert len(pickle.dumps(keys)) < 500
+    assert copy.path == keys.path and copy.tolist() == list(range(1000))
+    assert pickle.loads(pickle.dumps(keys[:3])).tolist() == [0, 1, 2]
+
+
+def test_stale_index_is_rebuilt_and_unchanged_arrays_are_kept(tmp_path):
+    output = tmp_path / "customers.csv"
+    write_customers(output, [1, 2, 3])
+    keys_path, _, _ = index_paths(output, "customer_id")
+
+    assert load_key_index(output, "customer_id")[0].tolist() == [1, 2, 3]
+    written = keys_path.stat().st_mtime_ns
+
+    write_customers(output, [1, 2, 3])
+    os.utime(output, ns=(written + 10**9, written + 10**9))
+    assert load_key_index(output, "customer_id")[0].tolist() == [1, 2, 3]
+    assert keys_path.stat().st_mtime_ns == written
+
+    write_customers(output, [1, 2, 3, 7])
+    assert load_key_index(output, "customer_id")[0].tolist() == [1, 2, 3, 7]
+
+
+def test_dimension_keys_resolve_foreign_keys(tmp_path, monkeypatch):
+    import etl.validation.referential as referential
+
+    write_customers(tmp_path / "customers.csv", [5, 1, 3])
+    monkeypatch.setattr(referential, "TRANSFORMED_DATA_DIR", tmp_path)
+
+    keys = referential.load_dimension_keys("customers", "customer_id")
+    checkable, found = referential.keys_present(pd.Series([1, 2, 5]), keys)
+
+    assert (tmp_path / "_index" / "customers.customer_id.keys.npy").exists()
+    assert found.tolist() == [True, False, True]
+    assert np.asarray(keys).tolist() == [1, 3, 5]
@@ -1,7 +1,26 @@
-from config.logger import logger
+import logging
 
-logger.debug('debug message')
-logger.info('info message')
-logger.warning('warning message')
-logger.error('error message')
-logger.critical('critical message')
\ No newline at end of file
+import config.logger as logger_module
+
+
+def test_logger_writes_every_level_to_the_log_file(tmp_path, monkeypatch):
+    # A fresh pipeline logger writing under tmp_path, so the tracked logs/pipeline.log stays untouched
+    monkeypatch.setattr(logger_module, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(logger_module, "LOG_FILE", str(tmp_path / "pipeline.log"))
+    pipeline_logger = logging.getLogger(logger_module.LOGGER_NAME)
+    monkeypatch.setattr(pipeline_logger, "handlers", [])
+    monkeypatch.setattr(pipeline_logger, "filters", [])
+
+    logger = logger_module.get_logger()
+    logger.debug('debug message')
+    logger.info('info message')
+    logger.warning('warning message')
+    logger.error('error message')
+    logger.critical('critical message')
+    for handler in logger.handlers:
+        handler.close()
+
+    lines = (tmp_path / "pipeline.log").read_text().splitlines()
+    assert [line.split(" | ", 1)[1] for line in lines] == [
+        "DEBUG | debug message", "INFO | info message", "WARNING | warning message",
+        "ERROR | error message", "CRITICAL | critical message"]
@@ -0,0 +1,56 @@
+import scripts.transform_all as transform_all
+from etl.manifest import (file_digest, is_up_to_date, load_manifest, record_run, save_manifest, schema_digest,
+                          table_fingerprint)
+
+
+def test_schema_digest_changes_with_types():
+    assert schema_digest({"day": int}) != schema_digest({"day": str})
+    assert schema_digest({"day": int}) == schema_digest({"day": int})
+
+
+def test_unchanged_fingerprint_with_outputs_is_up_to_date(tmp_path):
+    raw = tmp_path / "dates_clean.csv"
+    raw.write_text("date_id\n1\n")
+    output = tmp_path / "dates.csv"
+    output.write_text("date_id\n1\n")
+    fingerprint = {"inputs": {raw.name: file_digest(raw)}, "schema": schema_digest({"date_id": int}), "upstream": {}}
+    manifest_path = tmp_path / "_manifest.json"
+
+    manifest = {}
+    record_run(manifest, "dates", fingerprint, [output, tmp_path / "missing_rejected.csv"])
+    save_manifest(manifest, manifest_path)
+    manifest = load_manifest(manifest_path)
+
+    assert is_up_to_date(manifest, "dates", fingerprint)
+    raw.write_text("date_id\n2\n")
+    assert not is_up_to_date(manifest, "dates", {**fingerprint, "inputs": {raw.name: file_digest(raw)}})
+    output.unlink()
+    assert not is_up_to_date(manifest, "dates", fingerprint)
+
+
+def test_output_format_change_reruns_the_table(tmp_path, monkeypatch):
+    raw = tmp_path / "dates_clean.csv"
+    raw.write_text("date_id\n1\n")
+    monkeypatch.setattr("etl.manifest.raw_table_paths", lambda table: [raw])
+    monkeypatch.setattr(transform_all, "TRANSFORMED_DATA_DIR", tmp_path / "transformed")
+    monkeypatch.setattr(transform_all, "REJECTED_DATA_DIR", tmp_path / "rejected")
+    monkeypatch.setattr("etl.utils.output_formats.ETL_OUTPUT_FORMAT", "csv")
+    schema = {"date_id": int}
+
+    manifest = {}
+    csv_fingerprint = table_fingerprint("dates", schema, primary_key="date_id")
+    csv_outputs = transform_all.table_outputs("dates")
+    csv_outputs[0].parent.mkdir()
+    csv_outputs[0].write_text("date_id\n1\n")
+    record_run(manifest, "dates", csv_fingerprint, csv_outputs)
+    assert is_up_to_date(manifest, "dates", csv_fingerprint, csv_outputs)
+
+    monkeypatch.setattr("etl.utils.output_formats.ETL_OUTPUT_FORMAT", "parquet")
+    parquet_fingerprint = table_fingerprint("dates", schema, primary_key="date_id")
+    parquet_outputs = transform_all.table_outputs("dates")
+
+    assert parquet_fingerprint != csv_fingerprint
+    assert not is_up_to_date(manifest, "dates", parquet_fingerprint, parquet_outputs)
+    assert not is_up_to_date(manifest, "dates", csv_fingerprint, parquet_outputs)
+    monkeypatch.setattr("etl.manifest.ETL_SURVIVORSHIP", "last")
+    assert table_fingerprint("dates", schema, primary_key="date_id") != parquet_fingerprint
@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from etl.marts import read_mart, update_marts
+
+
+def write_dimensions(directory):
+    directory.mkdir()
+    pd.DataFrame({"customer_id": [1, 2], "region": ["West", "Midwest"]}).to_csv(directory / "customers.csv", index=False)
+    pd.DataFrame({"policy_id": [10, 20], "policy_type": ["auto", "life"]}).to_csv(directory / "policies.csv", index=False)
+    pd.DataFrame({"date_id": [100, 200], "year": [2024, 2024], "quarter": ["Q1", "Q2"]}).to_csv(
+        directory / "dates.csv", index=False)
+    pd.DataFrame({"adjuster_id": [7]}).to_csv(directory / "adjusters.csv", index=False)
+
+
+def claims(ids, customers, amounts, statuses):
+    return pd.DataFrame({"claim_id": ids, "customer_id": customers, "policy_id": [10] * len(ids),
+                         "date_id": [100] * len(ids), "adjuster_id": [7] * len(ids), "amount": amounts,
+                         "status": statuses})
+
+
+def test_marts_fold_in_only_new_claims(tmp_path):
+    source, marts = tmp_path / "transformed", tmp_path / "marts"
+    write_dimensions(source)
+    fact = source / "claims_fact.csv"
+
+    claims([1, 2, 3], [1, 1, 2], [100.0, 300.0, 50.0], ["Approved", "Denied", "Approved"]).to_csv(fact, index=False)
+    assert update_marts(directory=marts, source_dir=source) == 3
+
+    claims([1, 2, 3, 4], [1, 1, 2, 1], [100.0, 300.0, 50.0, 20.0], ["Approved", "Denied", "Approved", "Approved"]) \
+        .to_csv(fact, index=False)
+    assert update_marts(directory=marts, source_dir=source) == 1
+    assert update_marts(directory=marts, source_dir=source) == 0
+
+    by_region = read_mart("claims_by_region", marts).set_index("region")
+    assert by_region.loc["West", ["claims", "amount_sum", "amount_min", "amount_max", "approved"]].tolist() == \
+        [3, 420.0, 20.0, 300.0, 2]
+    assert by_region.loc["West", "amount_mean"] == 140.0
+    assert by_region.loc["Midwest", "approval_rate"] == 1.0
+
+    by_quarter = read_mart("claims_by_quarter", marts)
+    assert by_quarter[["year", "quarter", "claims"]].values.tolist() == [[2024, "Q1", 4]]
+
+    rebuilt = tmp_path / "rebuilt"
+    update_marts(rebuild=True, directory=rebuilt, source_dir=source)
+    pd.testing.assert_frame_equal(read_mart("claims_by_region", rebuilt), read_mart("claims_by_region", marts))
+
+
+def test_interrupted_update_keeps_the_previous_generation(tmp_path, monkeypatch):
+    import etl.marts as marts_module
+
+    source, marts = tmp_path / "transformed", tmp_path / "marts"
+    write_dimensions(source)
+    fact = source / "claims_fact.csv"
+    claims([1, 2], [1, 2], [100.0, 50.0], ["Approved", "Denied"]).to_csv(fact, index=False)
+    update_marts(directory=marts, source_dir=source)
+    claims([1, 2, 3], [1, 2, 1], [100.0, 50.0, 20.0], ["Approved", "Denied", "Approved"]).to_csv(fact, index=False)
+
+    write_output = marts_module.write_output
+
+    def crash_on_third_mart(df, directory, name, *args):
+        if name == "claims_by_region":
+            raise OSError("disk full")
+        return write_output(df, directory, name, *args)
+
+    monkeypatch.setattr(marts_module, "write_output", crash_on_third_mart)
+    with pytest.raises(OSError):
+        update_marts(directory=marts, source_dir=source)
+    assert read_mart("claims_by_date", marts)["claims"].tolist() == [2]
+
+    monkeypatch.setattr(marts_module, "write_output", write_output)
+    assert update_marts(directory=marts, source_dir=source) == 1
+    assert read_mart("claims_by_date", marts)["claims"].tolist() == [3]
+    assert read_mart("claims_by_region", marts).set_index("region").loc["West", "claims"] == 2
+    assert len(list(marts.glob("gen-*"))) == 1
+
+
+def test_changed_or_removed_claims_rebuild_the_marts(tmp_path, monkeypatch):
+    import etl.marts as marts_module
+
+    source, marts = tmp_path / "transformed", tmp_path / "marts"
+    write_dimensions(source)
+    fact = source / "claims_fact.csv"
+    claims([1, 2, 3], [1, 1, 2], [100.0, 300.0, 50.0], ["Approved", "Denied", "Approved"]).to_csv(fact, index=False)
+    update_marts(directory=marts, source_dir=source)
+
+    claims([1, 2, 3], [1, 1, 2], [1000.0, 3000.0, 500.0], ["Approved", "Denied", "Approved"]).to_csv(fact, index=False)
+    assert update_marts(directory=marts, source_dir=source) == 3
+    by_region = read_mart("claims_by_region", marts).set_index("region")
+    assert by_region.loc["West", ["claims", "amount_sum"]].tolist() == [2, 4000.0]
+    assert by_region.loc["Midwest", "amount_sum"] == 500.0
+
+    claims([1, 3], [1, 2], [1000.0, 500.0], ["Approved", "Approved"]).to_csv(fact, index=False)
+    assert update_marts(directory=marts, source_dir=source) == 2
+    assert read_mart("claims_by_region", marts).set_index("region").loc["West", "amount_sum"] == 1000.0
+
+    # An unchanged fact output is not read again
+    monkeypatch.setattr(marts_module, "iter_output", None)
+    assert update_marts(directory=marts, source_dir=source) == 0
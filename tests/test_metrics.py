@@ -0,0 +1,56 @@
+import json
+
+import pandas as pd
+
+from etl import metrics
+
+
+def fake_transform(df: pd.DataFrame) -> int:
+    batches = list(metrics.iter_stage("load", [(df.iloc[:2],), (df.iloc[2:],)]))
+    cleaned = metrics.stage_function("clean")(lambda chunk: chunk.drop_duplicates())(df)
+    with metrics.stage("validate", len(cleaned)) as counts:
+        counts.rows_out = len(cleaned) - 1
+        counts.rows_rejected = 1
+    metrics.count("save", bytes_written=123)
+    return len(batches)
+
+
+def test_track_run_writes_json_lines_and_prometheus_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_DIR", tmp_path)
+    df = pd.DataFrame({"id": [1, 1, 2, 3]})
+
+    assert metrics.track_run("claims")(fake_transform)(df) == 2
+
+    records = {r["stage"]: r for r in map(json.loads, (tmp_path / "metrics.jsonl").read_text().splitlines())}
+    assert list(records) == ["load", "clean", "validate", "save", "total"]
+    assert records["load"]["rows_out"] == 4
+    assert records["clean"]["rows_in"] == 4 and records["clean"]["rows_out"] == 3
+    assert records["validate"]["rows_rejected"] == 1
+    assert records["save"]["bytes_written"] == 123
+    assert all(r["status"] == "ok" and r["table"] == "claims" for r in records.values())
+    assert records["total"]["wall_seconds"] >= records["clean"]["wall_seconds"]
+    assert records["total"]["peak_rss_bytes"] > 0
+
+    prom = (tmp_path / "etl_claims.prom").read_text()
+    assert '# TYPE etl_stage_rows_rejected gauge' in prom
+    assert 'etl_stage_rows_rejected{table="claims",stage="validate"} 1' in prom
+    assert 'etl_run_success{table="claims"} 1' in prom
+
+
+def test_nested_stages_are_counted_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_DIR", tmp_path)
+    inner = metrics.stage_function("clean")(lambda df: df)
+    outer = metrics.stage_function("clean")(lambda df: inner(df))
+
+    metrics.track_run("customers")(outer)(pd.DataFrame({"id": [1, 2]}))
+
+    clean = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text().splitlines()][0]
+    assert clean["stage"] == "clean" and clean["calls"] == 1 and clean["rows_in"] == 2
+
+
+def test_metrics_off_runs_the_function_directly(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_DIR", None)
+
+    assert metrics.track_run("claims")(fake_transform)(pd.DataFrame({"id": [1, 2, 3]})) == 2
+    assert metrics.current_run() is None
+    assert list(tmp_path.iterdir()) == []
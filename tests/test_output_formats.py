@@ -0,0 +1,71 @@
+from datetime import date
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from etl.utils.output_formats import (ArrowTableWriter, TableWriter, concat_outputs, open_writer, read_output,
+                                      write_output)
+
+
+def test_parquet_output_uses_schema_types(tmp_path):
+    df = pd.DataFrame({"policy_id": [1.0, 2.0], "start_date": ["2023-01-01", "2023-02-01"],
+                       "premium": [40.5, 99.0], "agent_notes": [None, "Loyal customer"]})
+    schema = {"policy_id": int, "start_date": date, "premium": float}
+
+    path = write_output(df, tmp_path, "policies", schema, fmt="parquet")
+
+    arrow_types = {field.name: str(field.type) for field in pq.read_schema(path)}
+    assert arrow_types == {"policy_id": "int64", "start_date": "date32[day]",
+                           "premium": "double", "agent_notes": "string"}
+    assert read_output(path)["policy_id"].tolist() == [1, 2]
+
+
+def test_writers_append_chunks(tmp_path):
+    for fmt in ["csv", "parquet", "feather"]:
+        with open_writer(tmp_path, "dates", {"date_id": int}, fmt) as writer:
+            writer.write(pd.DataFrame({"date_id": [1, 2]}))
+            writer.write(pd.DataFrame({"date_id": [3]}))
+
+        assert writer.rows == 3
+        assert read_output(writer.path)["date_id"].tolist() == [1, 2, 3]
+
+
+def test_concat_outputs_keeps_part_order(tmp_path):
+    for fmt in ["csv", "parquet", "feather"]:
+        parts = [write_output(pd.DataFrame({"claim_id": ids}), tmp_path / "parts", f"part-{i}", fmt=fmt)
+                 for i, ids in enumerate([[3, 1], [], [2]])]
+        combined = tmp_path / f"claims_fact{parts[0].suffix}"
+
+        concat_outputs(parts, combined)
+
+        assert read_output(combined)["claim_id"].astype(int).tolist() == [3, 1, 2]
+
+
+def test_parquet_output_converts_numbers_the_validator_accepts(tmp_path):
+    from etl.validation.type_checks import check_schema
+
+    schema = {"amount": float, "count": int}
+    df = pd.DataFrame({"amount": ["nan", "1_000.5", " Infinity "], "count": ["1_000", " +5 ", "-7"]})
+    assert check_schema(df, schema) == {}
+
+    path = write_output(df, tmp_path, "claims", schema, "parquet")
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("count").type) == "int64"
+    assert table.column("count").to_pylist() == [1000, 5, -7]
+    amounts = table.column("amount").to_pylist()
+    assert pd.isna(amounts[0]) and amounts[1:] == [1000.5, float("inf")]
+
+
+def test_writers_missing_their_format_hooks_cannot_be_created(tmp_path):
+    class NoWrite(TableWriter):
+        pass
+
+    class NoOpen(ArrowTableWriter):
+        pass
+
+    with pytest.raises(TypeError, match="_write"):
+        NoWrite(tmp_path / "out.csv")
+    with pytest.raises(TypeError, match="_open"):
+        NoOpen(tmp_path / "out.parquet")
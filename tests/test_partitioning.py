@@ -0,0 +1,54 @@
+from functools import partial
+
+import pandas as pd
+
+from etl.partitioning import byte_range_partitions, read_partition
+
+
+def test_byte_range_partitions_cover_every_row_once(tmp_path):
+    path = tmp_path / "claims_clean.csv"
+    df = pd.DataFrame({"claim_id": range(1, 101), "status": ["Approved", "Denied"] * 50})
+    df.to_csv(path, index=False)
+
+    partitions = byte_range_partitions(path, 7)
+    parts = [read_partition(path, start, end, ["claim_id", "status", "notes"]) for start, end in partitions]
+
+    assert len(partitions) > 1
+    combined = pd.concat(parts, ignore_index=True)
+    assert combined["claim_id"].tolist() == list(range(1, 101))
+    assert combined.columns.tolist() == ["claim_id", "status", "notes"]
+
+
+def test_byte_range_partitions_handles_more_partitions_than_rows(tmp_path):
+    path = tmp_path / "claims_messy.csv"
+    pd.DataFrame({"claim_id": [1, 2]}).to_csv(path, index=False)
+
+    partitions = byte_range_partitions(path, 16)
+
+    assert sum(len(read_partition(path, start, end, ["claim_id"])) for start, end in partitions) == 2
+
+
+def test_profiled_partitioned_run_profiles_worker_partitions(tmp_path, monkeypatch):
+    import etl.partitioning as partitioning
+    import etl.utils.load as load
+    from etl import profiling
+    from etl.transform_base import clean_dataframe
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"adjuster_id": range(1, 41), "name": ["A"] * 40}).to_csv(raw_dir / "adjusters_clean.csv",
+                                                                        index=False)
+    monkeypatch.setattr(load, "RAW_DATA_DIR", raw_dir)
+    monkeypatch.setattr(partitioning, "TRANSFORMED_DATA_DIR", tmp_path / "transformed")
+    monkeypatch.setattr(partitioning, "REJECTED_DATA_DIR", tmp_path / "rejected")
+    schema = {"adjuster_id": int, "name": str}
+
+    with profiling.profiled("adjusters", tmp_path / "run"):
+        valid, rejected = partitioning.transform_partitioned(
+            "adjusters", schema, partial(clean_dataframe, schema=schema), workers=2, partitions_per_worker=1,
+            fmt="csv", primary_key="adjuster_id")
+
+    assert (valid, rejected) == (40, 0)
+    names = {path.name for path in (tmp_path / "run").iterdir()}
+    assert {"adjusters.prof", "adjusters-part00000.validate.prof", "adjusters-part00001.prof",
+            "adjusters-part00000-dedup.prof"} <= names
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from etl import metrics, profiling
+
+
+def build_rows(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(n), "name": [f"row {i}" for i in range(n)]})
+
+
+def fake_transform() -> None:
+    for _ in range(2):
+        with metrics.stage("load"):
+            df = build_rows(1000)
+        metrics.stage_function("clean")(lambda chunk: chunk.drop_duplicates())(df)
+
+
+def test_profiled_writes_stage_profiles_and_summaries(tmp_path):
+    with profiling.profiled("claims", tmp_path / "run") as profiler:
+        fake_transform()
+
+    assert profiler.stages["load"].calls == 2
+    names = {path.name for path in (tmp_path / "run").iterdir()}
+    assert {"claims.load.prof", "claims.clean.prof", "claims.prof",
+            "claims.allocations.txt", "claims.summary.txt"} <= names
+    assert "build_rows" in (tmp_path / "run" / "claims.summary.txt").read_text()
+    assert "== claims load: 2 calls" in (tmp_path / "run" / "claims.allocations.txt").read_text()
+
+    summary = profiling.summarize_runs(tmp_path / "run")
+    assert "build_rows" in summary.read_text()
+
+
+def test_profiling_off_leaves_no_profiler(tmp_path):
+    with profiling.profiled("claims", None) as profiler:
+        fake_transform()
+
+    assert profiler is None
+    assert profiling.current_profiler() is None
+    assert profiling.run_directory(None) is None
+    assert profiling.run_directory(tmp_path).parent == tmp_path
@@ -0,0 +1,98 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from config.logger import RateLimitFilter, pool_logging_options, queue_logging, script_logging
+from etl.transform_base import clean_dataframe
+
+ADJUSTERS_SCHEMA = {"adjuster_id": int, "name": str}
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def log_from_worker(number: int) -> None:
+    logging.getLogger().warning(f"worker message {number}")
+
+
+def clean_and_log(df: pd.DataFrame) -> pd.DataFrame:
+    logging.getLogger().info(f"cleaning partition of {len(df)} rows")
+    return clean_dataframe(df, ADJUSTERS_SCHEMA)
+
+
+def make_record(message: str, rate_key: str | None = None) -> logging.LogRecord:
+    record = logging.LogRecord("etl", logging.WARNING, __file__, 1, message, None, None)
+    if rate_key is not None:
+        record.rate_key = rate_key
+    return record
+
+
+def test_rate_limit_filter_suppresses_and_counts():
+    rate_limit = RateLimitFilter(interval=60)
+    assert rate_limit.filter(make_record("plain"))
+    assert rate_limit.filter(make_record("rejected 1", "rejected:claims"))
+    assert not rate_limit.filter(make_record("rejected 2", "rejected:claims"))
+    assert not rate_limit.filter(make_record("rejected 3", "rejected:claims"))
+    assert rate_limit.filter(make_record("rejected 1", "rejected:policies"))
+
+    rate_limit.next_allowed["rejected:claims"] = 0.0
+    record = make_record("rejected 4", "rejected:claims")
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "rejected 4 (+2 similar messages suppressed)"
+
+
+def test_queue_logging_forwards_worker_records():
+    root = logging.getLogger()
+    handler = ListHandler()
+    previous_level = root.level
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    try:
+        with queue_logging(processes=True):
+            options = pool_logging_options()
+            assert "initializer" in options
+            with ProcessPoolExecutor(max_workers=2, **options) as pool:
+                list(pool.map(log_from_worker, range(4)))
+            logging.info("parent message")
+        assert pool_logging_options() == {}
+    finally:
+        root.removeHandler(handler)
+        root.setLevel(previous_level)
+
+    assert sorted(handler.messages) == ["parent message"] + [f"worker message {i}" for i in range(4)]
+
+
+def test_script_logging_forwards_partition_workers_in_queue_mode(tmp_path, monkeypatch):
+    import etl.partitioning as partitioning
+    import etl.utils.load as load
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"adjuster_id": range(1, 41), "name": ["A"] * 40}).to_csv(raw_dir / "adjusters_clean.csv",
+                                                                        index=False)
+    monkeypatch.setattr(load, "RAW_DATA_DIR", raw_dir)
+    monkeypatch.setattr(partitioning, "TRANSFORMED_DATA_DIR", tmp_path / "transformed")
+    monkeypatch.setattr(partitioning, "REJECTED_DATA_DIR", tmp_path / "rejected")
+    monkeypatch.setattr("config.logger.ETL_LOG_MODE", "queue")
+    root = logging.getLogger()
+    handler = ListHandler()
+    previous_level = root.level
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    try:
+        with script_logging():
+            partitioning.transform_partitioned("adjusters", ADJUSTERS_SCHEMA, clean_and_log, workers=2,
+                                               partitions_per_worker=2, fmt="csv")
+    finally:
+        root.removeHandler(handler)
+        root.setLevel(previous_level)
+
+    cleaned = [message for message in handler.messages if message.startswith("cleaning partition")]
+    assert len(cleaned) == 4
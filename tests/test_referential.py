@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from etl.validation.referential import check_foreign_keys, keys_present
+from etl.validation.validate_data import evaluate_rows
+
+
+def test_keys_present_uses_sorted_lookup():
+    keys = np.array([1, 2, 5, 800], dtype="int64")
+
+    checkable, found = keys_present(pd.Series([1, 3, 800, 999999]), keys)
+
+    assert checkable.all()
+    assert found.tolist() == [True, False, True, False]
+
+
+def test_keys_present_skips_non_integer_values():
+    keys = np.array([1, 2], dtype="int64")
+
+    checkable, found = keys_present(pd.Series(["1", "A-XYZ", None, 2.5]), keys)
+
+    assert checkable.tolist() == [True, False, False, False]
+    assert found.tolist() == [True, False, False, False]
+
+
+def test_foreign_key_violations_are_recorded_per_column():
+    key_indexes = {
+        "customer_id": ("customers", np.array([1, 2], dtype="int64")),
+        "policy_id": ("policies", np.array([10], dtype="int64")),
+    }
+    df = pd.DataFrame({"claim_id": [1, 2, 3], "customer_id": [1, 999999, 2], "policy_id": [10, 10, 888888]})
+
+    failures = check_foreign_keys(df, key_indexes)
+    is_valid, reasons = evaluate_rows(df, {"claim_id": int, "customer_id": int, "policy_id": int}, key_indexes)
+
+    assert sorted(failures) == [
+        "Foreign key violation in 'customer_id': not found in customers",
+        "Foreign key violation in 'policy_id': not found in policies",
+    ]
+    assert is_valid.tolist() == [True, False, False]
+    assert reasons.tolist() == [
+        "Foreign key violation in 'customer_id': not found in customers",
+        "Foreign key violation in 'policy_id': not found in policies",
+    ]
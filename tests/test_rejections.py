@@ -0,0 +1,70 @@
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+
+from etl.utils.output_formats import read_output
+from etl.validation.constraints import OneOf
+from etl.validation.rejections import CODE_COLUMN, RejectionSink, RuleCodes
+from etl.validation.validate_data import evaluate_codes
+
+SCHEMA = {"claim_id": int, "status": str, "amount": float}
+RULES = [OneOf("status", ("Open", "Closed"))]
+
+
+def test_rule_codes_encode_decode_and_count():
+    codes = RuleCodes.for_table(SCHEMA, RULES)
+    df = pd.DataFrame({"claim_id": ["1", "x", "2.5", "3"], "status": ["Open", "Lost", "Open", "Open"],
+                       "amount": ["1.0", "2.0", "oops", "4.0"]})
+
+    is_valid, rejection_codes = evaluate_codes(df, SCHEMA, codes, rules=RULES)
+
+    assert is_valid.tolist() == [True, False, False, True]
+    assert rejection_codes.dtype == np.int64
+    assert codes.decode(rejection_codes) == [
+        f"Invalid type in 'claim_id': expected int; {RULES[0].reason}",
+        "Invalid type in 'claim_id': expected int; Invalid type in 'amount': expected float",
+    ]
+    assert dict(zip(codes.reasons, codes.count(rejection_codes))) == {
+        "Invalid type in 'claim_id': expected int": 2,
+        "Non-integer value in 'claim_id'": 0,
+        "Invalid type in 'amount': expected float": 1,
+        RULES[0].reason: 1,
+    }
+
+
+def test_rejection_sink_appends_chunks_compressed_with_lookup(tmp_path):
+    codes = RuleCodes.for_table(SCHEMA, RULES)
+    chunks = [pd.DataFrame({"claim_id": ["x"], "status": ["Open"], CODE_COLUMN: [1]}),
+              pd.DataFrame(columns=["claim_id", "status", CODE_COLUMN]),
+              pd.DataFrame({"claim_id": ["y", "z"], "status": ["Lost", "Open"], CODE_COLUMN: [1 | 8, 4]})]
+
+    with RejectionSink("claims_fact", codes, "csv", "gzip", tmp_path) as sink:
+        for chunk in chunks:
+            sink.write(chunk)
+
+    assert sink.path.name == "claims_fact.csv.gz"
+    with gzip.open(sink.path, "rt") as f:
+        assert f.read().count("claim_id") == 1
+    assert read_output(sink.path)[CODE_COLUMN].tolist() == [1, 9, 4]
+
+    lookup = json.loads((tmp_path / "claims_fact.rules.json").read_text())
+    assert lookup["rows"] == 3
+    assert [(rule["code"], rule["rows"]) for rule in lookup["rules"]] == [(1, 2), (2, 0), (4, 1), (8, 1)]
+
+
+def test_rejection_sink_removes_outputs_of_earlier_runs(tmp_path):
+    codes = RuleCodes.for_table(SCHEMA, RULES)
+    rejected = pd.DataFrame({"claim_id": ["x"], "status": ["Open"], CODE_COLUMN: [1]})
+
+    with RejectionSink("claims_fact", codes, "csv", None, tmp_path) as sink:
+        sink.write(rejected)
+    with RejectionSink("claims_fact", codes, "csv", "gzip", tmp_path) as sink:
+        sink.write(rejected)
+    assert sorted(path.name for path in tmp_path.glob("claims_fact.csv*")) == ["claims_fact.csv.gz"]
+
+    with RejectionSink("claims_fact", codes, "csv", "gzip", tmp_path):
+        pass
+    assert list(tmp_path.glob("claims_fact.csv*")) == []
+    assert json.loads((tmp_path / "claims_fact.rules.json").read_text())["path"] is None
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from etl.scd import content_hashes, history_parts, merge_history, read_history
+
+SCHEMA = {"customer_id": int, "region": str, "risk_score": float}
+
+
+def snapshot(tmp_path, rows, fmt="csv"):
+    df = pd.DataFrame(rows, columns=list(SCHEMA))
+    if fmt == "csv":
+        df.to_csv(tmp_path / "customers.csv", index=False)
+    else:
+        df.to_parquet(tmp_path / "customers.parquet", index=False)
+
+
+def test_content_hashes_ignore_the_key_and_the_source_format():
+    csv_like = pd.DataFrame({"customer_id": [1, 2], "region": ["West", "West"], "risk_score": ["0.5", "0.5"]})
+    typed = pd.DataFrame({"customer_id": [9, 8], "region": ["West", "West"], "risk_score": [0.5, 0.5]})
+
+    assert content_hashes(csv_like, SCHEMA, "customer_id").tolist() == \
+        content_hashes(typed, SCHEMA, "customer_id").tolist()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_merge_history_writes_only_the_delta(tmp_path, fmt):
+    snapshot(tmp_path, [(1, "West", 0.5), (2, "Midwest", 0.1)], fmt)
+    assert merge_history("customers", SCHEMA, "customer_id", fmt, tmp_path) == (2, 0, 0)
+
+    snapshot(tmp_path, [(1, "West", 0.5), (2, "South", 0.1), (3, "West", 0.9)], fmt)
+    assert merge_history("customers", SCHEMA, "customer_id", fmt, tmp_path) == (1, 1, 1)
+
+    snapshot(tmp_path, [(1, "West", 0.5), (3, "West", 0.9)], fmt)
+    assert merge_history("customers", SCHEMA, "customer_id", fmt, tmp_path) == (0, 0, 2)
+
+    assert len(history_parts("customers", tmp_path)) == 2
+    history = read_history("customers", "customer_id", tmp_path)
+    assert history["customer_id"].tolist() == [1, 2, 2, 3]
+    assert history["region"].tolist() == ["West", "Midwest", "South", "West"]
+    assert history["scd_change"].tolist() == ["insert", "insert", "update", "insert"]
+    assert history["is_current"].tolist() == [True, False, True, True]
+    assert history["valid_to"].isna().tolist() == [True, False, True, True]
+    assert history.loc[1, "valid_to"] == history.loc[2, "valid_from"]
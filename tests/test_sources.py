@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from etl import transform_base
+from etl.schema_definition import constraints, policies_schema
+from etl.sources import GeneratorSource, RawSource
+from etl.transform_base import clean_dataframe, transform_in_chunks
+
+
+def test_generator_source_batches_follow_schema_and_keep_counting():
+    source = GeneratorSource(rows={"policies": (25, 10)})
+
+    batches = list(source.iter_batches("policies", policies_schema, 10))
+
+    assert [len(df) for df, _ in batches] == [10, 10, 5, 10]
+    for df, _ in batches:
+        assert list(df.columns) == list(policies_schema)
+    index = pd.concat([df for df, _ in batches]).index
+    assert index.tolist() == list(range(35))
+    assert batches[0][0]["policy_id"].tolist() == list(range(1, 11))
+    assert all(parse_errors.empty for _, parse_errors in batches[:3])
+
+
+def test_generator_source_is_reproducible():
+    first = list(GeneratorSource(rows={"policies": (20, 20)}, seed=7).iter_batches("policies", policies_schema, 8))
+    second = list(GeneratorSource(rows={"policies": (20, 20)}, seed=7).iter_batches("policies", policies_schema, 8))
+
+    for (left, left_errors), (right, right_errors) in zip(first, second):
+        pd.testing.assert_frame_equal(left, right)
+        pd.testing.assert_frame_equal(left_errors, right_errors)
+
+
+def test_source_without_batches_cannot_be_created():
+    class NoBatches(RawSource):
+        pass
+
+    with pytest.raises(TypeError, match="iter_batches"):
+        NoBatches()
+
+
+def test_generator_source_rows_do_not_depend_on_the_batch_size():
+    source = GeneratorSource(rows={"policies": (40, 20)}, shard_size=16)
+
+    small = list(source.iter_batches("policies", policies_schema, 7))
+    large = list(source.iter_batches("policies", policies_schema, 50))
+
+    assert [len(df) for df, _ in small] == [7] * 5 + [5] + [7, 7, 6]
+    pd.testing.assert_frame_equal(pd.concat([df for df, _ in small]), pd.concat([df for df, _ in large]))
+
+
+@pytest.mark.parametrize("chunk_size", [100, 37])
+def test_transform_in_chunks_reads_from_generator_source(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(transform_base, "TRANSFORMED_DATA_DIR", tmp_path / "transformed")
+    monkeypatch.setattr(transform_base, "REJECTED_DATA_DIR", tmp_path / "rejected")
+    source = GeneratorSource(rows={"policies": (300, 60)})
+
+    valid, rejected = transform_in_chunks(
+        "policies", policies_schema, lambda df: clean_dataframe(df, policies_schema), chunk_size,
+        fmt="csv", rules=constraints["policies_dim"], source=source,
+    )
+
+    assert (valid, rejected) == (307, 53)
+    assert len(pd.read_csv(tmp_path / "transformed" / "policies.csv")) == valid
+    assert len(pd.read_csv(tmp_path / "rejected" / "policies.csv")) == rejected
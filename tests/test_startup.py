@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from etl.benchmark import STARTUP_BUDGET_SECONDS, measure_startup
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_python(code: str, cwd: Path) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True,
+                          env={"PYTHONPATH": str(ROOT), "PATH": ""})
+
+
+def test_imports_have_no_side_effects(tmp_path):
+    completed = run_python(
+        "import sys, config.logger, etl.utils.load, etl.warehouse.bulk_load, scripts.transform_all, "
+        "scripts.generate_customers\n"
+        "print(sorted(m for m in ('pandas', 'faker', 'sqlalchemy') if m in sys.modules))\n"
+        "import etl.validation.validate_data",
+        tmp_path,
+    )
+    assert completed.stdout == "[]\n"
+    assert completed.stderr == ""
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_measure_startup_within_budget():
+    result = measure_startup("scripts.transform_all", repeat=1)
+    assert 0 < result["seconds"] < STARTUP_BUDGET_SECONDS
+    assert "scripts.transform_all" not in result["slowest_imports"]
@@ -0,0 +1,17 @@
+import pytest
+
+from scripts.transform_all import DEPENDENCIES, run_dag
+
+
+def test_claims_depends_on_every_dimension():
+    assert sorted(DEPENDENCIES["claims"]) == sorted(table for table in DEPENDENCIES if table != "claims")
+
+
+def test_run_dag_rejects_unknown_dependencies():
+    with pytest.raises(ValueError, match="Unknown dependencies"):
+        run_dag({"claims": ["customers"]})
+
+
+def test_run_dag_rejects_cycles():
+    with pytest.raises(ValueError, match="Dependency cycle"):
+        run_dag({"customers": ["policies"], "policies": ["customers"]}, max_workers=1)
@@ -0,0 +1,76 @@
+import pandas as pd
+
+from etl.transform_base import clean_dataframe
+from etl.validation.rejections import RuleCodes, read_rule_counts
+
+
+def test_clean_dataframe_strips_string_cells():
+    df = pd.DataFrame({
+        "adjuster_id": [" 1 ", 2],
+        "name": ["  Ann Lee  ", "Bo Chen    "],
+        "notes": [" x ", 3],
+    })
+
+    cleaned = clean_dataframe(df, {"adjuster_id": int, "name": str})
+
+    assert cleaned["adjuster_id"].tolist() == ["1", 2]
+    assert cleaned["adjuster_id"].dtype == object
+    assert cleaned["name"].tolist() == ["Ann Lee", "Bo Chen"]
+    assert cleaned["notes"].tolist() == ["x", 3]
+
+
+def test_padded_numbers_are_written_stripped(tmp_path):
+    from etl.utils.output_formats import write_output
+
+    schema = {"adjuster_id": int, "name": str}
+    cleaned = clean_dataframe(pd.DataFrame({"adjuster_id": [" 1 ", "2"], "name": ["x", "y"]}), schema)
+
+    path = write_output(cleaned, tmp_path, "adjusters", schema, "csv")
+
+    assert path.read_text().splitlines() == ["adjuster_id,name", "1,x", "2,y"]
+
+
+def test_clean_dataframe_drops_duplicate_rows():
+    df = pd.DataFrame({"name": ["a", "a", "b"], "region": ["West", "West", "West"]})
+
+    cleaned = clean_dataframe(df)
+
+    assert len(cleaned) == 2
+
+
+def test_transform_in_chunks_appends_aligned_chunks(tmp_path, monkeypatch):
+    import etl.transform_base as transform_base
+    import etl.utils.load as load
+
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    pd.DataFrame({"adjuster_id": [1, 2, 3], "name": ["A", "B", "C"], "region": ["West"] * 3,
+                  "team_lead_id": [1, 1, 2]}).to_csv(raw_dir / "adjusters_clean.csv", index=False)
+    pd.DataFrame({"adjuster_id": ["4", "A-XYZ"], "name": [" D ", "E"], "region": ["West"] * 2,
+                  "team_lead_id": [2, 2], "team_notes": ["Temp contract", None]}).to_csv(
+        raw_dir / "adjusters_messy.csv", index=False)
+    monkeypatch.setattr(load, "RAW_DATA_DIR", raw_dir)
+    monkeypatch.setattr(transform_base, "TRANSFORMED_DATA_DIR", tmp_path / "transformed")
+    monkeypatch.setattr(transform_base, "REJECTED_DATA_DIR", tmp_path / "rejected")
+    schema = {"adjuster_id": int, "name": str, "region": str, "team_lead_id": int}
+
+    valid_rows, rejected_rows = transform_base.transform_in_chunks(
+        "adjusters", schema, lambda df: clean_dataframe(df, schema), chunk_size=2)
+
+    assert (valid_rows, rejected_rows) == (4, 1)
+    valid = pd.read_csv(tmp_path / "transformed" / "adjusters.csv")
+    assert valid.columns.tolist() == ["adjuster_id", "name", "region", "team_lead_id", "team_notes"]
+    assert valid["name"].tolist() == ["A", "B", "C", "D"]
+    rejected = pd.read_csv(tmp_path / "rejected" / "adjusters.csv")
+    codes = RuleCodes.for_table(schema)
+    assert codes.decode(rejected["rejection_code"]) == ["Invalid type in 'adjuster_id': expected int"]
+    assert read_rule_counts("adjusters", tmp_path / "rejected")["Invalid type in 'adjuster_id': expected int"] == 1
+
+
+def test_clean_dates_normalizes_month_names():
+    from etl.transform_base import clean_dates
+
+    df = pd.DataFrame({"date_id": [1, 2, 3, 4], "day": [1] * 4, "month": ["07", "july", "March", "Smarch"],
+                       "year": [2023] * 4, "quarter": ["Q3", "Q3", "Q1", "Q1"], "weekday": ["Monday"] * 4})
+
+    assert clean_dates(df)["month"].tolist() == ["July", "July", "March", "Smarch"]
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from etl.utils.helpers import is_valid_type
+from etl.validation.type_checks import evaluate_schema
+
+
+def test_evaluate_schema_matches_is_valid_type():
+    df = pd.DataFrame({
+        "claim_id": ["1", " 2 ", "1.0", "A-XYZ", np.nan, 3, 3.5, "4"],
+        "amount": ["1.5", "nan", "", "x", np.nan, 3, 3.5, " 1e3 "],
+        "status": ["Approved", None, "", "x", np.nan, 1, 2.0, "Pending"],
+    })
+    schema = {"claim_id": int, "amount": float, "status": str}
+
+    is_valid, _ = evaluate_schema(df, schema)
+
+    expected = [
+        all(is_valid_type(row[column], expected_type)[0] for column, expected_type in schema.items())
+        for _, row in df.iterrows()
+    ]
+    assert is_valid.tolist() == expected
+
+
+def test_evaluate_schema_reports_reasons_per_row():
+    df = pd.DataFrame({"day": [1.0, 2.5, np.nan], "premium": ["10.5", "discount", "20"]})
+
+    is_valid, reasons = evaluate_schema(df, {"day": int, "premium": float})
+
+    assert is_valid.tolist() == [True, False, False]
+    assert reasons.loc[1] == "Non-integer value in 'day'; Invalid type in 'premium': expected float"
+    assert reasons.loc[2] == "Invalid type in 'day': expected int"
+
+
+def test_evaluate_schema_rejects_missing_numeric_column():
+    df = pd.DataFrame({"name": ["a", "b"]})
+
+    is_valid, reasons = evaluate_schema(df, {"name": str, "team_lead_id": int})
+
+    assert not is_valid.any()
+    assert reasons.tolist() == ["Invalid type in 'team_lead_id': expected int"] * 2